@@ -1,13 +1,46 @@
 import os
 from pathlib import Path
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from dotenv import load_dotenv
 
+from app.utils.metrics import TimedQueuePool
+from app.utils.sql_profiler import sql_profiler
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# "sync" runs routes on the thread pool, "async" runs them on the event loop
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """
+    Swap the sync driver of a database URL for its asyncio counterpart
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
+# SQLite picks its own pool class (a shared QueuePool would break :memory: databases)
+engine_options = {} if make_url(DATABASE_URL).get_backend_name() == "sqlite" else {"poolclass": TimedQueuePool}
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True, **engine_options)
+sql_profiler.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# The sync engine is kept in async mode for startup and background jobs
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True)
+    sql_profiler.install(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
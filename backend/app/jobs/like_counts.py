@@ -0,0 +1,108 @@
+"""
+Reconcile the denormalized counters with the likes / watch_later tables:
+`videos.like_count`, `users.liked_count` and `users.watch_later_count`
+
+The toggle routes keep the counters exact, but rows removed outside of them (e.g.
+likes cascaded away when a user or a video is deleted) make counters drift. This job
+recomputes them in bulk, one chunk of rows per UPDATE statement.
+
+Usage:
+    python -m app.jobs.like_counts [--batch-size 1000]
+"""
+import argparse
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.like import Like
+from app.models.user import User
+from app.models.video import Video
+from app.models.watch_later import WatchLater
+
+logger = logging.getLogger(__name__)
+
+
+def _reconcile(db: Session, model, column, actual, batch_size: int) -> int:
+    """
+    Set `column` to `actual` (a correlated subquery) wherever they differ, in chunks of
+    primary keys; returns the number of corrected rows
+    """
+    corrected = 0
+    last_id = ""
+    while True:
+        ids = db.execute(
+            select(model.id)
+            .where(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        result = db.execute(
+            update(model)
+            .where(model.id.in_(ids), column != actual)
+            .values({column: actual, model.updated_at: model.updated_at})
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        corrected += result.rowcount
+        last_id = ids[-1]
+    return corrected
+
+
+def reconcile_like_counts(db: Session, batch_size: int = 1000) -> int:
+    """
+    Recompute like_count for every video whose counter drifted
+    Returns the number of videos that were corrected
+    """
+    actual = (
+        select(func.count())
+        .select_from(Like)
+        .where(Like.video_id == Video.id)
+        .scalar_subquery()
+    )
+    corrected = _reconcile(db, Video, Video.like_count, actual, batch_size)
+    logger.info(f"[LikeCounts] Corrected {corrected} drifted counters")
+    return corrected
+
+
+def reconcile_user_counts(db: Session, batch_size: int = 1000) -> int:
+    """
+    Recompute liked_count and watch_later_count for every user whose counters drifted
+    Returns the number of corrected counters
+    """
+    corrected = 0
+    for column, model in ((User.liked_count, Like), (User.watch_later_count, WatchLater)):
+        actual = (
+            select(func.count())
+            .select_from(model)
+            .where(model.user_id == User.id)
+            .scalar_subquery()
+        )
+        corrected += _reconcile(db, User, column, actual, batch_size)
+    logger.info(f"[LikeCounts] Corrected {corrected} drifted user counters")
+    return corrected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile the like / watch-later counters")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        corrected = reconcile_like_counts(db, args.batch_size)
+        print(f"Corrected {corrected} videos")
+        corrected = reconcile_user_counts(db, args.batch_size)
+        print(f"Corrected {corrected} user counters")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Recompute the co-like neighbours (`related_videos`) served by GET /videos/{id}/related
+
+Likes of ready videos are read in primary-key chunks into a sparse users x videos
+matrix. The item-item co-occurrence matrix is built block by block
+(A[:, block].T @ A) with cosine normalisation, co_likes / sqrt(likes_i * likes_j),
+so only one block of rows is ever materialised. The top RELATED_TOP_K neighbours
+of each video that share at least RELATED_MIN_CO_LIKES likers are kept, and they
+replace the previous index in one transaction.
+
+Users with more than RELATED_MAX_LIKES_PER_USER likes only contribute their most
+recent ones: the cost of the product grows with the square of a user's likes,
+and bulk likers carry little signal.
+
+Requires numpy and scipy (only this job imports them, not the API workers).
+
+Usage:
+    python -m app.jobs.related [--top-k 20] [--every 3600]
+"""
+import argparse
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.like import Like
+from app.models.related_video import RelatedVideo
+from app.models.video import Video
+
+logger = logging.getLogger(__name__)
+
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "20"))
+RELATED_MIN_CO_LIKES = int(os.getenv("RELATED_MIN_CO_LIKES", "2"))
+RELATED_MAX_LIKES_PER_USER = int(os.getenv("RELATED_MAX_LIKES_PER_USER", "500"))
+RELATED_READ_CHUNK = 50000
+RELATED_BLOCK_SIZE = 2048
+RELATED_WRITE_CHUNK = 5000
+
+
+@dataclass
+class LikeMatrix:
+    # One entry per like: integer user / video indices and the like time (epoch seconds)
+    users: np.ndarray
+    videos: np.ndarray
+    times: np.ndarray
+    video_ids: list[str]
+    n_users: int
+
+
+@dataclass
+class Neighbours:
+    # Parallel arrays, grouped by source and ordered by rank (1 = closest)
+    sources: np.ndarray
+    ranks: np.ndarray
+    targets: np.ndarray
+    scores: np.ndarray
+
+
+def read_likes(db: Session, chunk_size: int = RELATED_READ_CHUNK) -> LikeMatrix:
+    """
+    Load the likes of ready videos, one primary-key range per query
+    """
+    user_index: dict[str, int] = {}
+    video_index: dict[str, int] = {}
+    users, videos, times = [], [], []
+    last_id = ""
+    while True:
+        rows = db.execute(
+            select(Like.id, Like.user_id, Like.video_id, Like.created_at)
+            .join(Video, Video.id == Like.video_id)
+            .where(Like.id > last_id, Video.status == "ready")
+            .order_by(Like.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            users.append(user_index.setdefault(row.user_id, len(user_index)))
+            videos.append(video_index.setdefault(row.video_id, len(video_index)))
+            times.append(row.created_at.timestamp())
+        last_id = rows[-1].id
+
+    return LikeMatrix(
+        users=np.asarray(users, dtype=np.int32),
+        videos=np.asarray(videos, dtype=np.int32),
+        times=np.asarray(times, dtype=np.float64),
+        video_ids=list(video_index),
+        n_users=len(user_index),
+    )
+
+
+def _group_rank(groups: np.ndarray) -> np.ndarray:
+    """
+    Position of each element inside its run of equal values (groups must be sorted)
+    """
+    starts = np.searchsorted(groups, groups, side="left")
+    return np.arange(len(groups)) - starts
+
+
+def cap_per_user(likes: LikeMatrix, max_per_user: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (users, videos) keeping only the `max_per_user` most recent likes of each user
+    """
+    order = np.lexsort((-likes.times, likes.users))
+    users, videos = likes.users[order], likes.videos[order]
+    keep = _group_rank(users) < max_per_user
+    return users[keep], videos[keep]
+
+
+def build_neighbours(
+    users: np.ndarray,
+    videos: np.ndarray,
+    n_users: int,
+    n_videos: int,
+    top_k: int = RELATED_TOP_K,
+    min_co_likes: int = RELATED_MIN_CO_LIKES,
+    block_size: int = RELATED_BLOCK_SIZE,
+) -> Neighbours:
+    """
+    Top-k cosine neighbours of every video from (user, video) like pairs
+    """
+    matrix = sparse.csr_matrix(
+        (np.ones(len(users), dtype=np.float32), (users, videos)), shape=(n_users, n_videos)
+    )
+    matrix.data[:] = 1  # duplicates were summed
+    by_video = matrix.T.tocsr()
+    norms = np.sqrt(np.asarray(by_video.sum(axis=1)).ravel())
+
+    parts = []
+    for start in range(0, n_videos, block_size):
+        co_likes = (by_video[start:start + block_size] @ matrix).tocsr()
+        sources = start + np.repeat(np.arange(co_likes.shape[0], dtype=np.int32), np.diff(co_likes.indptr))
+        targets = co_likes.indices
+        counts = co_likes.data
+
+        keep = (counts >= min_co_likes) & (targets != sources)
+        sources, targets = sources[keep], targets[keep]
+        scores = counts[keep] / (norms[sources] * norms[targets])
+
+        order = np.lexsort((-scores, sources))
+        sources, targets, scores = sources[order], targets[order], scores[order]
+        ranks = _group_rank(sources)
+        keep = ranks < top_k
+        parts.append((sources[keep], ranks[keep] + 1, targets[keep], scores[keep]))
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int32)
+        return Neighbours(empty, empty, empty, np.empty(0, dtype=np.float32))
+    return Neighbours(*(np.concatenate(column) for column in zip(*parts)))
+
+
+def refresh_related(
+    db: Session,
+    top_k: int = RELATED_TOP_K,
+    min_co_likes: int = RELATED_MIN_CO_LIKES,
+    max_likes_per_user: int = RELATED_MAX_LIKES_PER_USER,
+) -> int:
+    """
+    Rebuild the related_videos index
+    Returns the number of videos that have neighbours
+    """
+    likes = read_likes(db)
+    users, videos = cap_per_user(likes, max_likes_per_user)
+    neighbours = build_neighbours(users, videos, likes.n_users, len(likes.video_ids), top_k, min_co_likes)
+
+    video_ids = likes.video_ids
+    rows = [
+        {"video_id": video_ids[source], "rank": int(rank), "related_video_id": video_ids[target], "score": float(score)}
+        for source, rank, target, score in zip(
+            neighbours.sources.tolist(), neighbours.ranks.tolist(),
+            neighbours.targets.tolist(), neighbours.scores.tolist()
+        )
+    ]
+
+    # Readers keep seeing the previous index until this commits
+    db.execute(delete(RelatedVideo))
+    for start in range(0, len(rows), RELATED_WRITE_CHUNK):
+        db.execute(insert(RelatedVideo), rows[start:start + RELATED_WRITE_CHUNK])
+    db.commit()
+
+    covered = len(np.unique(neighbours.sources))
+    logger.info(f"[Related] {len(rows)} neighbours for {covered} of {len(video_ids)} liked videos")
+    return covered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the co-like related videos index")
+    parser.add_argument("--top-k", type=int, default=RELATED_TOP_K)
+    parser.add_argument("--min-co-likes", type=int, default=RELATED_MIN_CO_LIKES)
+    parser.add_argument("--max-likes-per-user", type=int, default=RELATED_MAX_LIKES_PER_USER)
+    parser.add_argument("--every", type=float, help="Keep running, rebuilding every N seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        db = SessionLocal()
+        try:
+            covered = refresh_related(db, args.top_k, args.min_co_likes, args.max_likes_per_user)
+            print(f"Indexed {covered} videos")
+        except Exception as e:
+            db.rollback()
+            if not args.every:
+                raise
+            logger.error(f"[Related] Rebuild failed: {str(e)}", exc_info=True)
+        finally:
+            db.close()
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
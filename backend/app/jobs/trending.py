@@ -0,0 +1,141 @@
+"""
+Recompute the trending snapshot (`trending_videos`) served by GET /videos/trending
+
+Each view (from the hourly video_view_buckets) and each like within the last
+TRENDING_WINDOW_HOURS contributes to its video's score with an exponential time
+decay: weight = 0.5 ** (age / TRENDING_HALF_LIFE_HOURS), a like counting as
+TRENDING_LIKE_WEIGHT views. The decay is applied per hour inside the aggregate
+query (a CASE over the hour boundaries), so the database returns one row per
+active video. The top TRENDING_SIZE ready videos replace the previous snapshot in
+one transaction; view buckets older than the window are pruned.
+
+Usage:
+    python -m app.jobs.trending [--every 300]
+"""
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.like import Like
+from app.models.trending_video import TrendingVideo
+from app.models.video import Video
+from app.models.video_view_bucket import VideoViewBucket
+from app.utils.view_counter import VIEW_BUCKET_SECONDS, bucket_start
+
+logger = logging.getLogger(__name__)
+
+TRENDING_WINDOW_HOURS = int(os.getenv("TRENDING_WINDOW_HOURS", "72"))
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_LIKE_WEIGHT = float(os.getenv("TRENDING_LIKE_WEIGHT", "10"))
+TRENDING_SIZE = int(os.getenv("TRENDING_SIZE", "200"))
+
+
+def decayed(column, now: datetime, window_hours: int, half_life_hours: float):
+    """
+    Piecewise-constant decay weight of a timestamp column, one step per bucket:
+    CASE WHEN column >= <start of bucket 0> THEN w0 WHEN column >= <bucket 1> THEN w1 ... END
+    Rows older than the window get 0
+    """
+    step = timedelta(seconds=VIEW_BUCKET_SECONDS)
+    newest = bucket_start(now)
+    whens = []
+    for age in range(int(window_hours * 3600 // VIEW_BUCKET_SECONDS)):
+        start = newest - age * step
+        # Age of the middle of the bucket; the current bucket is only partly elapsed
+        end = min(now, start + step)
+        middle = start + (end - start) / 2
+        age_hours = (now - middle).total_seconds() / 3600
+        whens.append((column >= start, 0.5 ** (age_hours / half_life_hours)))
+    return case(*whens, else_=0.0)
+
+
+def compute_scores(
+    db: Session,
+    now: datetime,
+    window_hours: int = TRENDING_WINDOW_HOURS,
+    half_life_hours: float = TRENDING_HALF_LIFE_HOURS,
+    like_weight: float = TRENDING_LIKE_WEIGHT,
+) -> dict[str, float]:
+    """
+    Decayed score of every ready video with views or likes in the window
+    """
+    since = now - timedelta(hours=window_hours)
+
+    view_score = func.sum(VideoViewBucket.views * decayed(VideoViewBucket.bucket_start, now, window_hours, half_life_hours))
+    rows = db.execute(
+        select(VideoViewBucket.video_id, view_score)
+        .join(Video, Video.id == VideoViewBucket.video_id)
+        .where(VideoViewBucket.bucket_start >= bucket_start(since), Video.status == "ready")
+        .group_by(VideoViewBucket.video_id)
+    ).all()
+    scores = {video_id: float(score or 0) for video_id, score in rows}
+
+    like_score = func.sum(decayed(Like.created_at, now, window_hours, half_life_hours))
+    rows = db.execute(
+        select(Like.video_id, like_score)
+        .join(Video, Video.id == Like.video_id)
+        .where(Like.created_at >= since, Video.status == "ready")
+        .group_by(Like.video_id)
+    ).all()
+    for video_id, score in rows:
+        scores[video_id] = scores.get(video_id, 0.0) + like_weight * float(score or 0)
+    return scores
+
+
+def refresh_trending(db: Session, size: int = TRENDING_SIZE) -> int:
+    """
+    Replace the trending snapshot with the current top `size` videos
+    Returns the number of ranked videos
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    scores = compute_scores(db, now)
+    top = sorted(((score, video_id) for video_id, score in scores.items() if score > 0), reverse=True)[:size]
+
+    # Readers keep seeing the previous snapshot until this commits
+    db.execute(delete(TrendingVideo))
+    if top:
+        db.execute(insert(TrendingVideo), [
+            {"rank": rank, "video_id": video_id, "score": score, "computed_at": now}
+            for rank, (score, video_id) in enumerate(top, start=1)
+        ])
+    db.execute(delete(VideoViewBucket).where(
+        VideoViewBucket.bucket_start < bucket_start(now - timedelta(hours=TRENDING_WINDOW_HOURS))
+    ))
+    db.commit()
+
+    logger.info(f"[Trending] Ranked {len(top)} of {len(scores)} active videos")
+    return len(top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute the trending videos snapshot")
+    parser.add_argument("--size", type=int, default=TRENDING_SIZE)
+    parser.add_argument("--every", type=float, help="Keep running, refreshing every N seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        db = SessionLocal()
+        try:
+            ranked = refresh_trending(db, args.size)
+            print(f"Ranked {ranked} videos")
+        except Exception as e:
+            db.rollback()
+            if not args.every:
+                raise
+            logger.error(f"[Trending] Refresh failed: {str(e)}", exc_info=True)
+        finally:
+            db.close()
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import health, videos, auth, likes, watch_later, users
+from app.routes import health, videos, auth, likes, watch_later, users, metrics
 import app.models
-from app.db import Base, engine
+from app.db import engine, async_engine, DB_MODE
+from app.migrations import ensure_schema
+from app.utils.async_routes import asyncify_router
+from app.utils.view_counter import view_counter
+from app.utils.password_hasher import password_hasher
+from app.utils.metrics import MetricsMiddleware, pool_collector, registry
+from app.utils.sql_profiler import SQLProfilerMiddleware
 
 
 app = FastAPI()
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created")
+    version = ensure_schema(engine)
+    print(f"Database schema at version {version}")
+    view_counter.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Write buffered view increments before the worker exits
+    view_counter.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+registry.register_collector(pool_collector(engine))
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,12 +36,21 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
+app.add_middleware(SQLProfilerMiddleware)
+# Added last so it is outermost and times the whole request, CORS included
+app.add_middleware(MetricsMiddleware)
+
+def routes(router):
+    # DB_MODE=async serves the same routes from the event loop with the async engine
+    return asyncify_router(router) if DB_MODE == "async" else router
 
 # API Routes
+# Auth stays on the thread pool: its threads wait on the bcrypt process pool
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
-app.include_router(videos.router, prefix="/videos", tags=["videos"])
-app.include_router(likes.router, prefix="/videos", tags=["likes"])
-app.include_router(watch_later.router, prefix="/videos", tags=["watch-later"])
-app.include_router(users.router, prefix="/users", tags=["users"])
+app.include_router(routes(videos.router), prefix="/videos", tags=["videos"])
+app.include_router(routes(likes.router), prefix="/videos", tags=["likes"])
+app.include_router(routes(watch_later.router), prefix="/videos", tags=["watch-later"])
+app.include_router(routes(users.router), prefix="/users", tags=["users"])
 app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
@@ -0,0 +1,137 @@
+"""
+Versioned schema migrations
+
+Each module in app/migrations/versions defines `version`, `description` and
+`upgrade(conn)`. Applied versions are recorded in the `schema_migrations` table;
+`upgrade` runs the missing ones in order, each in its own transaction, holding a
+database-wide lock on MySQL so that concurrent deploys do not race.
+
+Usage:
+    python -m app.migrations upgrade     # apply pending migrations
+    python -m app.migrations status      # show applied / pending versions
+    python -m app.migrations check-plans # fail if a hot query needs a full table scan
+"""
+import importlib
+import logging
+import os
+import pkgutil
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+# Apply pending migrations at startup (convenient in development); set to false in
+# production so that workers refuse to start on an outdated schema instead
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+
+MIGRATION_LOCK_NAME = "streamvod_schema_migrations"
+MIGRATION_LOCK_TIMEOUT_SECONDS = 600
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def load_migrations() -> list:
+    """
+    Migration modules sorted by version
+    """
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+        if info.name.startswith("v")
+    ]
+    modules.sort(key=lambda module: module.version)
+    seen = set()
+    for module in modules:
+        if module.version in seen:
+            raise RuntimeError(f"Duplicate migration version {module.version}")
+        seen.add(module.version)
+    return modules
+
+
+def latest_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def applied_versions(conn: Connection) -> set[int]:
+    if not conn.dialect.has_table(conn, schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(conn: Connection) -> int:
+    return max(applied_versions(conn), default=0)
+
+
+def upgrade(engine: Engine) -> list[int]:
+    """
+    Apply every pending migration; returns the versions that were applied
+    """
+    applied_now = []
+    with engine.connect() as conn:
+        locked = conn.dialect.name == "mysql"
+        if locked:
+            acquired = conn.exec_driver_sql(
+                f"SELECT GET_LOCK('{MIGRATION_LOCK_NAME}', {MIGRATION_LOCK_TIMEOUT_SECONDS})"
+            ).scalar()
+            if acquired != 1:
+                raise RuntimeError("Timed out waiting for the schema migration lock")
+        try:
+            _metadata.create_all(bind=conn)
+            conn.commit()
+
+            done = applied_versions(conn)
+            conn.commit()
+            for migration in load_migrations():
+                if migration.version in done:
+                    continue
+                logger.info(f"[Migrations] Applying {migration.version}: {migration.description}")
+                with conn.begin():
+                    migration.upgrade(conn)
+                    conn.execute(insert(schema_migrations).values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(timezone.utc)
+                    ))
+                applied_now.append(migration.version)
+        finally:
+            if locked:
+                conn.exec_driver_sql(f"SELECT RELEASE_LOCK('{MIGRATION_LOCK_NAME}')")
+    return applied_now
+
+
+def ensure_schema(engine: Engine) -> int:
+    """
+    Startup check: reads the applied version (two tiny queries when up to date)
+    instead of reflecting every table like create_all
+    Returns the schema version the worker runs against
+    """
+    latest = latest_version()
+    with engine.connect() as conn:
+        current = current_version(conn)
+
+    if current == latest:
+        return current
+    if current > latest:
+        # A newer release already migrated the database (e.g. during a rolling deploy)
+        logger.warning(f"[Migrations] Database is at version {current}, this code knows up to {latest}")
+        return current
+    if not DB_AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {latest}: "
+            f"run `python -m app.migrations upgrade`"
+        )
+
+    upgrade(engine)
+    return latest
@@ -0,0 +1,43 @@
+import argparse
+import logging
+import sys
+
+from app.db import engine
+from app.migrations import applied_versions, load_migrations, upgrade
+from app.migrations.plans import check_plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema migrations")
+    parser.add_argument("command", choices=("upgrade", "status", "check-plans"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "upgrade":
+        applied = upgrade(engine)
+        print(f"Applied {len(applied)} migrations: {applied}" if applied else "Schema is up to date")
+        return
+
+    if args.command == "check-plans":
+        with engine.connect() as conn:
+            try:
+                problems = check_plans(conn)
+            except RuntimeError as e:
+                print(e)
+                sys.exit(2)
+        for name, tables in problems.items():
+            print(f"FULL SCAN  {name}: {', '.join(tables)}")
+        if problems:
+            sys.exit(1)
+        print("All hot queries use an index")
+        return
+
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    for migration in load_migrations():
+        state = "applied" if migration.version in done else "pending"
+        print(f"{migration.version:>4}  {state:<8} {migration.description}")
+
+
+if __name__ == "__main__":
+    main()
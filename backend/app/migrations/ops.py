@@ -0,0 +1,79 @@
+"""
+Idempotent, online-safe DDL helpers for migrations
+
+Every helper inspects the live schema first, so a migration can run against a database
+that already has the change (e.g. created by create_all from newer models). On MySQL,
+DDL is issued as ALTER TABLE ... ALGORITHM=INPLACE/INSTANT, LOCK=NONE so reads and
+writes continue while an index is built; other dialects use plain DDL.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def is_mysql(conn: Connection) -> bool:
+    return conn.dialect.name == "mysql"
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn: Connection, table: str, columns: list[str]) -> bool:
+    """
+    True if some index (or unique constraint) already starts with these columns
+    """
+    inspector = inspect(conn)
+    existing = [index["column_names"] for index in inspector.get_indexes(table)]
+    existing += [constraint["column_names"] for constraint in inspector.get_unique_constraints(table)]
+    return any(cols[:len(columns)] == columns for cols in existing)
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str):
+    """
+    ADD COLUMN `column` `ddl` unless it exists
+    MySQL 8 adds trailing columns instantly; older servers fall back to an in-place rebuild
+    """
+    if has_column(conn, table, column):
+        logger.info(f"[Migrations] {table}.{column} already exists")
+        return
+
+    statement = f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"
+    if is_mysql(conn):
+        try:
+            conn.execute(text(f"{statement}, ALGORITHM=INSTANT"))
+        except Exception:
+            conn.execute(text(f"{statement}, ALGORITHM=INPLACE, LOCK=NONE"))
+    else:
+        conn.execute(text(statement))
+    logger.info(f"[Migrations] Added {table}.{column}")
+
+
+def create_index(conn: Connection, table: str, name: str, columns: list[str], fulltext: bool = False):
+    """
+    Create an index unless an index with the same leading columns already exists
+    FULLTEXT indexes are MySQL-only and skipped elsewhere
+    """
+    if fulltext and not is_mysql(conn):
+        logger.info(f"[Migrations] Skipping FULLTEXT index {name} on {conn.dialect.name}")
+        return
+    if has_index(conn, table, columns):
+        logger.info(f"[Migrations] {table}({', '.join(columns)}) is already indexed")
+        return
+
+    column_list = ", ".join(columns)
+    if is_mysql(conn):
+        kind = "FULLTEXT INDEX" if fulltext else "INDEX"
+        # InnoDB cannot build a FULLTEXT index without blocking writes
+        lock = "SHARED" if fulltext else "NONE"
+        conn.execute(text(f"ALTER TABLE {table} ADD {kind} {name} ({column_list}), ALGORITHM=INPLACE, LOCK={lock}"))
+    else:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({column_list})"))
+    logger.info(f"[Migrations] Created index {name} on {table}({column_list})")
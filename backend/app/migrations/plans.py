@@ -0,0 +1,167 @@
+"""
+EXPLAIN-based check that the hot queries of the API are served by an index
+
+Each entry mirrors a statement issued by a route or job. A plan that reads a whole
+table or a whole index (MySQL `type = ALL / index`, SQLite `SCAN <table>`) is
+reported; `python -m app.migrations check-plans` exits non-zero if any is found.
+
+MySQL's optimizer prefers full scans on near-empty tables, so on MySQL run the check
+against a database holding representative data (e.g. one seeded by benchmarks.api).
+"""
+import re
+from datetime import datetime
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.engine import Connection
+
+from app.migrations import current_version, latest_version
+from app.models.like import Like
+from app.models.related_video import RelatedVideo
+from app.models.trending_video import TrendingVideo
+from app.models.video import Video
+from app.models.watch_later import WatchLater
+from app.utils.pagination import encode_cursor, keyset_after
+
+SAMPLE_ID = "00000000-0000-4000-8000-000000000000"
+SAMPLE_TIME = datetime(2025, 1, 1)
+
+# "SEARCH" steps seek into an index; "SCAN" reads every row (or every index entry)
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)")
+_MYSQL_FULL_SCAN_TYPES = ("ALL", "INDEX")
+
+
+def hot_queries() -> dict:
+    cursor = encode_cursor(SAMPLE_TIME, SAMPLE_ID)
+    return {
+        "list_videos": (
+            select(Video)
+            .where(Video.status == "ready")
+            .order_by(Video.created_at.desc(), Video.id.desc())
+            .limit(21)
+        ),
+        "list_videos_cursor": (
+            select(Video)
+            .where(Video.status == "ready", keyset_after(Video.created_at, Video.id, cursor))
+            .order_by(Video.created_at.desc(), Video.id.desc())
+            .limit(21)
+        ),
+        "user_videos": (
+            select(Video)
+            .where(Video.uploader_id == SAMPLE_ID, Video.status == "ready",
+                   keyset_after(Video.created_at, Video.id, cursor))
+            .order_by(Video.created_at.desc(), Video.id.desc())
+            .limit(21)
+        ),
+        "user_videos_etag": (
+            select(func.max(Video.updated_at), func.count(), func.count(case((Video.status == "ready", 1))))
+            .where(Video.uploader_id == SAMPLE_ID)
+        ),
+        "catalog_stamp": select(func.max(Video.updated_at)),
+        "liked_videos": (
+            select(Video, Like.created_at, Like.id)
+            .join(Like, Like.video_id == Video.id)
+            .where(Like.user_id == SAMPLE_ID, Video.status == "ready",
+                   keyset_after(Like.created_at, Like.id, cursor))
+            .order_by(Like.created_at.desc(), Like.id.desc())
+            .limit(21)
+        ),
+        "watch_later": (
+            select(Video, WatchLater.added_at, WatchLater.id)
+            .join(WatchLater, WatchLater.video_id == Video.id)
+            .where(WatchLater.user_id == SAMPLE_ID, Video.status == "ready",
+                   keyset_after(WatchLater.added_at, WatchLater.id, cursor))
+            .order_by(WatchLater.added_at.desc(), WatchLater.id.desc())
+            .limit(21)
+        ),
+        "trending": (
+            select(Video, TrendingVideo.rank, TrendingVideo.computed_at)
+            .join(TrendingVideo, TrendingVideo.video_id == Video.id)
+            .where(TrendingVideo.rank > 20, Video.status == "ready")
+            .order_by(TrendingVideo.rank)
+            .limit(21)
+        ),
+        "related": (
+            select(Video)
+            .join(RelatedVideo, RelatedVideo.related_video_id == Video.id)
+            .where(RelatedVideo.video_id == SAMPLE_ID, Video.status == "ready")
+            .order_by(RelatedVideo.rank)
+            .limit(10)
+        ),
+        "suggest_refresh": (
+            select(Video.id, Video.title, Video.views, Video.status, Video.updated_at)
+            .where(Video.updated_at >= SAMPLE_TIME)
+        ),
+        "engagement": (
+            select(Video.id, Video.like_count, Like.id, WatchLater.id)
+            .outerjoin(Like, and_(Like.video_id == Video.id, Like.user_id == SAMPLE_ID))
+            .outerjoin(WatchLater, and_(WatchLater.video_id == Video.id, WatchLater.user_id == SAMPLE_ID))
+            .where(Video.id.in_([SAMPLE_ID, SAMPLE_ID[:-1] + "1"]))
+        ),
+        **engagement_queries(),
+    }
+
+
+def engagement_queries() -> dict:
+    """
+    Statements of app.utils.engagement (PUT / DELETE / toggle of likes and watch later)
+    """
+    video_ids = [SAMPLE_ID, SAMPLE_ID[:-1] + "1"]
+    queries = {
+        "engagement_existing_videos": select(Video.id).where(Video.id.in_(video_ids)),
+    }
+    for name, model in (("like", Like), ("watch_later", WatchLater)):
+        where = (model.user_id == SAMPLE_ID, model.video_id.in_(video_ids))
+        queries.update({
+            # Rows a partially ignored INSERT did insert, found by their generated ids
+            f"{name}_inserted_rows": select(model.video_id).where(model.id.in_(video_ids)),
+            f"{name}_remove_one": delete(model).where(model.user_id == SAMPLE_ID, model.video_id.in_(video_ids[:1])),
+            f"{name}_remove_many_lock": select(model.video_id).where(*where).with_for_update(),
+            f"{name}_remove_many": delete(model).where(*where),
+        })
+    return queries
+
+
+def explain(conn: Connection, stmt) -> list[dict]:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params)
+    else:
+        rows = conn.exec_driver_sql(f"EXPLAIN {compiled.string}", params)
+    return [dict(row._mapping) for row in rows]
+
+
+def full_scans(conn: Connection, plan: list[dict]) -> list[str]:
+    """
+    Tables the plan reads in full
+    """
+    if conn.dialect.name == "sqlite":
+        return [
+            match.group(1)
+            for match in (_SQLITE_FULL_SCAN.match(step["detail"]) for step in plan)
+            if match
+        ]
+    return [step["table"] for step in plan if (step.get("type") or "").upper() in _MYSQL_FULL_SCAN_TYPES]
+
+
+def check_plans(conn: Connection) -> dict[str, list[str]]:
+    """
+    Returns {query name: [fully scanned tables]} for every query that regressed
+    Raises RuntimeError if the schema is not fully migrated (the queries would fail)
+    """
+    current, latest = current_version(conn), latest_version()
+    if current < latest:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {latest}: "
+            f"run `python -m app.migrations upgrade` before checking plans"
+        )
+
+    problems = {}
+    for name, stmt in hot_queries().items():
+        scanned = full_scans(conn, explain(conn, stmt))
+        if scanned:
+            problems[name] = scanned
+    return problems
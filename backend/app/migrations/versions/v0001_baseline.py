@@ -0,0 +1,19 @@
+"""
+Tables of the original schema (users, videos, likes, watch_later)
+"""
+from sqlalchemy.engine import Connection
+
+from app.db import Base
+
+version = 1
+description = "baseline tables"
+
+
+def upgrade(conn: Connection):
+    import app.models
+
+    # Only creates tables that are missing; databases created before migrations
+    # existed keep their tables and pick up later changes from the next versions
+    Base.metadata.create_all(bind=conn, tables=[
+        Base.metadata.tables[name] for name in ("users", "videos", "likes", "watch_later")
+    ])
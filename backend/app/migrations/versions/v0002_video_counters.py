@@ -0,0 +1,29 @@
+"""
+videos.like_count (denormalized like counter) and videos.upload_id (resumable uploads)
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+version = 2
+description = "videos.like_count and videos.upload_id"
+
+
+def upgrade(conn: Connection):
+    backfill = not ops.has_column(conn, "videos", "like_count")
+    ops.add_column(conn, "videos", "like_count", "INTEGER NOT NULL DEFAULT 0")
+    ops.add_column(conn, "videos", "upload_id", "VARCHAR(1024) NULL")
+
+    if backfill:
+        from app.models.like import Like
+        from app.models.video import Video
+
+        conn.execute(
+            update(Video)
+            .values(
+                like_count=select(func.count()).select_from(Like).where(Like.video_id == Video.id).scalar_subquery(),
+                updated_at=Video.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
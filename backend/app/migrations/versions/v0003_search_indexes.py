@@ -0,0 +1,14 @@
+"""
+Indexes used by search: FULLTEXT(title, description) and the incremental index refresh
+"""
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+version = 3
+description = "search indexes"
+
+
+def upgrade(conn: Connection):
+    ops.create_index(conn, "videos", "ft_videos_title_description", ["title", "description"], fulltext=True)
+    ops.create_index(conn, "videos", "ix_videos_updated_at", ["updated_at"])
@@ -0,0 +1,22 @@
+"""
+Composite indexes matching the filters and orderings of the listing routes
+"""
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+version = 4
+description = "indexes for video, like and watch-later listings"
+
+
+def upgrade(conn: Connection):
+    # GET /videos: status = 'ready' ORDER BY created_at DESC
+    ops.create_index(conn, "videos", "ix_videos_status_created_at", ["status", "created_at"])
+    # GET /users/{id}/videos: uploader_id = ? AND status = 'ready' ORDER BY created_at DESC
+    ops.create_index(
+        conn, "videos", "ix_videos_uploader_status_created_at", ["uploader_id", "status", "created_at"]
+    )
+    # Like counts, engagement lookups and the like_count reconcile job
+    ops.create_index(conn, "likes", "ix_likes_video_id", ["video_id"])
+    # GET /videos/me/watch-later: user_id = ? ORDER BY added_at DESC
+    ops.create_index(conn, "watch_later", "ix_watch_later_user_added_at", ["user_id", "added_at"])
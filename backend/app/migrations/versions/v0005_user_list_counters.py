@@ -0,0 +1,33 @@
+"""
+users.liked_count / users.watch_later_count (totals of the "me" listings) and the
+index behind the newest-first liked-videos listing
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+version = 5
+description = "users.liked_count, users.watch_later_count and likes(user_id, created_at)"
+
+
+def upgrade(conn: Connection):
+    from app.models.like import Like
+    from app.models.user import User
+    from app.models.watch_later import WatchLater
+
+    for column, model in (("liked_count", Like), ("watch_later_count", WatchLater)):
+        backfill = not ops.has_column(conn, "users", column)
+        ops.add_column(conn, "users", column, "INTEGER NOT NULL DEFAULT 0")
+        if backfill:
+            conn.execute(
+                update(User)
+                .values({
+                    column: select(func.count()).select_from(model).where(model.user_id == User.id).scalar_subquery(),
+                    "updated_at": User.updated_at,
+                })
+                .execution_options(synchronize_session=False)
+            )
+
+    # GET /videos/me/liked-videos: user_id = ? ORDER BY created_at DESC
+    ops.create_index(conn, "likes", "ix_likes_user_created_at", ["user_id", "created_at"])
@@ -0,0 +1,21 @@
+"""
+Hourly view buckets and the trending snapshot table, plus likes(created_at) for the
+windowed like scan of the trending job
+"""
+from sqlalchemy.engine import Connection
+
+from app.db import Base
+from app.migrations import ops
+
+version = 6
+description = "video_view_buckets, trending_videos and likes(created_at)"
+
+
+def upgrade(conn: Connection):
+    import app.models
+
+    Base.metadata.create_all(bind=conn, tables=[
+        Base.metadata.tables[name] for name in ("video_view_buckets", "trending_videos")
+    ])
+    # Trending job: created_at >= now - window
+    ops.create_index(conn, "likes", "ix_likes_created_at", ["created_at"])
@@ -0,0 +1,15 @@
+"""
+Co-like neighbours of each video, served by GET /videos/{id}/related
+"""
+from sqlalchemy.engine import Connection
+
+from app.db import Base
+
+version = 7
+description = "related_videos"
+
+
+def upgrade(conn: Connection):
+    import app.models
+
+    Base.metadata.create_all(bind=conn, tables=[Base.metadata.tables["related_videos"]])
@@ -0,0 +1,15 @@
+"""
+videos.upload_num_parts / videos.upload_size: the planned shape of a multipart
+upload, checked before completing it from the parts S3 has received
+"""
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+version = 8
+description = "videos.upload_num_parts and videos.upload_size"
+
+
+def upgrade(conn: Connection):
+    ops.add_column(conn, "videos", "upload_num_parts", "INTEGER NULL")
+    ops.add_column(conn, "videos", "upload_size", "BIGINT NULL")
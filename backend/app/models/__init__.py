@@ -1,4 +1,7 @@
 from .video import Video
 from .user import User
 from .like import Like
-from .watch_later import WatchLater
\ No newline at end of file
+from .watch_later import WatchLater
+from .video_view_bucket import VideoViewBucket
+from .trending_video import TrendingVideo
+from .related_video import RelatedVideo
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, DateTime, Index, UniqueConstraint
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -21,5 +21,11 @@ class Like(Base):
     # Ensure a user can only like a video once
     __table_args__ = (
         UniqueConstraint('user_id', 'video_id', name='unique_user_video_like'),
+        # Per-video lookups: like counts and engagement
+        Index('ix_likes_video_id', 'video_id'),
+        # A user's liked videos, most recent first
+        Index('ix_likes_user_created_at', 'user_id', 'created_at'),
+        # Recent likes across all videos (trending job)
+        Index('ix_likes_created_at', 'created_at'),
     )
 
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, ForeignKey, Float, Integer
+from sqlalchemy.dialects.mysql import CHAR
+
+from app.db import Base
+
+class RelatedVideo(Base):
+    __tablename__ = "related_videos"
+
+    # Top-K neighbours of a video by co-likes, written by app.jobs.related; rank 1 is the closest
+    video_id = Column(CHAR(36), ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True, autoincrement=False)
+    related_video_id = Column(CHAR(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
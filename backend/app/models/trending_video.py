@@ -0,0 +1,13 @@
+from sqlalchemy import Column, ForeignKey, DateTime, Float, Integer
+from sqlalchemy.dialects.mysql import CHAR
+
+from app.db import Base
+
+class TrendingVideo(Base):
+    __tablename__ = "trending_videos"
+
+    # Snapshot written by app.jobs.trending; rank 1 is the top video
+    rank = Column(Integer, primary_key=True, autoincrement=False)
+    video_id = Column(CHAR(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, Integer, DateTime
 from sqlalchemy.dialects.mysql import CHAR, VARCHAR
 from sqlalchemy.orm import relationship
 
@@ -14,6 +14,9 @@ class User(Base):
     email = Column(VARCHAR(255), unique=True, nullable=False, index=True)
     password_hash = Column(VARCHAR(255), nullable=False)
     profile_picture = Column(VARCHAR(2048))
+    # Totals of the user's liked-videos / watch-later listings, maintained by the toggle routes
+    liked_count = Column(Integer, default=0, server_default="0", nullable=False)
+    watch_later_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
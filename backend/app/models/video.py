@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 import uuid
 from sqlalchemy import (
-    Column, String, Text, Enum, Integer, DateTime, ForeignKey
+    Column, String, Text, Enum, Integer, BigInteger, DateTime, ForeignKey, Index
 )
 from sqlalchemy.dialects.mysql import CHAR, VARCHAR
 from sqlalchemy.ext.declarative import declarative_base
@@ -25,9 +25,17 @@ class Video(Base):
     hls_master_key = Column(VARCHAR(1024))
     playback_url = Column(VARCHAR(2048))
     thumbnail_url = Column(VARCHAR(2048))
+    # S3 multipart UploadId while an upload is in progress, cleared once it completes
+    upload_id = Column(VARCHAR(1024))
+    # Planned part count and file size of that upload (when the client sent its size),
+    # checked before completing it from the parts S3 has
+    upload_num_parts = Column(Integer)
+    upload_size = Column(BigInteger)
 
     duration_seconds = Column(Integer)
     views = Column(Integer, default=0, nullable=False)
+    # Denormalized COUNT(*) of likes, maintained by toggle_like (see app.jobs.like_counts)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
@@ -35,3 +43,13 @@ class Video(Base):
     uploader = relationship("User", back_populates="videos")
     likes = relationship("Like", back_populates="video", cascade="all, delete-orphan")
     watch_later_items = relationship("WatchLater", back_populates="video", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Backs the `q` search of list_videos on MySQL (plain index elsewhere)
+        Index("ft_videos_title_description", "title", "description", mysql_prefix="FULLTEXT"),
+        # MAX(updated_at) is the catalog stamp of the response cache
+        Index("ix_videos_updated_at", "updated_at"),
+        # Newest-first listing of ready videos, overall and per uploader
+        Index("ix_videos_status_created_at", "status", "created_at"),
+        Index("ix_videos_uploader_status_created_at", "uploader_id", "status", "created_at"),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, Index
+from sqlalchemy.dialects.mysql import CHAR
+
+from app.db import Base
+
+class VideoViewBucket(Base):
+    __tablename__ = "video_view_buckets"
+
+    # Views of a video per hour, written by the view counter alongside videos.views.
+    # No foreign key: a view flushed after its video was deleted must not fail the batch;
+    # the trending job joins videos and prunes old buckets
+    video_id = Column(CHAR(36), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    views = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        # Windowed reads and pruning by the trending job
+        Index("ix_video_view_buckets_bucket_start", "bucket_start"),
+    )
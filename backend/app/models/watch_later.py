@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, DateTime, Index, UniqueConstraint
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -21,5 +21,7 @@ class WatchLater(Base):
     # Ensure a user can only add a video to watch later once
     __table_args__ = (
         UniqueConstraint('user_id', 'video_id', name='unique_user_video_watch_later'),
+        # A user's list, most recently added first
+        Index('ix_watch_later_user_added_at', 'user_id', 'added_at'),
     )
 
@@ -5,7 +5,8 @@ from sqlalchemy import select
 from app.schemas.user import UserRegister, UserLogin, Token, UserDetail
 from app.models.user import User
 from app.utils.video_utils import get_db
-from app.utils.auth_utils import get_password_hash, verify_password, create_access_token
+from app.utils.auth_utils import create_access_token
+from app.utils.password_hasher import password_hasher
 from app.utils.auth_middleware import get_current_user
 
 router = APIRouter()
@@ -34,7 +35,7 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = password_hasher.hash(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -63,13 +64,25 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     stmt = select(User).where(User.email == user_credentials.email)
     user = db.execute(stmt).scalar_one_or_none()
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if user:
+        is_valid, new_hash = password_hasher.verify_and_update(
+            user_credentials.password, user.password_hash
+        )
+    else:
+        is_valid, new_hash = False, None
+    
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Hash was made with an older bcrypt cost: store the upgraded one
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+    
     # Create access token
     access_token = create_access_token(data={"sub": user.id})
     
@@ -1,7 +1,16 @@
-from fastapi import APIRouter
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
 from sqlalchemy import func, select
 
 from app.db import SessionLocal
+from app.utils.view_counter import view_counter
+from app.utils.cache import response_cache
+from app.utils.principal_cache import principal_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.suggest import title_suggester
+from app.utils.sql_profiler import sql_profiler, SQL_PROFILER_TOKEN
 
 router = APIRouter()
 
@@ -15,4 +24,64 @@ def health_check():
         return {"status": "error", "db": "error", "detail": str(e)}
     finally:
         db.close()
-        
\ No newline at end of file
+
+@router.get("/views")
+def view_counter_stats():
+    """
+    Pending and flushed counts of the buffered view counter
+    """
+    return view_counter.stats()
+
+@router.get("/cache")
+def response_cache_stats():
+    """
+    Hit / miss / eviction counters of the response cache
+    """
+    return response_cache.stats()
+
+@router.get("/auth")
+def principal_cache_stats():
+    """
+    Hit/miss counters of the verified-token principal cache
+    """
+    return principal_cache.stats()
+
+@router.get("/hasher")
+def password_hasher_stats():
+    """
+    Load and rejection counters of the bcrypt worker pool
+    """
+    return password_hasher.stats()
+
+@router.get("/suggest")
+def title_suggester_stats():
+    """
+    Size, memory estimate and pending updates of the title autocomplete index
+    """
+    return title_suggester.stats()
+
+@router.get("/profiler")
+def sql_profiler_stats():
+    """
+    State of the SQL profiler and the most recent requests flagged as N+1
+    """
+    return sql_profiler.stats()
+
+@router.put("/profiler")
+def set_sql_profiler(enabled: bool, x_profiler_token: Optional[str] = Header(None)):
+    """
+    Turn the SQL profiler on or off without a restart (requires SQL_PROFILER_TOKEN)
+    """
+    if not SQL_PROFILER_TOKEN or not x_profiler_token or not hmac.compare_digest(
+        x_profiler_token, SQL_PROFILER_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid profiler token"
+        )
+    
+    if enabled:
+        sql_profiler.enable()
+    else:
+        sql_profiler.disable()
+    return sql_profiler.stats()
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, func
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.schemas.user import Principal
+from app.schemas.video import EngagementRequest, EngagementResponse
 from app.models.user import User
 from app.models.video import Video
 from app.models.like import Like
-from app.schemas.video import VideoItem
-from app.schemas.user import UploaderInfo
-from app.utils.video_utils import get_db
-from app.utils.auth_middleware import get_current_user
+from app.utils.video_utils import get_db, build_video_items
+from app.utils.auth_middleware import get_current_principal
+from app.utils.cache import invalidate_video
+from app.utils.engagement import add_likes, remove_likes, get_engagements
+from app.utils.pagination import keyset_after, split_page
 
 router = APIRouter()
 
@@ -16,7 +20,7 @@ router = APIRouter()
 def toggle_like(
     video_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Toggle like on a video (like if not liked, unlike if already liked)
@@ -29,47 +33,94 @@ def toggle_like(
             detail="Video not found"
         )
     
-    # Check if user has already liked the video
-    stmt = select(Like).where(
-        Like.video_id == video_id,
-        Like.user_id == current_user.id
-    )
-    existing_like = db.execute(stmt).scalar_one_or_none()
+    # Unlike if the DELETE removed a row, otherwise like; counters move in the same transaction
+    is_liked = not remove_likes(db, current_user.id, [video_id])
+    if is_liked:
+        add_likes(db, current_user.id, [video_id])
+    db.commit()
+    invalidate_video(video_id, catalog=False)
     
-    if existing_like:
-        # Unlike - delete the like
-        db.delete(existing_like)
+    return {
+        "message": "Video liked" if is_liked else "Video unliked",
+        "is_liked": is_liked,
+        "like_count": video.like_count
+    }
+
+@router.put("/{video_id}/like")
+def like_video(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Like a video; liking an already liked video is a no-op
+    """
+    if add_likes(db, current_user.id, [video_id]):
         db.commit()
-        
-        # Get updated like count
-        like_count = db.execute(
-            select(func.count()).select_from(Like).where(Like.video_id == video_id)
-        ).scalar_one()
-        
-        return {
-            "message": "Video unliked",
-            "is_liked": False,
-            "like_count": like_count
-        }
-    else:
-        # Like - create new like
-        new_like = Like(
-            user_id=current_user.id,
-            video_id=video_id
-        )
-        db.add(new_like)
+        invalidate_video(video_id, catalog=False)
+    return _like_result(db, video_id, current_user.id, "Video liked")
+
+@router.delete("/{video_id}/like")
+def unlike_video(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Remove the like from a video; unliking a video that is not liked is a no-op
+    """
+    if remove_likes(db, current_user.id, [video_id]):
         db.commit()
-        
-        # Get updated like count
-        like_count = db.execute(
-            select(func.count()).select_from(Like).where(Like.video_id == video_id)
-        ).scalar_one()
-        
-        return {
-            "message": "Video liked",
-            "is_liked": True,
-            "like_count": like_count
-        }
+        invalidate_video(video_id, catalog=False)
+    return _like_result(db, video_id, current_user.id, "Video unliked")
+
+def _like_result(db: Session, video_id: str, user_id: str, message: str) -> dict:
+    engagement = get_engagements(db, [video_id], user_id).get(video_id)
+    if engagement is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video not found"
+        )
+    return {
+        "message": message,
+        "is_liked": engagement.is_liked,
+        "like_count": engagement.like_count
+    }
+
+@router.put("/me/liked-videos", response_model=EngagementResponse)
+def like_videos(
+    request: EngagementRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Like many videos at once; unknown and already liked videos are skipped
+    Returns the engagement of every known video after the change
+    """
+    changed = add_likes(db, current_user.id, request.video_ids)
+    return _bulk_result(db, request.video_ids, current_user.id, changed)
+
+@router.delete("/me/liked-videos", response_model=EngagementResponse)
+def unlike_videos(
+    request: EngagementRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Remove the likes from many videos at once
+    Returns the engagement of every known video after the change
+    """
+    changed = remove_likes(db, current_user.id, request.video_ids)
+    return _bulk_result(db, request.video_ids, current_user.id, changed)
+
+def _bulk_result(db: Session, video_ids: list[str], user_id: str, changed: list[str]) -> EngagementResponse:
+    db.commit()
+    for video_id in changed:
+        invalidate_video(video_id, catalog=False)
+    engagements = get_engagements(db, video_ids, user_id)
+    return EngagementResponse(
+        items=[engagements[vid] for vid in dict.fromkeys(video_ids) if vid in engagements]
+    )
 
 @router.get("/{video_id}/likes")
 def get_video_likes(
@@ -87,57 +138,45 @@ def get_video_likes(
             detail="Video not found"
         )
     
-    like_count = db.execute(
-        select(func.count()).select_from(Like).where(Like.video_id == video_id)
-    ).scalar_one()
-    
     return {
         "video_id": video_id,
-        "like_count": like_count
+        "like_count": video.like_count
     }
 
 @router.get("/me/liked-videos")
 def get_liked_videos(
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
-    Get all videos liked by the current user
+    Get the videos liked by the current user, most recently liked first
+
+    Pass `next_cursor` of the previous response as `cursor` to get the next page.
+    `total` is the user's maintained like counter, so it can include videos that
+    are not (or no longer) ready
     """
-    # Get all likes for the current user, ordered by most recent first
+    # Join and status filter in SQL; seeks on likes(user_id, created_at)
     stmt = (
-        select(Like)
-        .where(Like.user_id == current_user.id)
-        .order_by(Like.created_at.desc())
+        select(Video, Like.created_at.label("liked_at"), Like.id.label("like_id"))
+        .join(Like, Like.video_id == Video.id)
+        .where(Like.user_id == current_user.id, Video.status == "ready")
+        .order_by(Like.created_at.desc(), Like.id.desc())
+        .limit(per_page + 1)
     )
-    likes = db.execute(stmt).scalars().all()
-    
-    videos = []
-    for like in likes:
-        video = like.video
-        if video and video.status == "ready":
-            uploader_info = None
-            if video.uploader:
-                uploader_info = UploaderInfo(
-                    id=video.uploader.id,
-                    username=video.uploader.username,
-                    profile_picture=video.uploader.profile_picture
-                )
-            
-            videos.append(VideoItem(
-                id=video.id,
-                title=video.title,
-                description=video.description,
-                thumbnail_url=video.thumbnail_url,
-                status=video.status,
-                duration_seconds=video.duration_seconds,
-                views=video.views,
-                created_at=video.created_at,
-                uploader=uploader_info
-            ))
+    seek = keyset_after(Like.created_at, Like.id, cursor)
+    if seek is not None:
+        stmt = stmt.where(seek)
+    rows, next_cursor = split_page(db.execute(stmt).all(), per_page, lambda row: (row.liked_at, row.like_id))
+
+    total = db.execute(select(User.liked_count).where(User.id == current_user.id)).scalar_one_or_none()
+    videos = build_video_items(db, [row.Video for row in rows])
     
     return {
-        "total": len(videos),
+        "total": total or 0,
+        "per_page": per_page,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
         "videos": videos
     }
-
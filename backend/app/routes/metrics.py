@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse)
+def metrics():
+    """
+    Request, database pool, cache and S3 metrics in Prometheus text format
+    """
+    return PlainTextResponse("\n".join(registry.render()) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.models.video import Video
 from app.schemas.user import UserProfile
-from app.schemas.video import VideoItem
-from app.schemas.user import UploaderInfo
-from app.utils.video_utils import get_db
+from app.utils.video_utils import get_db, build_video_items, remember_uploader
+from app.utils.pagination import keyset_after, split_page
+from app.utils.http_cache import make_etag, etag_matches, set_cache_headers, not_modified, USER_VIDEOS_CACHE_CONTROL
 
 router = APIRouter()
 
@@ -36,10 +37,15 @@ def get_user_profile(
 @router.get("/{user_id}/videos")
 def get_user_videos(
     user_id: str,
+    response: Response,
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
-    Get all videos uploaded by a specific user
+    Get the ready videos uploaded by a specific user, newest first
+    Pass `next_cursor` of the previous response as `cursor` to get the next page
     """
     # Check if user exists
     user = db.get(User, user_id)
@@ -49,34 +55,36 @@ def get_user_videos(
             detail="User not found"
         )
     
-    # Get all videos uploaded by the user (only ready videos)
+    # Version of the listing: any edit, upload or status change of the user's videos moves it.
+    # The same statement counts the ready ones, which is the listing total
+    last_updated, video_count, ready_count = db.execute(
+        select(
+            func.max(Video.updated_at),
+            func.count(),
+            func.count(case((Video.status == "ready", 1)))
+        ).where(Video.uploader_id == user_id)
+    ).one()
+    etag = make_etag(user.id, user.updated_at, last_updated, video_count, per_page, cursor or "")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, USER_VIDEOS_CACHE_CONTROL)
+    set_cache_headers(response, etag, USER_VIDEOS_CACHE_CONTROL)
+    
+    # Only ready videos; seeks on videos(uploader_id, status, created_at)
     stmt = (
         select(Video)
         .where(Video.uploader_id == user_id, Video.status == "ready")
-        .order_by(Video.created_at.desc())
+        .order_by(Video.created_at.desc(), Video.id.desc())
+        .limit(per_page + 1)
     )
-    videos = db.execute(stmt).scalars().all()
-    
-    uploader_info = UploaderInfo(
-        id=user.id,
-        username=user.username,
-        profile_picture=user.profile_picture
+    seek = keyset_after(Video.created_at, Video.id, cursor)
+    if seek is not None:
+        stmt = stmt.where(seek)
+    videos, next_cursor = split_page(
+        db.execute(stmt).scalars().all(), per_page, lambda video: (video.created_at, video.id)
     )
     
-    video_items = [
-        VideoItem(
-            id=v.id,
-            title=v.title,
-            description=v.description,
-            thumbnail_url=v.thumbnail_url,
-            status=v.status,
-            duration_seconds=v.duration_seconds,
-            views=v.views,
-            created_at=v.created_at,
-            uploader=uploader_info
-        )
-        for v in videos
-    ]
+    remember_uploader(db, user)
+    video_items = build_video_items(db, videos)
     
     return {
         "user": UserProfile(
@@ -85,7 +93,10 @@ def get_user_videos(
             profile_picture=user.profile_picture,
             created_at=user.created_at
         ),
-        "total": len(video_items),
+        "total": ready_count,
+        "per_page": per_page,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
         "videos": video_items
     }
 
@@ -3,8 +3,8 @@ from typing import Optional
 import uuid
 import logging
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy import func, select, or_
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 # Setup logger
@@ -13,186 +13,415 @@ logger = logging.getLogger(__name__)
 from app.schemas.video import (
     VideoCreate,
     VideoDetail,
-    VideoItem,
     VideoListResponse,
+    TrendingResponse,
+    RelatedVideosResponse,
+    Suggestion,
+    SuggestResponse,
     VideoUpdate,
+    EngagementRequest,
+    EngagementResponse,
     presignedresponse,
     MultipartInitiateResponse,
+    MultipartPlanRequest,
+    MultipartPlan,
     MultipartUrlsRequest,
     MultipartUrlsResponse,
     MultipartCompleteRequest,
     MultipartCompleteResponse,
+    MultipartStatusResponse,
     PartUrl,
+    UploadedPart,
 )
-from app.schemas.user import UploaderInfo
-from app.utils.video_utils import get_db
+from app.schemas.user import UploaderInfo, Principal
+from app.utils.video_utils import get_db, build_video_items
 from app.models.video import Video
-from app.models.user import User
-from app.models.like import Like
-from app.models.watch_later import WatchLater
+from app.models.trending_video import TrendingVideo
+from app.models.related_video import RelatedVideo
 from app.utils.s3_utils import (
     generate_presigned_post,
     initiate_multipart_upload,
     generate_multipart_presigned_urls,
+    list_uploaded_parts,
     complete_multipart_upload,
     abort_multipart_upload,
 )
-from app.utils.auth_middleware import get_current_user, get_current_user_optional
+from app.utils.auth_middleware import get_current_principal, get_current_principal_optional
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after
+from app.utils.async_routes import threaded
+from app.utils.upload_planner import plan_multipart_upload, missing_parts
+from app.utils.search import search_index, use_fulltext, fulltext_match
+from app.utils.suggest import title_suggester, SUGGEST_MAX_LIMIT
+from app.utils.view_counter import view_counter
+from app.utils.engagement import get_engagement, get_engagements
+from app.utils.cache import response_cache, list_cache_key, detail_cache_key, invalidate_video
+from app.utils.http_cache import (
+    make_etag,
+    etag_matches,
+    set_cache_headers,
+    not_modified,
+    LIST_CACHE_CONTROL,
+    DETAIL_CACHE_CONTROL,
+    PRIVATE_CACHE_CONTROL,
+)
 
 router = APIRouter()
 
 @router.get("", response_model = VideoListResponse)
 def list_videos(
+    response: Response,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     q: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None, pattern="^(relevance|newest)$"),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    try:
-        base_query = select(Video).where(Video.status == "ready")
-        if q:
-            pattern = f"%{q}%"
-            base_query = base_query.where(
-                or_(
-                    Video.title.ilike(pattern),
-                    Video.description.ilike(pattern),
-                )
-            )
+    """
+    List ready videos
 
-        total_items = db.execute(
-            select(func.count()).select_from(base_query.subquery())
-        ).scalar_one()
+    Two pagination modes are supported:
+    - page mode (default): `page` + `per_page`, always returns totals
+    - cursor mode: pass `cursor` (the `next_cursor` of the previous response) to
+      seek straight to the next page; totals are only counted if `include_total=true`
 
-        query = (
-            base_query.order_by(Video.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
+    With `q`, results are ordered by relevance by default (page mode only);
+    `sort=newest` keeps newest-first ordering and works with cursors
+    """
+    cursor_mode = cursor is not None
+    if sort is None:
+        sort = "relevance" if q and not cursor_mode else "newest"
+    if sort == "relevance" and cursor_mode:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is only supported with sort=newest",
         )
-        results = db.execute(query).scalars().all()
-
-        items = []
-        for v in results:
-            uploader_info = None
-            if v.uploader_id and v.uploader:
-                uploader_info = UploaderInfo(
-                    id=v.uploader.id,
-                    username=v.uploader.username,
-                    profile_picture=v.uploader.profile_picture
-                )
-            
-            items.append(VideoItem(
-                id=v.id,
-                title=v.title,
-                description=v.description,
-                thumbnail_url=v.thumbnail_url,
-                status=v.status,
-                duration_seconds=v.duration_seconds,
-                views=v.views,
-                created_at=v.created_at,
-                uploader=uploader_info
-            ))
-
-        total_pages = math.ceil(total_items / per_page) if total_items > 0 else 0
-
-        return VideoListResponse(
-            page=page,
+
+    try:
+        cache_key = list_cache_key(
+            db, page=None if cursor_mode else page, per_page=per_page, q=q,
+            sort=sort, cursor=cursor, include_total=include_total
+        )
+        # The key already carries the catalog version, so it doubles as the ETag
+        etag = make_etag(cache_key)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, LIST_CACHE_CONTROL)
+        set_cache_headers(response, etag, LIST_CACHE_CONTROL)
+
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return VideoListResponse(**cached)
+
+        base_query = select(Video).where(Video.status == "ready")
+        relevance = None
+        total_items = None
+        if q and not use_fulltext(db):
+            # In-memory index: order every match there, only load this page's rows
+            ranked_ids, offset = search_index.search(
+                db, q, newest=sort == "newest", after=decode_cursor(cursor) if cursor else None
+            )
+            if not cursor_mode:
+                offset = (page - 1) * per_page
+            results, stale = _load_ranked_page(db, base_query, ranked_ids, offset, per_page)
+            if not cursor_mode or include_total:
+                total_items = len(ranked_ids) - len(stale)
+        else:
+            if q:
+                relevance = fulltext_match(q)
+                base_query = base_query.where(relevance > 0)
+
+            if not cursor_mode or include_total:
+                total_items = db.execute(
+                    select(func.count()).select_from(base_query.subquery())
+                ).scalar_one()
+
+            query = base_query
+            if relevance is not None and sort == "relevance":
+                query = query.order_by(relevance.desc())
+            query = query.order_by(Video.created_at.desc(), Video.id.desc())
+            if cursor_mode:
+                seek = keyset_after(Video.created_at, Video.id, cursor)
+                if seek is not None:
+                    query = query.where(seek)
+            else:
+                query = query.offset((page - 1) * per_page)
+
+            # Fetch one extra row to know whether there is a next page
+            results = db.execute(query.limit(per_page + 1)).scalars().all()
+
+        has_next = len(results) > per_page
+        results = results[:per_page]
+
+        items = build_video_items(db, results)
+
+        next_cursor = None
+        if has_next and results and sort == "newest":
+            next_cursor = encode_cursor(results[-1].created_at, results[-1].id)
+
+        total_pages = None
+        if total_items is not None:
+            total_pages = math.ceil(total_items / per_page) if total_items > 0 else 0
+
+        result = VideoListResponse(
+            page=None if cursor_mode else page,
             per_page=per_page,
             total_items=total_items,
             total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1,
+            has_next=has_next,
+            has_prev=bool(cursor) if cursor_mode else page > 1,
+            next_cursor=next_cursor,
             videos=items,
         )
+        response_cache.set(cache_key, result.model_dump(mode="json"))
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
         )
 
+def _load_ranked_page(db: Session, base_query, ranked_ids: list[str], offset: int, per_page: int) -> tuple[list[Video], list[str]]:
+    """
+    Load up to per_page + 1 ready videos following `offset` in the ranked ids, in that order
+    Ids that are no longer ready (changed since the index last synced) are skipped, dropped
+    from the index and returned as the second element
+    """
+    results, stale = [], []
+    start = offset
+    while len(results) <= per_page and start < len(ranked_ids):
+        chunk = ranked_ids[start:start + per_page + 1 - len(results)]
+        start += len(chunk)
+        rows = {video.id: video for video in db.execute(base_query.where(Video.id.in_(chunk))).scalars()}
+        for video_id in chunk:
+            if video_id in rows:
+                results.append(rows[video_id])
+            else:
+                stale.append(video_id)
+    if stale:
+        search_index.discard(stale)
+    return results, stale
+
+@router.get("/trending", response_model=TrendingResponse)
+def list_trending(
+    response: Response,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    after_rank: Optional[int] = Query(None, ge=0),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Trending ready videos, highest time-decayed views / likes score first
+
+    Served from the snapshot refreshed by `python -m app.jobs.trending`: a primary
+    key range read on the rank, whatever the size of the catalog. Pass `next_rank`
+    of the previous response as `after_rank` to get the next page; videos that
+    stopped being ready since the snapshot are skipped without shortening the page
+    """
+    # One extra row to know whether there is a next page
+    stmt = (
+        select(Video, TrendingVideo.rank, TrendingVideo.computed_at)
+        .join(TrendingVideo, TrendingVideo.video_id == Video.id)
+        .where(Video.status == "ready")
+        .order_by(TrendingVideo.rank)
+        .limit(per_page + 1)
+    )
+    if after_rank is not None:
+        stmt = stmt.where(TrendingVideo.rank > after_rank)
+    else:
+        # The snapshot holds at most TRENDING_SIZE rows, so the offset stays cheap
+        stmt = stmt.offset((page - 1) * per_page)
+    rows = db.execute(stmt).all()
+
+    computed_at = rows[0].computed_at if rows else None
+    # The ids make the tag change when a video of the page stops being ready
+    etag = make_etag(
+        "trending", computed_at, None if after_rank is not None else page, per_page, after_rank,
+        ",".join(row.Video.id for row in rows)
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
+    set_cache_headers(response, etag, LIST_CACHE_CONTROL)
+
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    return TrendingResponse(
+        computed_at=computed_at,
+        page=None if after_rank is not None else page,
+        per_page=per_page,
+        has_next=has_next,
+        next_rank=rows[-1].rank if has_next else None,
+        videos=build_video_items(db, [row.Video for row in rows]),
+    )
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest_titles(
+    response: Response,
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=SUGGEST_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Search-as-you-type: most viewed ready videos whose title starts with `prefix`
+    (case and accent insensitive), answered from the in-memory title index
+    """
+    suggestions = title_suggester.suggest(db, prefix, limit)
+    response.headers["Cache-Control"] = LIST_CACHE_CONTROL
+    return SuggestResponse(
+        prefix=prefix,
+        suggestions=[Suggestion(id=video_id, title=title, views=views) for video_id, title, views in suggestions],
+    )
+
+@router.post("/engagement", response_model=EngagementResponse)
+def get_videos_engagement(
+    request: EngagementRequest,
+    db: Session = Depends(get_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
+):
+    """
+    Like counts and the current user's liked / watch-later flags for a list of videos
+    Lets the video grid hydrate its icons in one call instead of one detail call per card
+    """
+    engagements = get_engagements(
+        db,
+        request.video_ids,
+        current_user.id if current_user else None
+    )
+    return EngagementResponse(
+        items=[engagements[vid] for vid in dict.fromkeys(request.video_ids) if vid in engagements]
+    )
+
 @router.get("/{id}", response_model=VideoDetail)
 def get_video(
     id: str, 
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
 ):
-    try:
-        video = db.get(Video, id)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}",
-        )
+    # The user-independent part of the detail is cached; per-user flags are added below
+    cache_key = detail_cache_key(id)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        try:
+            video = db.get(Video, id)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}",
+            )
+
+        if not video or video.status != "ready":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video not found",
+            )
 
+        # Get uploader info
+        uploader_info = None
+        if video.uploader_id and video.uploader:
+            uploader_info = UploaderInfo(
+                id=video.uploader.id,
+                username=video.uploader.username,
+                profile_picture=video.uploader.profile_picture
+            )
+
+        cached = VideoDetail(
+            id=video.id,
+            title=video.title,
+            description=video.description,
+            status=video.status,
+            duration_seconds=video.duration_seconds,
+            views=video.views,
+            created_at=video.created_at,
+            updated_at=video.updated_at,
+            thumbnail_url=video.thumbnail_url,
+            playback_url=video.playback_url,
+            s3_source_key=video.s3_source_key,
+            s3_dest_prefix=video.s3_dest_prefix,
+            hls_master_key=video.hls_master_key,
+            uploader=uploader_info,
+            like_count=video.like_count
+        ).model_dump(mode="json")
+        response_cache.set(cache_key, cached)
+
+    # Count the view; the increment is written to the database in batches
+    view_counter.record(id)
+
+    detail = VideoDetail(**cached)
+    if current_user:
+        # Like count and the current user's flags in one statement
+        engagement = get_engagements(db, [id], current_user.id).get(id)
+        if engagement:
+            detail.like_count = engagement.like_count
+            detail.is_liked = engagement.is_liked
+            detail.is_watch_later = engagement.is_watch_later
+
+    # Views change on every request and are left out of the ETag
+    etag = make_etag(
+        id, detail.updated_at, detail.like_count,
+        current_user.id if current_user else "", detail.is_liked, detail.is_watch_later
+    )
+    cache_control = PRIVATE_CACHE_CONTROL if current_user else DETAIL_CACHE_CONTROL
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control, vary="Authorization")
+    set_cache_headers(response, etag, cache_control, vary="Authorization")
+
+    detail.views += view_counter.pending_for(id)
+    return detail
+
+@router.get("/{id}/related", response_model=RelatedVideosResponse)
+def get_related_videos(
+    id: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    "More like this": videos most often liked by the same users, from the index
+    rebuilt by `python -m app.jobs.related`; topped up with the uploader's other
+    videos when the video has too few co-likes (new or rarely liked videos)
+    """
+    video = db.get(Video, id)
     if not video or video.status != "ready":
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Video not found",
         )
 
-    # Increment view count
-    video.views += 1
-    db.add(video)
-    db.commit()
-    db.refresh(video)
-
-    # Get uploader info
-    uploader_info = None
-    if video.uploader_id and video.uploader:
-        uploader_info = UploaderInfo(
-            id=video.uploader.id,
-            username=video.uploader.username,
-            profile_picture=video.uploader.profile_picture
-        )
-    
-    # Get like count
-    like_count = db.execute(
-        select(func.count()).select_from(Like).where(Like.video_id == id)
-    ).scalar_one()
-    
-    # Check if current user has liked or added to watch later
-    is_liked = False
-    is_watch_later = False
-    if current_user:
-        is_liked = db.execute(
-            select(func.count()).select_from(Like).where(
-                Like.video_id == id,
-                Like.user_id == current_user.id
+    # Primary key range read on related_videos(video_id, rank)
+    related = db.execute(
+        select(Video)
+        .join(RelatedVideo, RelatedVideo.related_video_id == Video.id)
+        .where(RelatedVideo.video_id == id, Video.status == "ready")
+        .order_by(RelatedVideo.rank)
+        .limit(limit)
+    ).scalars().all()
+
+    if len(related) < limit and video.uploader_id:
+        exclude = [id] + [v.id for v in related]
+        related += db.execute(
+            select(Video)
+            .where(
+                Video.uploader_id == video.uploader_id,
+                Video.status == "ready",
+                Video.id.not_in(exclude)
             )
-        ).scalar_one() > 0
-        
-        is_watch_later = db.execute(
-            select(func.count()).select_from(WatchLater).where(
-                WatchLater.video_id == id,
-                WatchLater.user_id == current_user.id
-            )
-        ).scalar_one() > 0
-
-    return VideoDetail(
-        id=video.id,
-        title=video.title,
-        description=video.description,
-        status=video.status,
-        duration_seconds=video.duration_seconds,
-        views=video.views,
-        created_at=video.created_at,
-        updated_at=video.updated_at,
-        thumbnail_url=video.thumbnail_url,
-        playback_url=video.playback_url,
-        s3_source_key=video.s3_source_key,
-        s3_dest_prefix=video.s3_dest_prefix,
-        hls_master_key=video.hls_master_key,
-        uploader=uploader_info,
-        like_count=like_count,
-        is_liked=is_liked,
-        is_watch_later=is_watch_later
-    )
+            .order_by(Video.created_at.desc())
+            .limit(limit - len(related))
+        ).scalars().all()
+
+    return RelatedVideosResponse(video_id=id, videos=build_video_items(db, related))
 
 @router.put("/{id}", response_model=VideoDetail)
 def update_video(
     id: str,
     info_new: VideoUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     try:
         video = db.get(Video, id)
@@ -217,6 +446,9 @@ def update_video(
         db.add(video)
         db.commit()
         db.refresh(video)
+        search_index.update(video)
+        title_suggester.update(video)
+        invalidate_video(video.id)
         
         # Get uploader info
         uploader_info = None
@@ -227,24 +459,8 @@ def update_video(
                 profile_picture=video.uploader.profile_picture
             )
         
-        # Get like count and user's engagement status
-        like_count = db.execute(
-            select(func.count()).select_from(Like).where(Like.video_id == id)
-        ).scalar_one()
-        
-        is_liked = db.execute(
-            select(func.count()).select_from(Like).where(
-                Like.video_id == id,
-                Like.user_id == current_user.id
-            )
-        ).scalar_one() > 0
-        
-        is_watch_later = db.execute(
-            select(func.count()).select_from(WatchLater).where(
-                WatchLater.video_id == id,
-                WatchLater.user_id == current_user.id
-            )
-        ).scalar_one() > 0
+        # Like count and the user's flags in one statement
+        engagement = get_engagement(db, video, current_user.id)
         
         return VideoDetail(
             id=video.id,
@@ -261,9 +477,9 @@ def update_video(
             s3_dest_prefix=video.s3_dest_prefix,
             hls_master_key=video.hls_master_key,
             uploader=uploader_info,
-            like_count=like_count,
-            is_liked=is_liked,
-            is_watch_later=is_watch_later
+            like_count=engagement.like_count,
+            is_liked=engagement.is_liked,
+            is_watch_later=engagement.is_watch_later
         )
     except HTTPException:
         raise
@@ -274,9 +490,10 @@ def update_video(
         )
 
 @router.post("/initiate", response_model=VideoCreate)
+@threaded
 def initiate_video_upload(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     vid = str(uuid.uuid4())
     s3_source_key = f"uploads/{vid}.mp4"
@@ -312,13 +529,17 @@ def initiate_video_upload(
 # ===== MULTIPART UPLOAD ENDPOINTS (with Transfer Acceleration) =====
 
 @router.post("/multipart/initiate", response_model=MultipartInitiateResponse)
+@threaded
 def initiate_multipart_video_upload(
+    request: Optional[MultipartPlanRequest] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Khởi tạo multipart upload session với Transfer Acceleration
+    Nếu client gửi file_size, response kèm theo plan (part size, số part, parallelism)
     """
+    plan = build_upload_plan(request) if request else None
     vid = str(uuid.uuid4())
     s3_source_key = f"uploads/{vid}.mp4"
     
@@ -333,7 +554,9 @@ def initiate_multipart_video_upload(
         status="processing",
         s3_source_key=s3_source_key,
         s3_dest_prefix=f"hls/{vid}/",
-        uploader_id=current_user.id
+        uploader_id=current_user.id,
+        upload_num_parts=plan.num_parts if plan else None,
+        upload_size=plan.file_size if plan else None
     )
     db.add(video)
     db.commit()
@@ -344,6 +567,10 @@ def initiate_multipart_video_upload(
         result = initiate_multipart_upload(s3_source_key, content_type="video/mp4")
         upload_id = result['upload_id']
         logger.info(f"[API] Multipart upload initiated. upload_id: {upload_id}")
+        
+        # Lưu upload_id để client có thể resume upload
+        video.upload_id = upload_id
+        db.commit()
     except Exception as e:
         logger.error(f"[API] Failed to initiate multipart upload: {str(e)}", exc_info=True)
         db.delete(video)
@@ -356,14 +583,36 @@ def initiate_multipart_video_upload(
     return MultipartInitiateResponse(
         video_id=vid,
         upload_id=upload_id,
-        key=s3_source_key
+        key=s3_source_key,
+        plan=plan
     )
 
+def build_upload_plan(request: MultipartPlanRequest) -> MultipartPlan:
+    try:
+        return MultipartPlan(**plan_multipart_upload(
+            request.file_size,
+            bandwidth_mbps=request.bandwidth_mbps,
+            max_parallelism=request.max_parallelism
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/multipart/plan", response_model=MultipartPlan)
+def plan_multipart_video_upload(
+    request: MultipartPlanRequest,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Tính part size, số part và số kết nối song song cho một file (theo giới hạn S3)
+    """
+    return build_upload_plan(request)
+
 @router.post("/multipart/get-urls", response_model=MultipartUrlsResponse)
+@threaded
 def get_multipart_upload_urls(
     request: MultipartUrlsRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Generate presigned URLs cho từng part (hỗ trợ Transfer Acceleration)
@@ -381,12 +630,15 @@ def get_multipart_upload_urls(
         logger.error(f"[API] Unauthorized access attempt by user {current_user.id} to video {request.video_id}")
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    upload_id = active_upload_id(video, request.upload_id)
     try:
         # Generate presigned URLs cho các parts
         urls = generate_multipart_presigned_urls(
             video.s3_source_key,
-            request.upload_id,
-            request.num_parts
+            upload_id,
+            request.num_parts,
+            start_part=request.start_part,
+            count=request.count
         )
         logger.info(f"[API] Generated {len(urls)} presigned URLs successfully")
     except Exception as e:
@@ -396,22 +648,67 @@ def get_multipart_upload_urls(
             detail=f"Failed to generate presigned URLs: {str(e)}"
         )
 
+    last_part = urls[-1]['part_number'] if urls else request.num_parts
     return MultipartUrlsResponse(
-        parts=[PartUrl(**part) for part in urls]
+        parts=[PartUrl(**part) for part in urls],
+        next_part=last_part + 1 if last_part < request.num_parts else None
+    )
+
+@router.get("/multipart/{video_id}/status", response_model=MultipartStatusResponse)
+@threaded
+def get_multipart_upload_status(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Trạng thái multipart upload: các part S3 đã nhận (dùng để resume upload)
+    Client chỉ cần upload lại các part còn thiếu
+    """
+    logger.info(f"[API] Status request from user: {current_user.id}, video_id: {video_id}")
+    
+    video = db.get(Video, video_id)
+    if not video:
+        logger.error(f"[API] Video not found: {video_id}")
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    if video.uploader_id != current_user.id:
+        logger.error(f"[API] Unauthorized access attempt by user {current_user.id} to video {video_id}")
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    active_upload_id(video)
+
+    try:
+        parts = list_uploaded_parts(video.s3_source_key, video.upload_id)
+    except Exception as e:
+        logger.error(f"[API] Failed to list uploaded parts: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get upload status: {str(e)}"
+        )
+
+    return MultipartStatusResponse(
+        video_id=video.id,
+        upload_id=video.upload_id,
+        key=video.s3_source_key,
+        parts=[UploadedPart(**part) for part in parts],
+        uploaded_parts=len(parts),
+        uploaded_bytes=sum(part['size'] for part in parts)
     )
 
 @router.post("/multipart/complete", response_model=MultipartCompleteResponse)
+@threaded
 def complete_multipart_video_upload(
     request: MultipartCompleteRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Hoàn thành multipart upload
     """
     logger.info(f"[API] Complete request from user: {current_user.id}")
     logger.info(f"[API] video_id: {request.video_id}, upload_id: {request.upload_id}")
-    logger.info(f"[API] Number of parts to complete: {len(request.parts)}")
+    logger.info(f"[API] Number of parts to complete: {len(request.parts) if request.parts is not None else 'from S3'}")
     
     # Verify video belongs to current user
     video = db.query(Video).filter(Video.id == request.video_id).first()
@@ -423,43 +720,138 @@ def complete_multipart_video_upload(
         logger.error(f"[API] Unauthorized access attempt by user {current_user.id} to video {request.video_id}")
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    upload_id = active_upload_id(video, request.upload_id)
+
     try:
         # Complete multipart upload trên S3
-        parts_data = [
-            {
-                'PartNumber': part.part_number,
-                'ETag': part.etag
-            }
-            for part in request.parts
-        ]
+        if request.parts:
+            parts_data = [
+                {
+                    'PartNumber': part.part_number,
+                    'ETag': part.etag
+                }
+                for part in request.parts
+            ]
+        else:
+            # Client không gửi danh sách part: lấy từ ListParts phía server,
+            # chỉ complete khi đã đủ part (S3 chấp nhận cả upload thiếu part)
+            uploaded = list_uploaded_parts(video.s3_source_key, upload_id)
+            check_upload_whole(video, uploaded, request.num_parts)
+            parts_data = [
+                {
+                    'PartNumber': part['part_number'],
+                    'ETag': part['etag']
+                }
+                for part in uploaded
+            ]
         
         logger.info(f"[API] Completing multipart upload with {len(parts_data)} parts")
         
         complete_multipart_upload(
             video.s3_source_key,
-            request.upload_id,
+            upload_id,
             parts_data
         )
         
+        video.upload_id = None
+        video.upload_num_parts = None
+        video.upload_size = None
+        db.commit()
         logger.info(f"[API] Multipart upload completed successfully for video {request.video_id}")
         
+    except HTTPException:
+        raise
     except Exception as e:
+        # upload_id được giữ lại: các part đã upload vẫn còn, client có thể complete lại
+        # (chỉ abort khi client huỷ upload)
         logger.error(f"[API] Failed to complete multipart upload: {str(e)}", exc_info=True)
-        
-        # Nếu complete fail, có thể abort upload để cleanup
-        try:
-            logger.info(f"[API] Attempting to abort upload for cleanup")
-            abort_multipart_upload(video.s3_source_key, request.upload_id)
-        except Exception as abort_error:
-            logger.error(f"[API] Failed to abort upload: {str(abort_error)}")
-        
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to complete multipart upload: {str(e)}"
+            detail=f"Failed to complete multipart upload, it can be retried: {str(e)}"
         )
 
     return MultipartCompleteResponse(
         video_id=request.video_id,
         status="processing",
         message="Upload completed successfully. Video is being processed."
-    )
\ No newline at end of file
+    )
+
+@router.delete("/multipart/{video_id}", response_model=MultipartCompleteResponse)
+@threaded
+def cancel_multipart_video_upload(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Huỷ multipart upload: abort trên S3 (xoá các part đã upload) và xoá video record
+    """
+    logger.info(f"[API] Cancel request from user: {current_user.id}, video_id: {video_id}")
+
+    video = db.get(Video, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    if video.uploader_id != current_user.id:
+        logger.error(f"[API] Unauthorized access attempt by user {current_user.id} to video {video_id}")
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    upload_id = active_upload_id(video)
+    try:
+        abort_multipart_upload(video.s3_source_key, upload_id)
+    except Exception as e:
+        logger.error(f"[API] Failed to abort multipart upload: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to cancel multipart upload: {str(e)}"
+        )
+
+    db.delete(video)
+    db.commit()
+    return MultipartCompleteResponse(
+        video_id=video_id,
+        status="cancelled",
+        message="Upload cancelled."
+    )
+
+def active_upload_id(video: Video, upload_id: Optional[str] = None) -> str:
+    """
+    UploadId of the multipart upload in progress for a video
+    Raises 409 if there is none, or if the client names a different one
+    """
+    if not video.upload_id:
+        raise HTTPException(status_code=409, detail="No multipart upload in progress for this video")
+    if upload_id and upload_id != video.upload_id:
+        raise HTTPException(status_code=409, detail="upload_id does not match the upload in progress for this video")
+    return video.upload_id
+
+def check_upload_whole(video: Video, uploaded: list, num_parts: Optional[int]):
+    """
+    Raise 409 unless S3 holds exactly parts 1..N (and the planned number of bytes)
+    N is the part count planned at initiate, else the one the client sent
+    """
+    expected = video.upload_num_parts or num_parts
+    if not expected:
+        raise HTTPException(
+            status_code=409,
+            detail="Part count unknown: send parts or num_parts to complete this upload"
+        )
+    if num_parts and num_parts != expected:
+        raise HTTPException(status_code=409, detail=f"Upload was planned with {expected} parts, not {num_parts}")
+
+    part_numbers = [part['part_number'] for part in uploaded]
+    missing = missing_parts(part_numbers, expected)
+    if missing:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {len(missing)} of {expected} parts missing (first missing: {missing[0]})"
+        )
+    if len(part_numbers) != expected:
+        raise HTTPException(status_code=409, detail=f"Upload has parts beyond the planned {expected}")
+    if video.upload_size is not None:
+        uploaded_bytes = sum(part['size'] for part in uploaded)
+        if uploaded_bytes != video.upload_size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {uploaded_bytes} of {video.upload_size} bytes received"
+            )
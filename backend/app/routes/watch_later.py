@@ -1,22 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.schemas.user import Principal
+from app.schemas.video import EngagementRequest, EngagementResponse
 from app.models.user import User
 from app.models.video import Video
 from app.models.watch_later import WatchLater
-from app.schemas.video import VideoItem
-from app.schemas.user import UploaderInfo
-from app.utils.video_utils import get_db
-from app.utils.auth_middleware import get_current_user
+from app.utils.video_utils import get_db, build_video_items
+from app.utils.auth_middleware import get_current_principal
+from app.utils.engagement import add_watch_later, remove_watch_later, get_engagements
+from app.utils.pagination import keyset_after, split_page
 
 router = APIRouter()
 
+# Declared before the /{video_id}/watch-later routes, which would otherwise match video_id="me"
+@router.put("/me/watch-later", response_model=EngagementResponse)
+def add_many_to_watch_later(
+    request: EngagementRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Add many videos to watch later at once; unknown and already added videos are skipped
+    Returns the engagement of every known video after the change
+    """
+    add_watch_later(db, current_user.id, request.video_ids)
+    return _bulk_result(db, request.video_ids, current_user.id)
+
+@router.delete("/me/watch-later", response_model=EngagementResponse)
+def remove_many_from_watch_later(
+    request: EngagementRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Remove many videos from watch later at once
+    Returns the engagement of every known video after the change
+    """
+    remove_watch_later(db, current_user.id, request.video_ids)
+    return _bulk_result(db, request.video_ids, current_user.id)
+
+def _bulk_result(db: Session, video_ids: list[str], user_id: str) -> EngagementResponse:
+    db.commit()
+    engagements = get_engagements(db, video_ids, user_id)
+    return EngagementResponse(
+        items=[engagements[vid] for vid in dict.fromkeys(video_ids) if vid in engagements]
+    )
+
 @router.post("/{video_id}/watch-later")
 def toggle_watch_later(
     video_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Toggle watch later for a video (add if not added, remove if already added)
@@ -29,78 +66,89 @@ def toggle_watch_later(
             detail="Video not found"
         )
     
-    # Check if user has already added the video to watch later
-    stmt = select(WatchLater).where(
-        WatchLater.video_id == video_id,
-        WatchLater.user_id == current_user.id
-    )
-    existing_watch_later = db.execute(stmt).scalar_one_or_none()
+    # Remove if the DELETE removed a row, otherwise add; the counter moves in the same transaction
+    is_watch_later = not remove_watch_later(db, current_user.id, [video_id])
+    if is_watch_later:
+        add_watch_later(db, current_user.id, [video_id])
+    db.commit()
     
-    if existing_watch_later:
-        # Remove from watch later
-        db.delete(existing_watch_later)
+    return {
+        "message": "Added to watch later" if is_watch_later else "Removed from watch later",
+        "is_watch_later": is_watch_later
+    }
+
+@router.put("/{video_id}/watch-later")
+def add_to_watch_later(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Add a video to watch later; adding a video that is already in the list is a no-op
+    """
+    if add_watch_later(db, current_user.id, [video_id]):
         db.commit()
-        
-        return {
-            "message": "Removed from watch later",
-            "is_watch_later": False
-        }
-    else:
-        # Add to watch later
-        new_watch_later = WatchLater(
-            user_id=current_user.id,
-            video_id=video_id
-        )
-        db.add(new_watch_later)
+    return _watch_later_result(db, video_id, current_user.id, "Added to watch later")
+
+@router.delete("/{video_id}/watch-later")
+def remove_from_watch_later(
+    video_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Remove a video from watch later; removing a video that is not in the list is a no-op
+    """
+    if remove_watch_later(db, current_user.id, [video_id]):
         db.commit()
-        
-        return {
-            "message": "Added to watch later",
-            "is_watch_later": True
-        }
+    return _watch_later_result(db, video_id, current_user.id, "Removed from watch later")
+
+def _watch_later_result(db: Session, video_id: str, user_id: str, message: str) -> dict:
+    engagement = get_engagements(db, [video_id], user_id).get(video_id)
+    if engagement is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video not found"
+        )
+    return {
+        "message": message,
+        "is_watch_later": engagement.is_watch_later
+    }
 
 @router.get("/me/watch-later")
 def get_watch_later_videos(
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
-    Get all videos in the current user's watch later list
+    Get the current user's watch later list, most recently added first
+
+    Pass `next_cursor` of the previous response as `cursor` to get the next page.
+    `total` is the user's maintained watch-later counter, so it can include videos
+    that are not (or no longer) ready
     """
-    # Get all watch later entries for the current user, ordered by most recent first
+    # Join and status filter in SQL; seeks on watch_later(user_id, added_at)
     stmt = (
-        select(WatchLater)
-        .where(WatchLater.user_id == current_user.id)
-        .order_by(WatchLater.added_at.desc())
+        select(Video, WatchLater.added_at, WatchLater.id.label("watch_later_id"))
+        .join(WatchLater, WatchLater.video_id == Video.id)
+        .where(WatchLater.user_id == current_user.id, Video.status == "ready")
+        .order_by(WatchLater.added_at.desc(), WatchLater.id.desc())
+        .limit(per_page + 1)
     )
-    watch_later_items = db.execute(stmt).scalars().all()
-    
-    videos = []
-    for item in watch_later_items:
-        video = item.video
-        if video and video.status == "ready":
-            uploader_info = None
-            if video.uploader:
-                uploader_info = UploaderInfo(
-                    id=video.uploader.id,
-                    username=video.uploader.username,
-                    profile_picture=video.uploader.profile_picture
-                )
-            
-            videos.append(VideoItem(
-                id=video.id,
-                title=video.title,
-                description=video.description,
-                thumbnail_url=video.thumbnail_url,
-                status=video.status,
-                duration_seconds=video.duration_seconds,
-                views=video.views,
-                created_at=video.created_at,
-                uploader=uploader_info
-            ))
+    seek = keyset_after(WatchLater.added_at, WatchLater.id, cursor)
+    if seek is not None:
+        stmt = stmt.where(seek)
+    rows, next_cursor = split_page(db.execute(stmt).all(), per_page, lambda row: (row.added_at, row.watch_later_id))
+
+    total = db.execute(select(User.watch_later_count).where(User.id == current_user.id)).scalar_one_or_none()
+    videos = build_video_items(db, [row.Video for row in rows])
     
     return {
-        "total": len(videos),
+        "total": total or 0,
+        "per_page": per_page,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
         "videos": videos
-    }
-
+    }
\ No newline at end of file
@@ -48,3 +48,8 @@ class UploaderInfo(BaseModel):
     username: str
     profile_picture: Optional[str] = None
 
+# Authenticated caller snapshot (cached per token, no DB lookup on hit)
+class Principal(BaseModel):
+    id: str
+    username: str
+    profile_picture: Optional[str] = None
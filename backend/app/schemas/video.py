@@ -58,16 +58,47 @@ class VideoUpdate(BaseModel):
     title: Optional[str] = Field(default=None, max_length=255)
     description: Optional[str] = None
 
+# Engagement schemas
+class VideoEngagement(BaseModel):
+    video_id: str
+    like_count: int = 0
+    is_liked: bool = False
+    is_watch_later: bool = False
+
+class EngagementRequest(BaseModel):
+    video_ids: list[str] = Field(..., max_length=100)
+
+class EngagementResponse(BaseModel):
+    items: list[VideoEngagement]
+
 # Multipart upload schemas
+class MultipartPlanRequest(BaseModel):
+    file_size: int = Field(..., gt=0)
+    # Client hints, both optional
+    bandwidth_mbps: Optional[float] = Field(default=None, gt=0)
+    max_parallelism: Optional[int] = Field(default=None, ge=1)
+
+class MultipartPlan(BaseModel):
+    file_size: int
+    part_size: int
+    num_parts: int
+    parallelism: int
+
 class MultipartInitiateResponse(BaseModel):
     video_id: str
     upload_id: str
     key: str
+    # Only present when the client sent its file size
+    plan: Optional[MultipartPlan] = None
 
 class MultipartUrlsRequest(BaseModel):
     video_id: str
-    upload_id: str
-    num_parts: int
+    # Defaults to the upload in progress; any other value is refused
+    upload_id: Optional[str] = None
+    num_parts: int = Field(..., ge=1, le=10000)
+    # Optional window of parts to sign; defaults to all of them
+    start_part: int = Field(default=1, ge=1, le=10000)
+    count: Optional[int] = Field(default=None, ge=1, le=10000)
 
 class PartUrl(BaseModel):
     part_number: int
@@ -75,6 +106,8 @@ class PartUrl(BaseModel):
 
 class MultipartUrlsResponse(BaseModel):
     parts: list[PartUrl]
+    # First part of the next window, None once the last part was signed
+    next_part: Optional[int] = None
 
 class CompletedPart(BaseModel):
     part_number: int = Field(..., alias="PartNumber")
@@ -83,9 +116,25 @@ class CompletedPart(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 class MultipartCompleteRequest(BaseModel):
+    video_id: str
+    # Both default to the server-side state: the stored upload_id and the parts S3 has
+    upload_id: Optional[str] = None
+    parts: Optional[list[CompletedPart]] = None
+    # Expected part count, required to complete from S3's parts if no plan was made at initiate
+    num_parts: Optional[int] = Field(default=None, ge=1, le=10000)
+
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+    size: int
+
+class MultipartStatusResponse(BaseModel):
     video_id: str
     upload_id: str
-    parts: list[CompletedPart]
+    key: str
+    parts: list[UploadedPart]
+    uploaded_parts: int
+    uploaded_bytes: int
 
 class MultipartCompleteResponse(BaseModel):
     video_id: str
@@ -94,10 +143,36 @@ class MultipartCompleteResponse(BaseModel):
 
 # summary schemas
 class VideoListResponse(BaseModel):
-    page: int
+    page: Optional[int] = None
     per_page: int
-    total_items: int
-    total_pages: int
+    # Only computed in page mode, or in cursor mode when include_total=true
+    total_items: Optional[int] = None
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
-    videos: Optional[list[VideoItem]] = None
\ No newline at end of file
+    next_cursor: Optional[str] = None
+    videos: Optional[list[VideoItem]] = None
+class TrendingResponse(BaseModel):
+    # When the snapshot was computed; None until app.jobs.trending has run
+    computed_at: Optional[datetime] = None
+    # None when paging with after_rank
+    page: Optional[int] = None
+    per_page: int
+    has_next: bool
+    # Pass as after_rank to get the next page
+    next_rank: Optional[int] = None
+    videos: list[VideoItem]
+
+class RelatedVideosResponse(BaseModel):
+    video_id: str
+    # Co-like neighbours first, then the uploader's other videos
+    videos: list[VideoItem]
+
+class Suggestion(BaseModel):
+    id: str
+    title: str
+    views: int
+
+class SuggestResponse(BaseModel):
+    prefix: str
+    suggestions: list[Suggestion]
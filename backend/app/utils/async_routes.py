@@ -0,0 +1,86 @@
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+
+from app.utils.auth_middleware import (
+    get_current_user,
+    get_current_user_optional,
+    get_current_user_async,
+    get_current_user_optional_async,
+    get_current_principal,
+    get_current_principal_optional,
+    get_current_principal_async,
+    get_current_principal_optional_async,
+)
+from app.utils.video_utils import get_db, get_async_db
+
+# Sync dependency -> async replacement used when DB_MODE=async
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+    get_current_user_optional: get_current_user_optional_async,
+    get_current_principal: get_current_principal_async,
+    get_current_principal_optional: get_current_principal_optional_async,
+}
+
+
+def threaded(endpoint):
+    """
+    Keep a route on the thread pool even when DB_MODE=async
+    For routes doing blocking non-database I/O (boto3 calls) or CPU-heavy work
+    """
+    endpoint.keep_threaded = True
+    return endpoint
+
+
+def asyncify_endpoint(endpoint):
+    """
+    Turn a sync route into an async one running on the event loop
+
+    The sync body is executed through `AsyncSession.run_sync`, which hands it the
+    session behind the async connection; every query (lazy loads included) then
+    goes through the async driver instead of blocking a thread pool worker
+    """
+    signature = inspect.signature(endpoint)
+    if "db" not in signature.parameters or getattr(endpoint, "keep_threaded", False):
+        return endpoint
+
+    parameters = []
+    for param in signature.parameters.values():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency in ASYNC_DEPENDENCIES:
+            param = param.replace(default=Depends(ASYNC_DEPENDENCIES[dependency]))
+        parameters.append(param)
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """
+    Copy of a router whose database-backed routes are async
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+
+        async_router.add_api_route(
+            route.path,
+            asyncify_endpoint(route.endpoint),
+            methods=route.methods,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            name=route.name,
+            summary=route.summary,
+            description=route.description,
+        )
+    return async_router
@@ -2,10 +2,13 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.schemas.user import Principal
 from app.utils.auth_utils import decode_access_token
-from app.utils.video_utils import get_db
+from app.utils.principal_cache import principal_cache
+from app.utils.video_utils import get_db, get_async_db
 
 # Security scheme for JWT token
 security = HTTPBearer()
@@ -67,3 +70,166 @@ def get_current_user_optional(
     except:
         return None
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Async variant of get_current_user, used when DB_MODE=async
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = decode_access_token(credentials.credentials)
+    if payload is None:
+        raise credentials_exception
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    
+    user = await db.get(User, user_id)
+    if user is None:
+        raise credentials_exception
+    
+    return user
+
+async def get_current_user_optional_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """
+    Async variant of get_current_user_optional, used when DB_MODE=async
+    """
+    if credentials is None:
+        return None
+    
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("sub") is None:
+        return None
+    
+    return await db.get(User, payload.get("sub"))
+
+def _verify_token(token: str) -> Optional[dict]:
+    """
+    Decode a token and return its payload if it is valid and names a user
+    """
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+    return payload
+
+def _remember_principal(token: str, user: User, payload: dict) -> Principal:
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        profile_picture=user.profile_picture
+    )
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+def _principal_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Dependency for routes that only need who the caller is (id, username, picture)
+    Verified tokens are cached, so repeat requests touch neither the JWT signature
+    check nor the users table
+    """
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = _verify_token(token)
+    if payload is None:
+        raise _principal_exception()
+    
+    user = db.get(User, payload["sub"])
+    if user is None:
+        raise _principal_exception()
+    
+    return _remember_principal(token, user, payload)
+
+def get_current_principal_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: Session = Depends(get_db)
+) -> Optional[Principal]:
+    """
+    Like get_current_principal, but returns None if not authenticated
+    """
+    if credentials is None:
+        return None
+    
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = _verify_token(token)
+    if payload is None:
+        return None
+    
+    user = db.get(User, payload["sub"])
+    if user is None:
+        return None
+    
+    return _remember_principal(token, user, payload)
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Async variant of get_current_principal, used when DB_MODE=async
+    """
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = _verify_token(token)
+    if payload is None:
+        raise _principal_exception()
+    
+    user = await db.get(User, payload["sub"])
+    if user is None:
+        raise _principal_exception()
+    
+    return _remember_principal(token, user, payload)
+
+async def get_current_principal_optional_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """
+    Async variant of get_current_principal_optional, used when DB_MODE=async
+    """
+    if credentials is None:
+        return None
+    
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = _verify_token(token)
+    if payload is None:
+        return None
+    
+    user = await db.get(User, payload["sub"])
+    if user is None:
+        return None
+    
+    return _remember_principal(token, user, payload)
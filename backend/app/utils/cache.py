@@ -0,0 +1,325 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.video import Video
+from app.utils.metrics import cache_lookups_total, cache_operation_duration_seconds
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory | redis | none
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+# memory:// serves the redis backend from an in-process LocalRedis (tests, single worker)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# How often each worker re-reads MAX(videos.updated_at) to notice writes made
+# outside this process (e.g. the vod-job-complete Lambda marking a video ready)
+CATALOG_STAMP_SECONDS = float(os.getenv("CATALOG_STAMP_SECONDS", "5"))
+
+CATALOG_GENERATION_KEY = "videos:catalog-generation"
+
+
+class CacheBackend(ABC):
+    """
+    Interface of the response cache store
+    Values are JSON-compatible objects so that a networked store can hold them
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class NullCache(CacheBackend):
+    """
+    Cache that never stores anything (CACHE_BACKEND=none)
+    """
+
+    def __init__(self):
+        self.counters: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def incr(self, key: str) -> int:
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    def get_counter(self, key: str) -> int:
+        return self.counters.get(key, 0)
+
+
+class LRUCache(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL and a bound on the number of entries
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, default_ttl: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Counters never expire and are not subject to eviction
+        self.counters: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+            return self.counters[key]
+
+    def get_counter(self, key: str) -> int:
+        with self.lock:
+            return self.counters.get(key, 0)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "backend": "memory",
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisCache(CacheBackend):
+    """
+    CacheBackend over a Redis-compatible client (get / set(ex=) / delete / incr)
+    Shared by all workers, so an invalidation in one worker is seen by the others
+    """
+
+    def __init__(self, client, default_ttl: float = CACHE_TTL_SECONDS, prefix: str = "streamvod:"):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        with self.lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def get_counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+class LocalRedis:
+    """
+    In-process stand-in for the subset of the Redis client RedisCache uses
+    (get / set(ex=) / delete / incr), storing bytes like Redis does
+    Lets tests and single-worker setups run the shared backend without a server
+    """
+
+    def __init__(self):
+        self.data: dict[str, tuple[Optional[float], bytes]] = {}
+        self.lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            return self._live(key)
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        raw = value if isinstance(value, bytes) else str(value).encode()
+        with self.lock:
+            self.data[key] = (time.monotonic() + ex if ex else None, raw)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self.lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key: str) -> int:
+        with self.lock:
+            value = int(self._live(key) or 0) + 1
+            expires_at = self.data[key][0] if key in self.data else None
+            self.data[key] = (expires_at, str(value).encode())
+            return value
+
+
+class InstrumentedCache(CacheBackend):
+    """
+    Wraps a backend to export call latency and hit/miss counts to /metrics
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[Any]:
+        with cache_operation_duration_seconds.time("get"):
+            value = self.backend.get(key)
+        cache_lookups_total.inc("miss" if value is None else "hit")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with cache_operation_duration_seconds.time("set"):
+            self.backend.set(key, value, ttl)
+
+    def delete(self, key: str):
+        with cache_operation_duration_seconds.time("delete"):
+            self.backend.delete(key)
+
+    def incr(self, key: str) -> int:
+        with cache_operation_duration_seconds.time("incr"):
+            return self.backend.incr(key)
+
+    def get_counter(self, key: str) -> int:
+        with cache_operation_duration_seconds.time("get_counter"):
+            return self.backend.get_counter(key)
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+
+def create_cache() -> CacheBackend:
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    if CACHE_BACKEND == "redis":
+        if CACHE_REDIS_URL == "memory://":
+            return InstrumentedCache(RedisCache(LocalRedis()))
+        import redis
+        return InstrumentedCache(RedisCache(redis.Redis.from_url(CACHE_REDIS_URL)))
+    return InstrumentedCache(LRUCache())
+
+
+response_cache = create_cache()
+
+_stamp_lock = threading.Lock()
+_stamp = {"value": None, "checked_at": 0.0}
+
+
+def _database_stamp(db: Session) -> str:
+    now = time.monotonic()
+    with _stamp_lock:
+        if _stamp["value"] is not None and now - _stamp["checked_at"] < CATALOG_STAMP_SECONDS:
+            return _stamp["value"]
+
+    latest = db.execute(select(func.max(Video.updated_at))).scalar()
+    value = latest.isoformat() if latest else "empty"
+    with _stamp_lock:
+        _stamp["value"] = value
+        _stamp["checked_at"] = now
+    return value
+
+
+def catalog_version(db: Session) -> str:
+    """
+    Version of the video catalog used in list cache keys
+    Changes when this app invalidates the catalog or when any video row is updated
+    """
+    generation = response_cache.get_counter(CATALOG_GENERATION_KEY)
+    return f"{generation}.{_database_stamp(db)}"
+
+
+def list_cache_key(db: Session, **params) -> str:
+    parts = "&".join(f"{k}={params[k]}" for k in sorted(params) if params[k] is not None)
+    return f"videos:list:{catalog_version(db)}:{parts}"
+
+
+def detail_cache_key(video_id: str) -> str:
+    return f"videos:detail:{video_id}"
+
+
+def invalidate_video(video_id: str, catalog: bool = True):
+    """
+    Drop the cached detail of a video, and all cached list pages unless catalog=False
+    """
+    response_cache.delete(detail_cache_key(video_id))
+    if catalog:
+        response_cache.incr(CATALOG_GENERATION_KEY)
@@ -0,0 +1,189 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, insert, select, update, delete
+from sqlalchemy.orm import Session
+
+from app.models.like import Like
+from app.models.user import User
+from app.models.video import Video
+from app.models.watch_later import WatchLater
+from app.schemas.video import VideoEngagement
+
+
+def get_engagements(
+    db: Session,
+    video_ids: Iterable[str],
+    user_id: Optional[str] = None
+) -> dict[str, VideoEngagement]:
+    """
+    Like count and the user's liked / watch-later flags for many videos in one statement
+    Unknown video ids are left out of the result
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids:
+        return {}
+
+    if user_id is None:
+        rows = db.execute(
+            select(Video.id, Video.like_count).where(Video.id.in_(video_ids))
+        ).all()
+        return {
+            row.id: VideoEngagement(video_id=row.id, like_count=row.like_count)
+            for row in rows
+        }
+
+    stmt = (
+        select(
+            Video.id,
+            Video.like_count,
+            Like.id.is_not(None).label("is_liked"),
+            WatchLater.id.is_not(None).label("is_watch_later"),
+        )
+        .outerjoin(Like, and_(Like.video_id == Video.id, Like.user_id == user_id))
+        .outerjoin(WatchLater, and_(WatchLater.video_id == Video.id, WatchLater.user_id == user_id))
+        .where(Video.id.in_(video_ids))
+    )
+    return {
+        row.id: VideoEngagement(
+            video_id=row.id,
+            like_count=row.like_count,
+            is_liked=bool(row.is_liked),
+            is_watch_later=bool(row.is_watch_later)
+        )
+        for row in db.execute(stmt).all()
+    }
+
+
+def get_engagement(db: Session, video: Video, user_id: Optional[str] = None) -> VideoEngagement:
+    """
+    Engagement of a single, already loaded video
+    Anonymous callers cost no query since like_count is on the row
+    """
+    if user_id is None:
+        return VideoEngagement(video_id=video.id, like_count=video.like_count)
+
+    engagement = get_engagements(db, [video.id], user_id).get(video.id)
+    return engagement or VideoEngagement(video_id=video.id, like_count=video.like_count)
+
+
+# Set-style writes: each helper issues one INSERT-or-ignore / DELETE for all the videos
+# plus the counter updates, in the caller's transaction (the caller commits). A
+# double-click or a concurrent request hits the unique constraint and is ignored
+# instead of failing, and counters only move by the rows that actually changed.
+
+# (model, per-user counter, per-video counter or None)
+_LIKES = (Like, User.liked_count, Video.like_count)
+_WATCH_LATER = (WatchLater, User.watch_later_count, None)
+
+
+def _insert_ignore(model):
+    return (
+        insert(model)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+
+
+def _existing_video_ids(db: Session, video_ids: list[str]) -> list[str]:
+    rows = db.execute(select(Video.id).where(Video.id.in_(video_ids))).scalars().all()
+    found = set(rows)
+    return [vid for vid in video_ids if vid in found]
+
+
+def _add(db: Session, kind: tuple, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    model = kind[0]
+    video_ids = _existing_video_ids(db, list(dict.fromkeys(video_ids)))
+    if not video_ids:
+        return []
+
+    now = datetime.now(timezone.utc)
+    row_ids = [str(uuid.uuid4()) for _ in video_ids]
+    time_column = "created_at" if model is Like else "added_at"
+    inserted = db.execute(_insert_ignore(model).values([
+        {"id": row_id, "user_id": user_id, "video_id": vid, time_column: now}
+        for row_id, vid in zip(row_ids, video_ids)
+    ])).rowcount
+    if not inserted:
+        return []
+
+    if inserted == len(video_ids):
+        added = video_ids
+    else:
+        # Rows that kept one of our generated ids are the ones this statement inserted
+        added = db.execute(select(model.video_id).where(model.id.in_(row_ids))).scalars().all()
+    _bump(db, kind, user_id, added, 1)
+    return added
+
+
+def _remove(db: Session, kind: tuple, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    model = kind[0]
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids:
+        return []
+
+    where = (model.user_id == user_id, model.video_id.in_(video_ids))
+    if len(video_ids) == 1:
+        # Single video: the DELETE's row count says whether it was there
+        removed = video_ids if db.execute(delete(model).where(*where)).rowcount else []
+    else:
+        # Lock the rows first so that a concurrent removal cannot decrement them twice
+        removed = db.execute(select(model.video_id).where(*where).with_for_update()).scalars().all()
+        if removed:
+            db.execute(delete(model).where(model.user_id == user_id, model.video_id.in_(removed)))
+
+    _bump(db, kind, user_id, removed, -1)
+    return removed
+
+
+def _bump(db: Session, kind: tuple, user_id: str, video_ids: list[str], step: int):
+    """
+    Move the per-video and per-user counters by `step` for each changed video
+    updated_at is pinned: it versions the content (ETags, cache stamps), not the counters
+    """
+    if not video_ids:
+        return
+    _, user_counter, video_counter = kind
+    if video_counter is not None:
+        db.execute(
+            update(Video)
+            .where(Video.id.in_(video_ids))
+            .values({video_counter: video_counter + step, Video.updated_at: Video.updated_at})
+            .execution_options(synchronize_session=False)
+        )
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values({user_counter: user_counter + step * len(video_ids), User.updated_at: User.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_likes(db: Session, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    """
+    Like the videos; unknown and already liked ones are skipped
+    Returns the ids that were newly liked
+    """
+    return _add(db, _LIKES, user_id, video_ids)
+
+
+def remove_likes(db: Session, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    """
+    Unlike the videos; returns the ids that were liked before
+    """
+    return _remove(db, _LIKES, user_id, video_ids)
+
+
+def add_watch_later(db: Session, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    """
+    Add the videos to the watch later list; returns the ids that were newly added
+    """
+    return _add(db, _WATCH_LATER, user_id, video_ids)
+
+
+def remove_watch_later(db: Session, user_id: str, video_ids: Iterable[str]) -> list[str]:
+    """
+    Remove the videos from the watch later list; returns the ids that were in it
+    """
+    return _remove(db, _WATCH_LATER, user_id, video_ids)
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+# Cache-Control per route family
+LIST_CACHE_CONTROL = "public, max-age=10, stale-while-revalidate=30"
+DETAIL_CACHE_CONTROL = "public, max-age=10"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+USER_VIDEOS_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build an ETag from version stamps (updated_at, catalog version, ...)
+
+    The tag is weak: counters such as views are not part of it, so two responses
+    with the same tag are equivalent but not necessarily byte-identical
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        if candidate.strip().removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str, vary: Optional[str] = None):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
+
+
+def not_modified(etag: str, cache_control: str, vary: Optional[str] = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control, vary)
+    return response
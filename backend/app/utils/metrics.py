@@ -0,0 +1,277 @@
+import bisect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+from sqlalchemy.pool import QueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Latency buckets in seconds, from cache lookups up to slow uploads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric(ABC):
+    """
+    Base of the in-process Prometheus metrics
+    Samples are keyed by a tuple of label values; one lock per metric keeps
+    the hot path to a dict lookup and an addition
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """
+        Exposition lines of the metric, header included
+        """
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value: float):
+        with self.lock:
+            self.values[label_values] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self.samples: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            sample = self.samples.get(label_values)
+            if sample is None:
+                sample = self.samples[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            sample[0][index] += 1
+            sample[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self) -> list[str]:
+        with self.lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self.samples.items()]
+
+        lines = self.header()
+        names = self.label_names + ("le",)
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (bound,))} {cumulative}")
+            suffix = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]):
+        """
+        Add a callback producing metrics at scrape time (for values that are
+        cheaper to read on demand than to track, such as pool sizes)
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> list[str]:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return lines
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",)
+))
+db_pool_wait_seconds = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection"
+))
+cache_operation_duration_seconds = registry.register(Histogram(
+    "cache_operation_duration_seconds", "Response cache call latency", ("operation",)
+))
+cache_lookups_total = registry.register(Counter(
+    "cache_lookups_total", "Response cache lookups by result", ("result",)
+))
+s3_request_duration_seconds = registry.register(Histogram(
+    "s3_request_duration_seconds", "S3 API call latency", ("operation", "status")
+))
+s3_presign_duration_seconds = registry.register(Histogram(
+    "s3_presign_duration_seconds", "Time spent presigning S3 URLs", ("operation",)
+))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight count and status per route
+
+    The route label is the matched path template (`/videos/{video_id}`), not the
+    raw path, so label cardinality stays bounded; unmatched requests share one label
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # The route is only known once routing has run, so in-flight is tracked per method
+        http_requests_in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            http_request_duration_seconds.observe(elapsed, method, route_path)
+            http_requests_total.inc(method, route_path, str(status_code))
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a free connection
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started)
+
+
+def pool_collector(engine, name: str = "default") -> Callable[[], list[Metric]]:
+    """
+    Scrape-time gauges for a SQLAlchemy engine's connection pool
+    """
+    def collect() -> list[Metric]:
+        pool = engine.pool
+        gauges = []
+        for metric_name, help_text, reader in (
+            ("db_pool_size", "Configured pool size", "size"),
+            ("db_pool_checked_out", "Connections currently checked out", "checkedout"),
+            ("db_pool_overflow", "Connections open beyond the pool size", "overflow"),
+            ("db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+        ):
+            method = getattr(pool, reader, None)
+            if method is None:
+                continue
+            gauge = Gauge(metric_name, help_text, ("pool",))
+            gauge.set(name, value=method())
+            gauges.append(gauge)
+        return gauges
+
+    return collect
+
+
+def instrument_s3_client(client):
+    """
+    Time every API call a boto3 S3 client makes, via botocore's event hooks
+    """
+    def before_request(model, context, **kwargs):
+        context["metrics_operation"] = model.name
+        context["metrics_started"] = time.perf_counter()
+
+    def after_call(context, http_response=None, **kwargs):
+        started = context.get("metrics_started")
+        if started is None:
+            return
+        # after-call-error carries no HTTP response (connection errors, retries exhausted)
+        status = getattr(http_response, "status_code", None) or "error"
+        s3_request_duration_seconds.observe(
+            time.perf_counter() - started, context["metrics_operation"], str(status)
+        )
+
+    client.meta.events.register("before-parameter-build.s3.*", before_request)
+    client.meta.events.register("after-call.s3.*", after_call)
+    client.meta.events.register("after-call-error.s3.*", after_call)
+    return client
@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Encode the (created_at, id) position of the last row of a page into an opaque cursor
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor
+    Raises HTTPException 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_after(sort_column, id_column, cursor: Optional[str]):
+    """
+    Build the WHERE clause that seeks past the cursor for a
+    `ORDER BY sort_column DESC, id_column DESC` listing
+    Returns None when no cursor is given (first page)
+    """
+    if not cursor:
+        return None
+
+    created_at, id = decode_cursor(cursor)
+    return or_(
+        sort_column < created_at,
+        and_(sort_column == created_at, id_column < id),
+    )
+
+
+def split_page(rows: list, per_page: int, position: Callable[[Any], tuple[datetime, str]]) -> tuple[list, Optional[str]]:
+    """
+    Trim a page fetched with `LIMIT per_page + 1` back to per_page rows
+    Returns the rows and the cursor of the next page (None on the last page);
+    `position` maps a row to the (sort value, id) pair the listing is ordered by
+    """
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    return rows, encode_cursor(*position(rows[-1]))
@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.utils.auth_utils import get_password_hash, verify_and_update_password
+
+logger = logging.getLogger(__name__)
+
+# Worker processes dedicated to bcrypt; 0 hashes in the calling thread instead
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Hash jobs admitted at once (running + queued); requests beyond this get 429
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 4)))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt hashing and verification
+
+    Each hash holds a CPU for hundreds of milliseconds. Running it in a process pool
+    keeps it off the request threads' GIL, and the admission limit keeps a burst of
+    logins from tying up the whole thread pool: once PASSWORD_HASH_MAX_PENDING jobs
+    are in flight, further register/login calls fail fast with 429 + Retry-After.
+    Jobs that outlive PASSWORD_HASH_TIMEOUT_SECONDS, or hit a dead worker, get 503
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        timeout: float = PASSWORD_HASH_TIMEOUT_SECONDS
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.pool_restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # spawn: forking a process that already runs background threads is unsafe
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"[Auth] Started password hashing pool with {self.workers} workers")
+            return self.executor
+
+    def _run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+
+        with self.lock:
+            self.in_flight += 1
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+
+        executor = self._get_executor()
+        try:
+            try:
+                future = executor.submit(fn, *args)
+            except BaseException:
+                self._release()
+                raise
+            # The slot is held until the job leaves the pool, not just until this request
+            # stops waiting for it; otherwise every timeout would admit one more job
+            future.add_done_callback(self._release)
+            try:
+                return future.result(timeout=self.timeout)
+            except TimeoutError:
+                # Drop the job if it has not started yet (frees its slot right away)
+                future.cancel()
+                raise
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool for the next request
+            logger.error("[Auth] Password hashing pool broke, restarting it")
+            with self.lock:
+                if self.executor is executor:
+                    self.executor = None
+                    self.pool_restarts += 1
+            executor.shutdown(wait=False)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily unavailable, please retry shortly",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+        except TimeoutError:
+            with self.lock:
+                self.timed_out += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, please retry shortly",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+
+    def _release(self, future=None):
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self.slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(get_password_hash, password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Returns (valid, new_hash); new_hash is set when the stored hash should be replaced
+        """
+        return self._run(verify_and_update_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "pool_restarts": self.pool_restarts,
+            }
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.schemas.user import Principal
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+# Upper bound on how long a snapshot is trusted, so profile changes made by another
+# worker (which cannot invalidate this one) are picked up eventually
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of verified JWTs -> principal snapshots
+
+    An entry lives until the token's `exp` (capped at PRINCIPAL_CACHE_TTL_SECONDS),
+    so a hit skips both the signature check and the users table lookup
+    """
+
+    def __init__(self, max_entries: int = PRINCIPAL_CACHE_SIZE, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self.tokens_by_user: dict[str, set[str]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, principal = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, exp: Optional[float]):
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        with self.lock:
+            self._remove(token)
+            self.entries[token] = (expires_at, principal)
+            self.tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate_user(self, user_id: str):
+        """
+        Drop every cached token of a user (call after profile changes or deletion)
+        """
+        with self.lock:
+            for token in list(self.tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def _remove(self, token: str):
+        entry = self.entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        tokens = self.tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.tokens_by_user[user_id]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+principal_cache = PrincipalCache()
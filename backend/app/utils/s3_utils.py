@@ -1,6 +1,10 @@
-import boto3
 import os
 import logging
+import threading
+from typing import Optional
+
+from app.utils.metrics import instrument_s3_client, s3_presign_duration_seconds
+from app.utils.sigv4 import UploadPartSigner
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -8,6 +12,56 @@ logger = logging.getLogger(__name__)
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 S3_SOURCE_BUCKET = os.getenv("S3_SOURCE_BUCKET", "streamvod-bucket")
 PRESIGNED_EXPIRE_SECONDS = int(os.getenv("PRESIGNED_EXPIRE_SECONDS", "900"))
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+S3_MAX_RETRIES = int(os.getenv("S3_MAX_RETRIES", "3"))
+# Sign part URLs with the batched SigV4 signer instead of one botocore call per part
+S3_BATCH_PRESIGN = os.getenv("S3_BATCH_PRESIGN", "true").lower() == "true"
+
+# Session the shared clients and the batched signer take their credentials from.
+# boto3/botocore are imported on first use: they add ~100ms to worker startup
+_session = None
+
+# Shared clients, created once per worker process: building a client costs tens of
+# milliseconds and each one owns its own HTTP connection pool
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_session():
+    global _session
+    if _session is None:
+        with _clients_lock:
+            if _session is None:
+                import boto3
+                _session = boto3.session.Session()
+    return _session
+
+def get_s3_client(accelerate: bool = False):
+    """
+    Return the shared S3 client (boto3 clients are thread-safe)
+    accelerate=True uses the Transfer Acceleration endpoint
+    """
+    key = (os.getpid(), accelerate)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_session()
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from botocore.config import Config
+
+            config = Config(
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": S3_MAX_RETRIES, "mode": "standard"},
+                s3={"use_accelerate_endpoint": accelerate},
+            )
+            client = instrument_s3_client(
+                session.client("s3", region_name=AWS_REGION, config=config)
+            )
+            _clients[key] = client
+            logger.info(f"[S3] Created shared client (accelerate={accelerate})")
+    return client
 
 def generate_presigned_post(key: str, content_type: str = "video/mp4") -> dict:
     """
@@ -15,7 +69,7 @@ def generate_presigned_post(key: str, content_type: str = "video/mp4") -> dict:
     Giữ lại để backward compatible
     Max size: 5GB
     """
-    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    s3_client = get_s3_client()
 
     conditions = [
         {"key": key},
@@ -23,13 +77,14 @@ def generate_presigned_post(key: str, content_type: str = "video/mp4") -> dict:
         ["content-length-range", 1, 5368709120]  # Max 5GB
     ]
 
-    return s3_client.generate_presigned_post(
-        Bucket=S3_SOURCE_BUCKET,
-        Key=key,
-        Fields={"Content-Type": content_type},
-        Conditions=conditions,
-        ExpiresIn=PRESIGNED_EXPIRE_SECONDS,
-    )
+    with s3_presign_duration_seconds.time("PostObject"):
+        return s3_client.generate_presigned_post(
+            Bucket=S3_SOURCE_BUCKET,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=conditions,
+            ExpiresIn=PRESIGNED_EXPIRE_SECONDS,
+        )
 
 def initiate_multipart_upload(key: str, content_type: str = "video/mp4") -> dict:
     """
@@ -41,13 +96,7 @@ def initiate_multipart_upload(key: str, content_type: str = "video/mp4") -> dict
     logger.info(f"[Multipart] Content-Type: {content_type}")
     
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=AWS_REGION,
-            config=boto3.session.Config(s3={'use_accelerate_endpoint': True})
-        )
-        
-        logger.info(f"[Multipart] S3 client created with Transfer Acceleration enabled")
+        s3_client = get_s3_client(accelerate=True)
         
         # Tạo multipart upload session
         response = s3_client.create_multipart_upload(
@@ -70,43 +119,62 @@ def initiate_multipart_upload(key: str, content_type: str = "video/mp4") -> dict
 def generate_multipart_presigned_urls(
     key: str, 
     upload_id: str, 
-    num_parts: int
+    num_parts: int,
+    start_part: int = 1,
+    count: Optional[int] = None
 ) -> list:
     """
     Generate presigned URLs cho từng part (hỗ trợ Transfer Acceleration)
+    Only parts start_part .. start_part + count - 1 (capped at num_parts) are signed,
+    so clients can fetch URLs lazily for the window of parts they are about to upload
     """
-    logger.info(f"[Multipart] Generating presigned URLs for {num_parts} parts")
+    end_part = num_parts if count is None else min(num_parts, start_part + count - 1)
+    part_numbers = range(start_part, end_part + 1)
+    logger.info(f"[Multipart] Generating presigned URLs for parts {start_part}-{end_part} of {num_parts}")
     logger.info(f"[Multipart] Key: {key}, UploadId: {upload_id}")
     
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=AWS_REGION,
-            config=boto3.session.Config(s3={'use_accelerate_endpoint': True})
-        )
+        with s3_presign_duration_seconds.time("UploadPart"):
+            credentials = get_session().get_credentials() if S3_BATCH_PRESIGN else None
+            if credentials is not None:
+                # Batched SigV4: signing key and query string are derived once for all parts
+                frozen = credentials.get_frozen_credentials()
+                signer = UploadPartSigner(
+                    host=f"{S3_SOURCE_BUCKET}.s3-accelerate.amazonaws.com",
+                    key=key,
+                    upload_id=upload_id,
+                    region=AWS_REGION,
+                    access_key=frozen.access_key,
+                    secret_key=frozen.secret_key,
+                    session_token=frozen.token,
+                    expires_in=PRESIGNED_EXPIRE_SECONDS,
+                )
+                urls = [
+                    {'part_number': part_number, 'url': signer.sign(part_number)}
+                    for part_number in part_numbers
+                ]
+            else:
+                s3_client = get_s3_client(accelerate=True)
+                urls = [
+                    {
+                        'part_number': part_number,
+                        'url': s3_client.generate_presigned_url(
+                            'upload_part',
+                            Params={
+                                'Bucket': S3_SOURCE_BUCKET,
+                                'Key': key,
+                                'UploadId': upload_id,
+                                'PartNumber': part_number
+                            },
+                            ExpiresIn=PRESIGNED_EXPIRE_SECONDS
+                        )
+                    }
+                    for part_number in part_numbers
+                ]
         
-        # Generate presigned URL cho mỗi part
-        urls = []
-        for part_number in range(1, num_parts + 1):
-            presigned_url = s3_client.generate_presigned_url(
-                'upload_part',
-                Params={
-                    'Bucket': S3_SOURCE_BUCKET,
-                    'Key': key,
-                    'UploadId': upload_id,
-                    'PartNumber': part_number
-                },
-                ExpiresIn=PRESIGNED_EXPIRE_SECONDS
-            )
-            
-            # Log first URL to verify endpoint
-            if part_number == 1:
-                logger.info(f"[Multipart] Sample URL (part 1): {presigned_url[:100]}...")
-            
-            urls.append({
-                'part_number': part_number,
-                'url': presigned_url  # URL sẽ dùng s3-accelerate endpoint
-            })
+        # Log first URL to verify endpoint (URL sẽ dùng s3-accelerate endpoint)
+        if urls:
+            logger.info(f"[Multipart] Sample URL (part {urls[0]['part_number']}): {urls[0]['url'][:100]}...")
         
         logger.info(f"[Multipart] Generated {len(urls)} presigned URLs successfully")
         return urls
@@ -115,6 +183,46 @@ def generate_multipart_presigned_urls(
         logger.error(f"[Multipart] Failed to generate presigned URLs: {str(e)}", exc_info=True)
         raise
 
+def list_uploaded_parts(key: str, upload_id: str) -> list:
+    """
+    Liệt kê các part S3 đã nhận của một multipart upload (ListParts, có phân trang)
+    Returns list of {'part_number': int, 'etag': str, 'size': int}, sorted by part number
+    """
+    logger.info(f"[Multipart] Listing uploaded parts")
+    logger.info(f"[Multipart] Key: {key}, UploadId: {upload_id}")
+    
+    try:
+        s3_client = get_s3_client()
+        
+        parts = []
+        params = {
+            'Bucket': S3_SOURCE_BUCKET,
+            'Key': key,
+            'UploadId': upload_id,
+            'MaxParts': 1000
+        }
+        while True:
+            response = s3_client.list_parts(**params)
+            parts.extend(
+                {
+                    'part_number': part['PartNumber'],
+                    'etag': part['ETag'],
+                    'size': part['Size']
+                }
+                for part in response.get('Parts', [])
+            )
+            
+            if not response.get('IsTruncated'):
+                break
+            params['PartNumberMarker'] = response['NextPartNumberMarker']
+        
+        logger.info(f"[Multipart] Found {len(parts)} uploaded parts")
+        return parts
+        
+    except Exception as e:
+        logger.error(f"[Multipart] Failed to list parts: {str(e)}", exc_info=True)
+        raise
+
 def complete_multipart_upload(key: str, upload_id: str, parts: list) -> dict:
     """
     Hoàn thành multipart upload
@@ -125,11 +233,7 @@ def complete_multipart_upload(key: str, upload_id: str, parts: list) -> dict:
     logger.info(f"[Multipart] Number of parts: {len(parts)}")
     
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=AWS_REGION,
-            config=boto3.session.Config(s3={'use_accelerate_endpoint': True})
-        )
+        s3_client = get_s3_client(accelerate=True)
         
         # Log first few parts for debugging
         if parts:
@@ -165,11 +269,7 @@ def abort_multipart_upload(key: str, upload_id: str):
     logger.warning(f"[Multipart] Key: {key}, UploadId: {upload_id}")
     
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=AWS_REGION,
-            config=boto3.session.Config(s3={'use_accelerate_endpoint': True})
-        )
+        s3_client = get_s3_client(accelerate=True)
         
         s3_client.abort_multipart_upload(
             Bucket=S3_SOURCE_BUCKET,
@@ -0,0 +1,214 @@
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.models.video import Video
+
+# "auto" uses MySQL FULLTEXT when the database is MySQL, the in-memory index otherwise
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+SEARCH_REFRESH_SECONDS = float(os.getenv("SEARCH_REFRESH_SECONDS", "30"))
+
+# Title matches count more than description matches
+TITLE_WEIGHT = 2
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """
+    Split text into lowercase word tokens
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index with BM25 ranking over video title + description
+    Supports incremental add/remove so a single video can be re-indexed cheaply
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, dict[str, int]] = {}
+        self.doc_terms: dict[str, Counter] = {}
+        self.doc_lengths: dict[str, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, title: Optional[str], description: Optional[str]):
+        self.remove(doc_id)
+
+        terms = Counter()
+        for token in tokenize(title):
+            terms[token] += TITLE_WEIGHT
+        for token in tokenize(description):
+            terms[token] += 1
+
+        length = sum(terms.values())
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Return (doc_id, score) pairs for documents matching any query term, best first
+        """
+        n_docs = len(self.doc_lengths)
+        if n_docs == 0:
+            return []
+
+        avg_length = self.total_length / n_docs
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+
+class VideoSearchIndex:
+    """
+    Inverted index over ready videos, kept in sync with the database
+
+    The first search loads every ready video; afterwards rows whose `updated_at`
+    moved past the last sync (edits from update_video, status changes written by
+    the vod-job-complete Lambda) are re-indexed at most every SEARCH_REFRESH_SECONDS
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex()
+        # created_at of every indexed video, for newest-first ordering of the matches
+        self.created_at: dict[str, datetime] = {}
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+
+    def update(self, video: Video):
+        """
+        Re-index a single video right after it changed in this process
+        """
+        with self.lock:
+            self._apply(video.id, video.status, video.title, video.description, video.created_at)
+
+    def _apply(self, video_id: str, status: str, title: Optional[str], description: Optional[str], created_at: datetime):
+        if status == "ready":
+            self.index.add(video_id, title, description)
+            self.created_at[video_id] = created_at
+        else:
+            self.index.remove(video_id)
+            self.created_at.pop(video_id, None)
+
+    def discard(self, video_ids: list[str]):
+        """
+        Drop videos found to be no longer ready before the next refresh saw it
+        """
+        with self.lock:
+            for video_id in video_ids:
+                self.index.remove(video_id)
+                self.created_at.pop(video_id, None)
+
+    def refresh(self, db: Session, force: bool = False):
+        now = time.monotonic()
+        if not force and self.loaded and now - self.last_refresh < SEARCH_REFRESH_SECONDS:
+            return
+
+        stmt = select(Video.id, Video.title, Video.description, Video.status, Video.created_at, Video.updated_at)
+        if self.loaded and self.watermark is not None:
+            # Small overlap so rows written with a slightly older clock are not missed
+            stmt = stmt.where(Video.updated_at >= self.watermark - timedelta(seconds=SEARCH_REFRESH_SECONDS))
+        else:
+            stmt = stmt.where(Video.status == "ready")
+        rows = db.execute(stmt).all()
+
+        with self.lock:
+            for row in rows:
+                self._apply(row.id, row.status, row.title, row.description, row.created_at)
+                if row.updated_at and (self.watermark is None or row.updated_at > self.watermark):
+                    self.watermark = row.updated_at
+            self.loaded = True
+            self.last_refresh = now
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        newest: bool = False,
+        after: Optional[tuple[datetime, str]] = None,
+    ) -> tuple[list[str], int]:
+        """
+        Ids of every video matching the query, best first, or newest first
+        (created_at desc, id desc) with `newest`
+        Also returns the position of the first id past `after`, a (created_at, id)
+        cursor position in newest order (0 without it)
+        """
+        self.refresh(db)
+        with self.lock:
+            ids = [doc_id for doc_id, _ in self.index.search(query)]
+            if not newest:
+                return ids, 0
+            positions = [(self.created_at[doc_id], doc_id) for doc_id in ids]
+        positions.sort(reverse=True)
+        start = 0
+        if after is not None:
+            start = next((i for i, position in enumerate(positions) if position < after), len(positions))
+        return [doc_id for _, doc_id in positions], start
+
+
+search_index = VideoSearchIndex()
+
+
+def use_fulltext(db: Session) -> bool:
+    """
+    Whether `q` should be answered by the database FULLTEXT index
+    """
+    if SEARCH_BACKEND == "fulltext":
+        return True
+    if SEARCH_BACKEND == "memory":
+        return False
+    return db.get_bind().dialect.name == "mysql"
+
+
+def fulltext_match(query: str):
+    """
+    MATCH(title, description) AGAINST (:q IN NATURAL LANGUAGE MODE), usable as filter and score
+    """
+    return match(Video.title, Video.description, against=query).in_natural_language_mode()
@@ -0,0 +1,88 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import quote
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def _quote(value: str) -> str:
+    # RFC 3986 unreserved characters stay as-is, everything else is percent-encoded
+    return quote(value, safe="-_.~")
+
+
+def derive_signing_key(secret_key: str, date_stamp: str, region: str, service: str = "s3") -> bytes:
+    k_date = _hmac(f"AWS4{secret_key}".encode(), date_stamp)
+    k_region = hmac.new(k_date, region.encode(), hashlib.sha256).digest()
+    k_service = hmac.new(k_region, service.encode(), hashlib.sha256).digest()
+    return hmac.new(k_service, b"aws4_request", hashlib.sha256).digest()
+
+
+class UploadPartSigner:
+    """
+    Presigns `PUT ?partNumber=N&uploadId=...` URLs for one multipart upload
+
+    Everything except partNumber is identical across parts, so the SigV4 signing
+    key, credential scope and query string are computed once; each part then costs
+    one SHA-256 of the canonical request and one HMAC
+    """
+
+    def __init__(
+        self,
+        host: str,
+        key: str,
+        upload_id: str,
+        region: str,
+        access_key: str,
+        secret_key: str,
+        session_token: Optional[str] = None,
+        expires_in: int = 900,
+        now: Optional[datetime] = None,
+    ):
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+        scope = f"{date_stamp}/{region}/s3/aws4_request"
+
+        self.host = host
+        self.path = "/" + quote(key, safe="/-_.~")
+        self.amz_date = amz_date
+        self.scope = scope
+        self.signing_key = derive_signing_key(secret_key, date_stamp, region)
+
+        params = {
+            "X-Amz-Algorithm": ALGORITHM,
+            "X-Amz-Credential": f"{access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "host",
+            "uploadId": upload_id,
+        }
+        if session_token:
+            params["X-Amz-Security-Token"] = session_token
+
+        # Canonical query strings are sorted by key; partNumber sorts between the
+        # X-Amz-* parameters and uploadId, so the string is split around it
+        before, after = [], []
+        for name in sorted(params):
+            pair = f"{_quote(name)}={_quote(params[name])}"
+            (before if name < "partNumber" else after).append(pair)
+        self.query_before = "&".join(before)
+        self.query_after = "&".join(after)
+        self.canonical_suffix = f"\nhost:{host}\n\nhost\n{UNSIGNED_PAYLOAD}"
+
+    def sign(self, part_number: int) -> str:
+        query = f"{self.query_before}&partNumber={part_number}&{self.query_after}"
+        canonical_request = f"PUT\n{self.path}\n{query}{self.canonical_suffix}"
+        string_to_sign = (
+            f"{ALGORITHM}\n{self.amz_date}\n{self.scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        )
+        signature = hmac.new(self.signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        return f"https://{self.host}{self.path}?{query}&X-Amz-Signature={signature}"
@@ -0,0 +1,213 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() == "true"
+# Shared secret for PUT /health/profiler; the runtime switch is disabled when unset
+SQL_PROFILER_TOKEN = os.getenv("SQL_PROFILER_TOKEN")
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+# A request running the same statement shape more than this many times is flagged as N+1
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_PROFILER_SLOWEST = 3
+SQL_PROFILER_RECENT = 50
+
+# Expanded IN lists differ only in their number of placeholders
+_IN_LIST = re.compile(r"\((?:\s*(?:%s|\?|:\w+|%\(\w+\)s)\s*,)+\s*(?:%s|\?|:\w+|%\(\w+\)s)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalise a statement so repeats that differ only in bound values compare equal
+    """
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(...)", statement)).strip()
+
+
+class RequestProfile:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.method = scope["method"]
+        self.queries = 0
+        self.total_time = 0.0
+        self.slowest: list[tuple[float, str]] = []
+        self.shapes: dict[str, int] = {}
+
+    @property
+    def route(self) -> str:
+        # Routing fills scope["route"] before the endpoint runs
+        return getattr(self.scope.get("route"), "path", None) or "unmatched"
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.total_time += elapsed
+        shape = statement_shape(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if len(self.slowest) < SQL_PROFILER_SLOWEST or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, shape))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SQL_PROFILER_SLOWEST:]
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.items() if count > threshold]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+class SQLProfiler:
+    """
+    Per-request SQL statistics from SQLAlchemy cursor events
+
+    Records query count, total DB time and the slowest statements of each request,
+    logs statements slower than SQL_SLOW_QUERY_MS and flags requests that repeat a
+    statement shape more than SQL_N_PLUS_ONE_THRESHOLD times. The event listeners are
+    only attached while profiling is enabled, so the off state costs nothing per query
+    """
+
+    def __init__(self, enabled: bool = SQL_PROFILER_ENABLED):
+        self.enabled = enabled
+        self.engines = []
+        self.lock = threading.Lock()
+        self.requests_profiled = 0
+        self.slow_queries = 0
+        self.flagged_requests = 0
+        self.recent_flags: deque = deque(maxlen=SQL_PROFILER_RECENT)
+
+    def install(self, engine):
+        """
+        Register an engine; its listeners are attached whenever profiling is on
+        """
+        with self.lock:
+            self.engines.append(engine)
+            if self.enabled:
+                self._attach(engine)
+
+    def _attach(self, engine):
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _detach(self, engine):
+        if event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def enable(self):
+        with self.lock:
+            for engine in self.engines:
+                self._attach(engine)
+            self.enabled = True
+
+    def disable(self):
+        with self.lock:
+            self.enabled = False
+            for engine in self.engines:
+                self._detach(engine)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the per-statement context: a statement that raises is simply dropped
+        # with it instead of leaving an entry behind on the pooled connection
+        if context is not None:
+            context._sql_profiler_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_sql_profiler_started", None)
+        if started is None:
+            # Listener was attached while this statement was already running
+            return
+        elapsed = time.perf_counter() - started
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+
+        if elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+            with self.lock:
+                self.slow_queries += 1
+            route = f"{profile.method} {profile.route}" if profile is not None else "-"
+            logger.warning(
+                f"[SQL] Slow query ({elapsed * 1000:.1f}ms) on {route}: {statement_shape(statement)[:500]}"
+            )
+
+    def begin_request(self, scope: dict) -> RequestProfile:
+        profile = RequestProfile(scope)
+        _current_profile.set(profile)
+        return profile
+
+    def end_request(self, profile: RequestProfile):
+        repeated = profile.repeated_shapes(SQL_N_PLUS_ONE_THRESHOLD)
+        with self.lock:
+            self.requests_profiled += 1
+            if repeated:
+                self.flagged_requests += 1
+                self.recent_flags.append({
+                    "route": f"{profile.method} {profile.route}",
+                    "queries": profile.queries,
+                    "repeated": [{"count": count, "statement": shape[:300]} for shape, count in repeated],
+                })
+        for shape, count in repeated:
+            logger.warning(
+                f"[SQL] Possible N+1 on {profile.method} {profile.route}: "
+                f"{count}x {shape[:300]}"
+            )
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "slow_query_ms": SQL_SLOW_QUERY_MS,
+                "n_plus_one_threshold": SQL_N_PLUS_ONE_THRESHOLD,
+                "requests_profiled": self.requests_profiled,
+                "slow_queries": self.slow_queries,
+                "flagged_requests": self.flagged_requests,
+                "recent_flags": list(self.recent_flags),
+            }
+
+
+sql_profiler = SQLProfiler()
+
+
+def server_timing(profile: RequestProfile) -> str:
+    parts = [f'db;dur={profile.total_time * 1000:.1f};desc="{profile.queries} queries"']
+    for index, (elapsed, _) in enumerate(profile.slowest, start=1):
+        parts.append(f"db-slow-{index};dur={elapsed * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class SQLProfilerMiddleware:
+    """
+    Opens a RequestProfile per HTTP request and reports it in a Server-Timing header
+    Passes requests straight through while profiling is disabled
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not sql_profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = sql_profiler.begin_request(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # The endpoint has returned by now, so its queries are all recorded
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(profile).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sql_profiler.end_request(profile)
@@ -0,0 +1,324 @@
+import heapq
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Collection, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.video import Video
+
+logger = logging.getLogger(__name__)
+
+# Estimated size of the in-memory title index; the least viewed titles are left out beyond it
+SUGGEST_MEMORY_MB = float(os.getenv("SUGGEST_MEMORY_MB", "128"))
+SUGGEST_REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", "30"))
+# Full rebuilds pick up view count changes and fold the incremental updates in
+SUGGEST_REBUILD_SECONDS = float(os.getenv("SUGGEST_REBUILD_SECONDS", "900"))
+SUGGEST_MAX_DELTA = int(os.getenv("SUGGEST_MAX_DELTA", "2000"))
+SUGGEST_MAX_LIMIT = 20
+
+# Prefix ranges up to this size are ranked by scanning them; larger ones get a precomputed top list
+SCAN_LIMIT = 256
+LOAD_BATCH = 10000
+
+_SEPARATORS_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Case- and accent-insensitive form of a title: "Phở Hà Nội!" -> "pho ha noi"
+    """
+    if not title:
+        return ""
+    text = title.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text.replace("đ", "d"))
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SEPARATORS_RE.sub(" ", text).strip()
+
+
+class PrefixIndex:
+    """
+    Immutable sorted array of normalized titles
+
+    The titles starting with a prefix are a contiguous range found by binary search.
+    Ranges of at most SCAN_LIMIT titles are ranked by views on the fly; for the few
+    prefixes matching more (short prefixes), the top `top_k` are precomputed at build
+    time, so a lookup never touches more than SCAN_LIMIT entries
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, int, str, str]], top_k: int = 2 * SUGGEST_MAX_LIMIT):
+        # entries: (normalized title, views, video id, title)
+        entries = sorted(entries)
+        self.keys = [entry[0] for entry in entries]
+        self.views = array("q", (entry[1] for entry in entries))
+        self.ids = [entry[2] for entry in entries]
+        self.titles = [entry[3] for entry in entries]
+        self.top_k = top_k
+        self.heavy: dict[str, list[int]] = {}
+        if len(self.keys) > SCAN_LIMIT:
+            self._build_heavy("", 0, len(self.keys))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _top(self, positions: Iterable[int], n: int) -> list[int]:
+        return heapq.nlargest(n, positions, key=self.views.__getitem__)
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        return lo, bisect_left(self.keys, prefix + "\U0010ffff", lo)
+
+    def _split(self, prefix: str, lo: int, hi: int):
+        """
+        Split the range of a prefix: (lo, end of the titles equal to the prefix),
+        then (child prefix, start, end) for each next character
+        """
+        depth = len(prefix)
+        start = lo
+        # Titles equal to the prefix sort first
+        while start < hi and len(self.keys[start]) == depth:
+            start += 1
+        children = []
+        while start < hi:
+            child = prefix + self.keys[start][depth]
+            end = bisect_left(self.keys, prefix + chr(ord(child[-1]) + 1), start, hi)
+            children.append((child, start, end))
+            start = end
+        return (lo, children[0][1] if children else hi), children
+
+    def _build_heavy(self, prefix: str, lo: int, hi: int) -> list[int]:
+        """
+        Top list of a range larger than SCAN_LIMIT, merged from its sub-ranges
+        (one per next character), so every entry is scanned once overall
+        """
+        (equal_lo, equal_hi), children = self._split(prefix, lo, hi)
+        candidates = self._top(range(equal_lo, equal_hi), self.top_k)
+        for child, start, end in children:
+            if end - start > SCAN_LIMIT:
+                candidates += self._build_heavy(child, start, end)
+            else:
+                candidates += self._top(range(start, end), self.top_k)
+
+        top = self._top(candidates, self.top_k)
+        self.heavy[prefix] = top
+        return top
+
+    def lookup(self, prefix: str, n: int, exclude: Collection[str] = ()) -> list[int]:
+        """
+        Positions of the (up to) n most viewed titles starting with prefix,
+        skipping the video ids in `exclude`
+        """
+        top = self.heavy.get(prefix)
+        if top is None:
+            lo, hi = self._range(prefix)
+            positions = range(lo, hi)
+        else:
+            found = [position for position in top if self.ids[position] not in exclude]
+            if len(found) >= n:
+                return found[:n]
+            # Too many of the precomputed top are excluded: merge the answers of the
+            # sub-ranges, each a heavy prefix again or at most SCAN_LIMIT titles
+            (equal_lo, equal_hi), children = self._split(prefix, *self._range(prefix))
+            positions = list(range(equal_lo, equal_hi))
+            for child, _, _ in children:
+                positions += self.lookup(child, n, exclude)
+
+        if exclude:
+            positions = [position for position in positions if self.ids[position] not in exclude]
+        return self._top(positions, n)
+
+    def entry(self, position: int) -> tuple[str, str, int]:
+        return self.ids[position], self.titles[position], self.views[position]
+
+
+def entry_size(key: str, video_id: str, title: str) -> int:
+    """
+    Approximate bytes one entry costs in a PrefixIndex (strings + list / array slots)
+    """
+    return sys.getsizeof(key) + sys.getsizeof(video_id) + sys.getsizeof(title) + 3 * 8 + 8
+
+
+class TitleSuggester:
+    """
+    Search-as-you-type index over the titles of ready videos, ranked by views
+
+    The first lookup loads the most viewed ready titles that fit SUGGEST_MEMORY_MB.
+    Changes are applied incrementally on top of that snapshot: update_video calls
+    `update`, and rows whose `updated_at` moved past the last sync (status changes
+    written by the vod-job-complete Lambda) are picked up every SUGGEST_REFRESH_SECONDS.
+    They live in a small overlay that is folded into a fresh snapshot by a background
+    rebuild every SUGGEST_REBUILD_SECONDS, or once it holds SUGGEST_MAX_DELTA videos
+    """
+
+    def __init__(self, memory_mb: float = SUGGEST_MEMORY_MB):
+        self.memory_budget = int(memory_mb * 2**20)
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.base: Optional[PrefixIndex] = None
+        # Videos changed since the snapshot: their snapshot entry is hidden, the
+        # current one (if still ready) is in `delta` as (key, views, title)
+        self.hidden: set[str] = set()
+        self.delta: dict[str, tuple[str, int, str]] = {}
+        self.watermark: Optional[datetime] = None
+        self.last_refresh = 0.0
+        self.last_build = 0.0
+        self.rebuilding = False
+        self.build_stats: dict = {}
+
+    def _apply(self, video_id: str, status: str, title: Optional[str], views: int):
+        self.hidden.add(video_id)
+        if status == "ready":
+            self.delta[video_id] = (normalize_title(title), views, title)
+        else:
+            self.delta.pop(video_id, None)
+
+    def update(self, video: Video):
+        """
+        Re-index a single video right after it changed in this process
+        """
+        with self.lock:
+            if self.base is not None:
+                self._apply(video.id, video.status, video.title, video.views or 0)
+
+    def load(self, db: Session) -> tuple[PrefixIndex, Optional[datetime]]:
+        """
+        Build a snapshot from the database, most viewed titles first until the memory budget is spent
+        Returns the index and the newest updated_at it contains
+        """
+        started = time.perf_counter()
+        entries = []
+        used = 0
+        dropped = 0
+        watermark = None
+        rows = db.execute(
+            select(Video.id, Video.title, Video.views, Video.updated_at)
+            .where(Video.status == "ready")
+            .order_by(Video.views.desc())
+            .execution_options(yield_per=LOAD_BATCH)
+        )
+        for row in rows:
+            if watermark is None or (row.updated_at and row.updated_at > watermark):
+                watermark = row.updated_at
+            key = normalize_title(row.title)
+            if not key:
+                continue
+            size = entry_size(key, row.id, row.title)
+            if used + size > self.memory_budget:
+                dropped += 1
+                continue
+            used += size
+            entries.append((key, row.views or 0, row.id, row.title))
+
+        index = PrefixIndex(entries)
+        used += sum(sys.getsizeof(top) + sys.getsizeof(prefix) for prefix, top in index.heavy.items())
+        self.build_stats = {
+            "titles": len(index),
+            "dropped_titles": dropped,
+            "heavy_prefixes": len(index.heavy),
+            "estimated_bytes": used,
+            "build_seconds": round(time.perf_counter() - started, 3),
+        }
+        if dropped:
+            logger.warning(f"[Suggest] Memory budget reached, {dropped} least viewed titles left out")
+        return index, watermark
+
+    def _swap(self, index: PrefixIndex, watermark: Optional[datetime]):
+        with self.lock:
+            self.base = index
+            self.hidden = set()
+            self.delta = {}
+            # Changes written while the snapshot was loading are replayed by the next refresh
+            self.watermark = watermark
+            self.last_build = time.monotonic()
+
+    def _rebuild_in_background(self):
+        from app.db import SessionLocal
+
+        def run():
+            db = SessionLocal()
+            try:
+                self._swap(*self.load(db))
+            except Exception as e:
+                logger.error(f"[Suggest] Rebuild failed: {str(e)}", exc_info=True)
+            finally:
+                db.close()
+                self.rebuilding = False
+
+        self.rebuilding = True
+        threading.Thread(target=run, name="suggest-rebuild", daemon=True).start()
+
+    def refresh(self, db: Session, force: bool = False):
+        if self.base is None:
+            with self.load_lock:
+                if self.base is None:
+                    self._swap(*self.load(db))
+                    self.last_refresh = time.monotonic()
+            return
+
+        now = time.monotonic()
+        if not force and now - self.last_refresh < SUGGEST_REFRESH_SECONDS:
+            return
+        self.last_refresh = now
+
+        stmt = select(Video.id, Video.title, Video.views, Video.status, Video.updated_at)
+        if self.watermark is not None:
+            # Small overlap so rows written with a slightly older clock are not missed
+            stmt = stmt.where(Video.updated_at >= self.watermark - timedelta(seconds=SUGGEST_REFRESH_SECONDS))
+        else:
+            stmt = stmt.where(Video.status == "ready")
+        rows = db.execute(stmt).all()
+        with self.lock:
+            for row in rows:
+                self._apply(row.id, row.status, row.title, row.views or 0)
+                if row.updated_at and (self.watermark is None or row.updated_at > self.watermark):
+                    self.watermark = row.updated_at
+            due = len(self.delta) >= SUGGEST_MAX_DELTA or now - self.last_build >= SUGGEST_REBUILD_SECONDS
+            if due and not self.rebuilding:
+                self._rebuild_in_background()
+
+    def suggest(self, db: Session, prefix: str, limit: int = 10) -> list[tuple[str, str, int]]:
+        """
+        (video id, title, views) of the most viewed ready videos whose title starts with prefix
+        """
+        key = normalize_title(prefix)
+        # Keep a trailing space: "cat " should not match "category"
+        if key and prefix[-1:].isspace():
+            key += " "
+        if not key:
+            return []
+        self.refresh(db)
+
+        with self.lock:
+            base, hidden, delta = self.base, self.hidden, self.delta
+            results = []
+            # Changed videos are skipped in the snapshot, their current entry is in delta
+            for position in base.lookup(key, limit, exclude=hidden):
+                video_id, title, views = base.entry(position)
+                results.append((views, video_id, title))
+            for video_id, (entry_key, views, title) in delta.items():
+                if entry_key.startswith(key):
+                    results.append((views, video_id, title))
+        top = heapq.nlargest(limit, results)
+        return [(video_id, title, views) for views, video_id, title in top]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                **self.build_stats,
+                "pending_updates": len(self.delta),
+                "hidden_titles": len(self.hidden),
+                "rebuilding": self.rebuilding,
+            }
+
+
+title_suggester = TitleSuggester()
@@ -0,0 +1,69 @@
+import math
+from typing import Optional
+
+MiB = 1024 * 1024
+GiB = 1024 * MiB
+TiB = 1024 * GiB
+
+# S3 multipart limits
+MIN_PART_SIZE = 5 * MiB       # every part but the last
+MAX_PART_SIZE = 5 * GiB
+MAX_PARTS = 10000
+MAX_OBJECT_SIZE = 5 * TiB
+
+# Without hints: same part size the web client has always used
+DEFAULT_PART_SIZE = 20 * MiB
+DEFAULT_PARALLELISM = 4
+MAX_PARALLELISM = 8
+# A part should take roughly this long on one connection: long enough to amortize
+# request overhead, short enough that a retry does not cost much
+TARGET_PART_SECONDS = 8
+# Throughput a single HTTPS connection typically sustains to the accelerate endpoint
+PER_CONNECTION_MBPS = 25
+
+
+def plan_multipart_upload(
+    file_size: int,
+    bandwidth_mbps: Optional[float] = None,
+    max_parallelism: Optional[int] = None
+) -> dict:
+    """
+    Choose part size, part count and upload parallelism for a file
+
+    The part size follows the client's bandwidth, then is raised if needed so the
+    upload fits in MAX_PARTS parts, and is rounded up to whole MiB
+    Raises ValueError if the file cannot be uploaded with multipart upload
+    """
+    if file_size <= 0:
+        raise ValueError("file_size must be positive")
+    if file_size > MAX_OBJECT_SIZE:
+        raise ValueError("file_size exceeds the 5 TiB S3 object limit")
+
+    parallelism_cap = min(MAX_PARALLELISM, max_parallelism or MAX_PARALLELISM)
+    if bandwidth_mbps:
+        parallelism = math.ceil(bandwidth_mbps / PER_CONNECTION_MBPS)
+        bytes_per_second = bandwidth_mbps * 1_000_000 / 8
+        parallelism = max(1, min(parallelism, parallelism_cap))
+        part_size = bytes_per_second / parallelism * TARGET_PART_SECONDS
+    else:
+        parallelism = min(DEFAULT_PARALLELISM, parallelism_cap)
+        part_size = DEFAULT_PART_SIZE
+
+    part_size = max(part_size, MIN_PART_SIZE, math.ceil(file_size / MAX_PARTS))
+    part_size = min(math.ceil(part_size / MiB) * MiB, MAX_PART_SIZE)
+    num_parts = math.ceil(file_size / part_size)
+
+    return {
+        "file_size": file_size,
+        "part_size": part_size,
+        "num_parts": num_parts,
+        "parallelism": min(parallelism, num_parts),
+    }
+
+
+def missing_parts(part_numbers: list[int], num_parts: int) -> list[int]:
+    """
+    Part numbers of 1..num_parts that are not in part_numbers
+    """
+    present = set(part_numbers)
+    return [n for n in range(1, num_parts + 1) if n not in present]
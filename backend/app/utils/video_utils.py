@@ -1,8 +1,74 @@
-from app.db import SessionLocal
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, AsyncSessionLocal
+from app.models.user import User
+from app.models.video import Video
+from app.schemas.user import UploaderInfo
+from app.schemas.video import VideoItem
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _uploader_cache(db: Session) -> dict:
+    # Lives on the session, so it is scoped to a single request
+    return db.info.setdefault("uploader_cache", {})
+
+def remember_uploader(db: Session, user: User):
+    """
+    Seed the per-request uploader map with a user that is already loaded
+    """
+    _uploader_cache(db)[user.id] = UploaderInfo(
+        id=user.id,
+        username=user.username,
+        profile_picture=user.profile_picture
+    )
+
+def load_uploaders(db: Session, videos: Iterable[Video]) -> dict[str, UploaderInfo]:
+    """
+    Resolve the uploaders of many videos with at most one SELECT
+    Uploaders already resolved earlier in the same request are not queried again
+    """
+    cache = _uploader_cache(db)
+    missing = {v.uploader_id for v in videos if v.uploader_id and v.uploader_id not in cache}
+    if missing:
+        rows = db.execute(
+            select(User.id, User.username, User.profile_picture).where(User.id.in_(missing))
+        ).all()
+        for row in rows:
+            cache[row.id] = UploaderInfo(
+                id=row.id,
+                username=row.username,
+                profile_picture=row.profile_picture
+            )
+    return cache
+
+def to_video_item(video: Video, uploader: Optional[UploaderInfo]) -> VideoItem:
+    return VideoItem(
+        id=video.id,
+        title=video.title,
+        description=video.description,
+        thumbnail_url=video.thumbnail_url,
+        status=video.status,
+        duration_seconds=video.duration_seconds,
+        views=video.views,
+        created_at=video.created_at,
+        uploader=uploader
+    )
+
+def build_video_items(db: Session, videos: list[Video]) -> list[VideoItem]:
+    """
+    Convert a page of videos to VideoItems without lazy-loading `uploader` per row
+    """
+    uploaders = load_uploaders(db, videos)
+    return [to_video_item(v, uploaders.get(v.uploader_id)) for v in videos]
@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.video import Video
+from app.models.video_view_bucket import VideoViewBucket
+
+logger = logging.getLogger(__name__)
+
+VIEW_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", "5"))
+VIEW_FLUSH_THRESHOLD = int(os.getenv("VIEW_FLUSH_THRESHOLD", "1000"))
+VIEW_FLUSH_CHUNK_SIZE = 500
+# Width of the per-video view buckets read by the trending job
+VIEW_BUCKET_SECONDS = 3600
+_EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_start(moment: datetime) -> datetime:
+    """
+    Start of the view bucket containing `moment`, as naive UTC like the other timestamps
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    seconds = int((moment - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % VIEW_BUCKET_SECONDS)
+
+
+def add_view_buckets(db: Session, bucket: datetime, counts: dict[str, int]):
+    """
+    Add view counts to one bucket with a single upsert
+    (INSERT ... ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT DO UPDATE elsewhere)
+    """
+    rows = [{"video_id": video_id, "bucket_start": bucket, "views": n} for video_id, n in counts.items()]
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(VideoViewBucket).values(rows)
+        stmt = stmt.on_duplicate_key_update(views=VideoViewBucket.views + stmt.inserted.views)
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(VideoViewBucket).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[VideoViewBucket.video_id, VideoViewBucket.bucket_start],
+            set_={"views": VideoViewBucket.views + stmt.excluded.views}
+        )
+    db.execute(stmt)
+
+
+class ViewCounter:
+    """
+    Write-behind aggregator for video view counts
+
+    get_video only records a view in memory; increments are coalesced per video
+    and written by a background thread as one
+    `UPDATE videos SET views = views + CASE id ... END WHERE id IN (...)`
+    plus one upsert into the current hourly bucket of video_view_buckets,
+    every VIEW_FLUSH_INTERVAL_SECONDS, or sooner once VIEW_FLUSH_THRESHOLD views are pending
+    """
+
+    def __init__(self, interval: float = VIEW_FLUSH_INTERVAL_SECONDS, threshold: int = VIEW_FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending: dict[str, int] = {}
+        self.pending_total = 0
+        self.flushed_total = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread: Optional[threading.Thread] = None
+
+    def record(self, video_id: str, n: int = 1):
+        with self.lock:
+            self.pending[video_id] = self.pending.get(video_id, 0) + n
+            self.pending_total += n
+            over_threshold = self.pending_total >= self.threshold
+        if over_threshold:
+            self.wakeup.set()
+
+    def pending_for(self, video_id: str) -> int:
+        with self.lock:
+            return self.pending.get(video_id, 0)
+
+    def flush(self) -> int:
+        """
+        Write all pending increments to the database
+        Returns the number of views written
+        """
+        with self.flush_lock:
+            with self.lock:
+                batch = self.pending
+                self.pending = {}
+                self.pending_total = 0
+            if not batch:
+                return 0
+
+            # Views pending since the last flush (seconds ago) all go to the current bucket
+            bucket = bucket_start(datetime.now(timezone.utc))
+            db = SessionLocal()
+            try:
+                items = list(batch.items())
+                for start in range(0, len(items), VIEW_FLUSH_CHUNK_SIZE):
+                    chunk = dict(items[start:start + VIEW_FLUSH_CHUNK_SIZE])
+                    db.execute(
+                        update(Video)
+                        .where(Video.id.in_(chunk.keys()))
+                        .values(
+                            views=Video.views + case(chunk, value=Video.id, else_=0),
+                            # A view is not an edit of the video
+                            updated_at=Video.updated_at
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    add_view_buckets(db, bucket, chunk)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"[Views] Failed to flush {len(batch)} videos: {str(e)}", exc_info=True)
+                # Put the increments back so they are retried on the next flush
+                with self.lock:
+                    for video_id, n in batch.items():
+                        self.pending[video_id] = self.pending.get(video_id, 0) + n
+                        self.pending_total += n
+                    self.failed_flushes += 1
+                return 0
+            finally:
+                db.close()
+
+            written = sum(batch.values())
+            with self.lock:
+                self.flushed_total += written
+                self.flush_count += 1
+            return written
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "pending_views": self.pending_total,
+                "pending_videos": len(self.pending),
+                "flushed_views": self.flushed_total,
+                "flushes": self.flush_count,
+                "failed_flushes": self.failed_flushes,
+            }
+
+    def _run(self):
+        while not self.stopping:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread and write whatever is still pending
+        """
+        if self.thread is not None:
+            self.stopping = True
+            self.wakeup.set()
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,6 @@
+"""
+End-to-end API benchmark: local database, in-memory S3 stand-in, concurrent clients
+
+Run from backend/:
+    python -m benchmarks.api --help
+"""
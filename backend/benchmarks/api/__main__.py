@@ -0,0 +1,300 @@
+"""
+Reproducible API benchmark
+
+Seeds a synthetic catalog into a local database, boots the API (uvicorn subprocess,
+in-memory S3 stand-in) and runs each scenario for `--duration` seconds with
+`--concurrency` clients. Results (p50/p95/p99 latency, requests/sec, errors per
+endpoint) are written as JSON; `--compare` diffs them against an earlier run.
+
+Usage (from backend/):
+    python -m benchmarks.api [--database-url sqlite:///./bench-api.db]
+                             [--users 500 --videos 10000 --likes 200000 --watch-later 50000]
+                             [--scenarios list_videos,search,get_video,toggle_like,multipart]
+                             [--concurrency 32 --duration 10 --warmup 2]
+                             [--output bench-api.json] [--compare baseline.json --max-regression 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.api.catalog import Catalog, CatalogSpec, seed_catalog
+from benchmarks.db_modes import wait_until_up
+
+SCENARIOS = ("list_videos", "search", "get_video", "toggle_like", "multipart")
+JWT_SECRET = "benchmark-secret"
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.recording = False
+
+    def add(self, name: str, elapsed: float, ok: bool):
+        if not self.recording:
+            return
+        if ok:
+            self.samples.setdefault(name, []).append(elapsed)
+        else:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def timed(recorder: Recorder, name: str, request) -> httpx.Response:
+    started = time.perf_counter()
+    response = await request
+    recorder.add(name, time.perf_counter() - started, response.status_code < 400)
+    return response
+
+
+class Scenarios:
+    """
+    One method per scenario; each call issues one logical user action
+    """
+
+    def __init__(self, catalog: Catalog, tokens: list[str], per_page: int):
+        self.catalog = catalog
+        self.tokens = tokens
+        self.per_page = per_page
+
+    def auth(self, rng: random.Random) -> dict:
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+    async def list_videos(self, client, recorder, rng):
+        pages = max(1, len(self.catalog.video_ids) // self.per_page)
+        await timed(recorder, "list_videos", client.get(
+            "/videos", params={"page": rng.randint(1, min(pages, 50)), "per_page": self.per_page}
+        ))
+
+    async def search(self, client, recorder, rng):
+        words = rng.sample(self.catalog.vocabulary, rng.randint(1, 2))
+        await timed(recorder, "search", client.get(
+            "/videos", params={"q": " ".join(words), "per_page": self.per_page}
+        ))
+
+    async def get_video(self, client, recorder, rng):
+        headers = self.auth(rng) if rng.random() < 0.5 else {}
+        await timed(recorder, "get_video", client.get(
+            f"/videos/{rng.choice(self.catalog.video_ids)}", headers=headers
+        ))
+
+    async def toggle_like(self, client, recorder, rng):
+        await timed(recorder, "toggle_like", client.post(
+            f"/videos/{rng.choice(self.catalog.video_ids)}/like", headers=self.auth(rng)
+        ))
+
+    async def multipart(self, client, recorder, rng):
+        headers = self.auth(rng)
+        file_size = rng.randint(100, 4000) * 1024 * 1024
+        response = await timed(recorder, "multipart_initiate", client.post(
+            "/videos/multipart/initiate", json={"file_size": file_size}, headers=headers
+        ))
+        if response.status_code >= 400:
+            return
+        upload = response.json()
+        num_parts = upload["plan"]["num_parts"]
+
+        response = await timed(recorder, "multipart_get_urls", client.post(
+            "/videos/multipart/get-urls",
+            json={"video_id": upload["video_id"], "upload_id": upload["upload_id"], "num_parts": num_parts},
+            headers=headers,
+        ))
+        if response.status_code >= 400:
+            return
+
+        parts = [{"PartNumber": part["part_number"], "ETag": f'"etag-{part["part_number"]}"'}
+                 for part in response.json()["parts"]]
+        await timed(recorder, "multipart_complete", client.post(
+            "/videos/multipart/complete",
+            json={"video_id": upload["video_id"], "upload_id": upload["upload_id"], "parts": parts},
+            headers=headers,
+        ))
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return round(samples[index] * 1000, 2)
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    results = {}
+    for name in sorted(set(recorder.samples) | set(recorder.errors)):
+        samples = sorted(recorder.samples.get(name, []))
+        results[name] = {
+            "requests": len(samples),
+            "errors": recorder.errors.get(name, 0),
+            "requests_per_sec": round(len(samples) / elapsed, 1),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else 0.0,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+        }
+    return results
+
+
+async def run_scenario(base_url: str, scenario, args) -> dict:
+    recorder = Recorder()
+    stop_at = time.perf_counter() + args.warmup + args.duration
+
+    async def client_loop(client: httpx.AsyncClient, worker: int):
+        rng = random.Random(args.seed * 1000 + worker)
+        while time.perf_counter() < stop_at:
+            await scenario(client, recorder, rng)
+
+    async def start_recording():
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(start_recording(), *(client_loop(client, i) for i in range(args.concurrency)))
+    return summarize(recorder, args.duration)
+
+
+def compare(results: dict, baseline_path: str, max_regression: float) -> bool:
+    """
+    Print p95 / throughput deltas against a previous artifact
+    Returns False if any endpoint's p95 regressed by more than max_regression percent
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    ok = True
+    print(f"{'endpoint':<22}{'p95 ms':>18}{'req/s':>20}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        p95_delta = (current["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        rps_delta = (
+            (current["requests_per_sec"] - before["requests_per_sec"]) / before["requests_per_sec"] * 100
+            if before["requests_per_sec"] else 0.0
+        )
+        flag = ""
+        if max_regression is not None and p95_delta > max_regression:
+            flag = "  REGRESSION"
+            ok = False
+        print(
+            f"{name:<22}{before['p95_ms']:>8} -> {current['p95_ms']:<8}"
+            f"{before['requests_per_sec']:>9} -> {current['requests_per_sec']:<8}"
+            f"({p95_delta:+.1f}% / {rps_delta:+.1f}%){flag}"
+        )
+    return ok
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end API benchmark")
+    parser.add_argument("--database-url", default="sqlite:///./bench-api.db")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--likes", type=int, default=200000)
+    parser.add_argument("--watch-later", type=int, default=50000)
+    parser.add_argument("--reseed", action="store_true", help="Drop and re-seed even if the catalog matches")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--db-mode", default="sync", choices=("sync", "async"))
+    parser.add_argument("--cache-backend", default="memory", choices=("memory", "none"))
+    parser.add_argument("--s3-latency-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--output", default="bench-api.json")
+    parser.add_argument("--compare", help="Previous JSON artifact to diff against")
+    parser.add_argument("--max-regression", type=float, help="Fail if any p95 grows by more than this percent")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        DB_MODE=args.db_mode,
+        CACHE_BACKEND=args.cache_backend,
+        JWT_SECRET_KEY=JWT_SECRET,
+        # Dummy credentials: part URLs are signed locally, nothing reaches AWS
+        AWS_ACCESS_KEY_ID="benchmark",
+        AWS_SECRET_ACCESS_KEY="benchmark",
+        AWS_REGION="us-east-1",
+    )
+    os.environ.update(env)
+
+    spec = CatalogSpec(
+        users=args.users, videos=args.videos, likes=args.likes,
+        watch_later=args.watch_later, seed=args.seed,
+    )
+    started = time.perf_counter()
+    catalog = seed_catalog(spec, reseed=args.reseed)
+    seed_seconds = round(time.perf_counter() - started, 1)
+
+    from app.utils.auth_utils import create_access_token
+    tokens = [create_access_token({"sub": user_id}) for user_id in catalog.user_ids[:200]]
+    runner = Scenarios(catalog, tokens, args.per_page)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.api.server", "--port", str(args.port),
+         "--s3-latency-ms", str(args.s3_latency_ms)],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    try:
+        wait_until_up(server, base_url)
+        for name in scenarios:
+            print(f"[bench] {name} ...", file=sys.stderr)
+            results.update(asyncio.run(run_scenario(base_url, getattr(runner, name), args)))
+    finally:
+        server.terminate()
+        server.wait()
+
+    artifact = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": args.database_url.split("://")[0],
+            "db_mode": args.db_mode,
+            "cache_backend": args.cache_backend,
+            "s3_latency_ms": args.s3_latency_ms,
+            "catalog": vars(spec),
+            "seed_seconds": seed_seconds,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(artifact, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"[bench] Wrote {args.output}", file=sys.stderr)
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
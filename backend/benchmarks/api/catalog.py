@@ -0,0 +1,174 @@
+"""
+Deterministic synthetic catalog: users, videos, likes and watch-later rows
+
+Rows are bulk-inserted with Core `insert()` in chunks, so a few million likes take
+seconds on SQLite. Video popularity is Zipf-like, so a handful of videos collect
+most likes, which is the shape that stresses counters and per-video lookups.
+"""
+import itertools
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+WORDS = tuple((
+    "cat dog travel music guitar piano cooking pasta pizza coffee morning night city "
+    "beach mountain hiking camping review unboxing phone laptop camera drone gaming "
+    "minecraft football basketball tennis running yoga workout tutorial python react "
+    "docker cloud aws database history science space rocket ocean forest rain snow "
+    "funny prank vlog family baby wedding dance concert live podcast interview news "
+    "movie trailer anime cartoon art painting drawing design fashion makeup car bike"
+).split())
+
+INSERT_CHUNK = 5000
+
+
+@dataclass
+class CatalogSpec:
+    users: int = 500
+    videos: int = 10000
+    likes: int = 200000
+    watch_later: int = 50000
+    seed: int = 42
+
+
+@dataclass
+class Catalog:
+    user_ids: list[str]
+    video_ids: list[str]
+    vocabulary: tuple = WORDS
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _bulk_insert(db, table, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        db.execute(insert(table), rows[start:start + INSERT_CHUNK])
+
+
+def _pairs(rng: random.Random, user_ids: list[str], video_ids: list[str], total: int, weights: list[float]):
+    """
+    Distinct (user, video) pairs, `total` of them, videos drawn by popularity
+    """
+    per_user = min(len(video_ids), -(-total // max(1, len(user_ids))))
+    population = range(len(video_ids))
+    cum_weights = list(itertools.accumulate(weights))
+    pairs = []
+    for user_id in user_ids:
+        chosen = set()
+        # Popular videos repeat, so draw a few weighted rounds, then top up uniformly
+        for _ in range(3):
+            if len(chosen) >= per_user:
+                break
+            chosen.update(rng.choices(population, cum_weights=cum_weights, k=per_user - len(chosen)))
+        if len(chosen) < per_user:
+            rest = [index for index in population if index not in chosen]
+            chosen.update(rng.sample(rest, per_user - len(chosen)))
+        pairs.extend((user_id, video_ids[index]) for index in chosen)
+        if len(pairs) >= total:
+            break
+    return pairs[:total]
+
+
+def seed_catalog(spec: CatalogSpec, reseed: bool = False) -> Catalog:
+    """
+    Create the schema and seed it, unless the database already holds this catalog
+    """
+    from app.db import Base, SessionLocal, engine
+    import app.models
+    from app.models.like import Like
+    from app.models.user import User
+    from app.models.video import Video
+    from app.models.watch_later import WatchLater
+    from app.utils.auth_utils import get_password_hash
+    from app.jobs.like_counts import reconcile_user_counts
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        counts = (
+            db.scalar(select(func.count()).select_from(User)),
+            db.scalar(select(func.count()).select_from(Video)),
+            db.scalar(select(func.count()).select_from(Like)),
+            db.scalar(select(func.count()).select_from(WatchLater)),
+        )
+        capacity = spec.users * spec.videos
+        expected = (spec.users, spec.videos, min(spec.likes, capacity), min(spec.watch_later, capacity))
+        if not reseed and counts == expected:
+            return Catalog(
+                user_ids=list(db.scalars(select(User.id).order_by(User.username))),
+                video_ids=list(db.scalars(select(Video.id).order_by(Video.created_at))),
+            )
+        db.close()
+
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+
+        rng = random.Random(spec.seed)
+        # One bcrypt hash shared by every benchmark user: hashing is not what is measured
+        password_hash = get_password_hash("benchmark-password")
+        now = datetime(2025, 1, 1)
+
+        user_ids = [_uuid(rng) for _ in range(spec.users)]
+        _bulk_insert(db, User, [
+            {
+                "id": user_id,
+                "username": f"bench{i:06d}",
+                "email": f"bench{i:06d}@example.com",
+                "password_hash": password_hash,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, user_id in enumerate(user_ids)
+        ])
+
+        video_ids = [_uuid(rng) for _ in range(spec.videos)]
+        weights = [1 / (rank + 1) for rank in range(len(video_ids))]
+        rng.shuffle(weights)
+        like_pairs = _pairs(rng, user_ids, video_ids, spec.likes, weights)
+        # Counters are written with the videos instead of reconciled afterwards
+        like_counts = Counter(video_id for _, video_id in like_pairs)
+
+        _bulk_insert(db, Video, [
+            {
+                "id": video_id,
+                "title": _sentence(rng, 3, 6),
+                "description": _sentence(rng, 8, 20),
+                "status": "ready",
+                "uploader_id": rng.choice(user_ids),
+                "s3_source_key": f"uploads/{video_id}.mp4",
+                "s3_dest_prefix": f"hls/{video_id}/",
+                "thumbnail_url": f"https://cdn.example.com/{video_id}.jpg",
+                "duration_seconds": rng.randint(10, 3600),
+                "views": rng.randint(0, 1000000),
+                "like_count": like_counts[video_id],
+                "created_at": now + timedelta(seconds=i),
+                "updated_at": now + timedelta(seconds=i),
+            }
+            for i, video_id in enumerate(video_ids)
+        ])
+
+        _bulk_insert(db, Like, [
+            {"id": _uuid(rng), "user_id": user_id, "video_id": video_id, "created_at": now}
+            for user_id, video_id in like_pairs
+        ])
+        _bulk_insert(db, WatchLater, [
+            {"id": _uuid(rng), "user_id": user_id, "video_id": video_id, "added_at": now}
+            for user_id, video_id in _pairs(rng, user_ids, video_ids, spec.watch_later, weights)
+        ])
+        db.commit()
+        # Per-user totals are an index-only count per user, cheap next to the inserts
+        reconcile_user_counts(db)
+        return Catalog(user_ids=user_ids, video_ids=video_ids)
+    finally:
+        db.close()
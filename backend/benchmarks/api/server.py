@@ -0,0 +1,26 @@
+"""
+Launch the API with the S3 stand-in installed (used by benchmarks.api as a subprocess)
+
+    python -m benchmarks.api.server --port 8770 [--s3-latency-ms 20]
+"""
+import argparse
+
+import uvicorn
+
+from benchmarks.api import fake_s3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API against the in-memory S3 stand-in")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--s3-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    fake_s3.install(latency=args.s3_latency_ms / 1000)
+    from app.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
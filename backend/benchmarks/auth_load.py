@@ -0,0 +1,123 @@
+"""
+Show how a burst of logins affects the latency of unrelated GET requests
+
+Boots the API with uvicorn twice against the same local database:
+  - inline:  PASSWORD_HASH_WORKERS=0, bcrypt runs on the request threads
+  - pooled:  bcrypt runs in the bounded process pool
+and, in each, measures GET /videos/{id} latency while `--login-concurrency`
+clients hammer POST /auth/login. Rejected logins (429/503) are counted separately.
+
+Usage (from backend/):
+    python -m benchmarks.auth_load [--database-url sqlite:///./bench.db] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.db_modes import seed, wait_until_up
+
+EMAIL = "loadtest@example.com"
+PASSWORD = "loadtest-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 1)
+
+
+async def drive(base_url: str, video_ids: list[str], args) -> dict:
+    deadline = time.perf_counter() + args.duration
+    read_latencies = []
+    logins = {"ok": 0, "rejected": 0, "failed": 0}
+
+    async def reader(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get(f"/videos/{random.choice(video_ids)}")
+            read_latencies.append(time.perf_counter() - started)
+
+    async def login(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            if response.status_code == 200:
+                logins["ok"] += 1
+            elif response.status_code in (429, 503):
+                logins["rejected"] += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+            else:
+                logins["failed"] += 1
+
+    concurrency = args.read_concurrency + args.login_concurrency
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(
+            *(reader(client) for _ in range(args.read_concurrency)),
+            *(login(client) for _ in range(args.login_concurrency)),
+        )
+
+    return {
+        "reads": len(read_latencies),
+        "read_p50_ms": percentile(read_latencies, 50),
+        "read_p95_ms": percentile(read_latencies, 95),
+        "read_p99_ms": percentile(read_latencies, 99),
+        "logins": logins,
+    }
+
+
+def run_mode(name: str, workers: str, args, video_ids: list[str]) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        CACHE_BACKEND="none",
+        PASSWORD_HASH_WORKERS=workers,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_up(server, base_url)
+        httpx.post(
+            f"{base_url}/auth/register",
+            json={"username": "loadtest", "email": EMAIL, "password": PASSWORD},
+            timeout=30,
+        )
+        result = asyncio.run(drive(base_url, video_ids, args))
+    finally:
+        server.terminate()
+        server.wait()
+    return {"mode": name, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login burst vs unrelated read latency")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--videos", type=int, default=500)
+    parser.add_argument("--read-concurrency", type=int, default=8)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", default=str(os.cpu_count() or 1))
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    video_ids = seed(args.database_url, args.videos)
+    results = [
+        run_mode("inline", "0", args, video_ids),
+        run_mode("pooled", args.workers, args, video_ids),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compare requests/sec of DB_MODE=sync (thread pool) and DB_MODE=async (event loop)
+
+Boots the API twice with uvicorn against the same local database, once per mode,
+and drives GET /videos and GET /videos/{id} with concurrent clients.
+The response cache is disabled so every request reaches the database.
+
+Usage (from backend/):
+    python -m benchmarks.db_modes [--database-url sqlite:///./bench.db] [--concurrency 64] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+
+def seed(database_url: str, n_videos: int) -> list[str]:
+    os.environ["DATABASE_URL"] = database_url
+    from app.db import Base, SessionLocal, engine
+    import app.models
+    from app.models.video import Video
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        ids = db.query(Video.id).filter(Video.status == "ready").limit(n_videos).all()
+        if len(ids) >= n_videos:
+            return [row.id for row in ids]
+
+        start = datetime(2024, 1, 1)
+        new_ids = []
+        for i in range(n_videos - len(ids)):
+            vid = str(uuid.uuid4())
+            new_ids.append(vid)
+            db.add(Video(
+                id=vid,
+                title=f"Benchmark video {i}",
+                description="seeded by benchmarks.db_modes",
+                status="ready",
+                s3_source_key=f"uploads/{vid}.mp4",
+                created_at=start + timedelta(seconds=i),
+            ))
+        db.commit()
+        return [row.id for row in ids] + new_ids
+    finally:
+        db.close()
+
+
+async def drive(base_url: str, video_ids: list[str], concurrency: int, duration: float) -> dict:
+    done = 0
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal done, errors
+        while time.perf_counter() < deadline:
+            if random.random() < 0.5:
+                url = f"/videos?page={random.randint(1, 20)}&per_page=20"
+            else:
+                url = f"/videos/{random.choice(video_ids)}"
+            response = await client.get(url)
+            if response.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {"requests": done, "errors": errors, "requests_per_sec": round(done / elapsed, 1)}
+
+
+def wait_until_up(server: subprocess.Popen, base_url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def run_mode(mode: str, args, video_ids: list[str]) -> dict:
+    env = dict(os.environ, DB_MODE=mode, DATABASE_URL=args.database_url, CACHE_BACKEND="none")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_up(server, base_url)
+        result = asyncio.run(drive(base_url, video_ids, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+    return {"mode": mode, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threaded vs async database mode benchmark")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--videos", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    video_ids = seed(args.database_url, args.videos)
+    results = [run_mode(mode, args, video_ids) for mode in ("sync", "async")]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
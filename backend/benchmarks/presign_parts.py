@@ -0,0 +1,47 @@
+"""
+Time to presign all part URLs of a multipart upload: botocore loop vs batched SigV4 signer
+
+Usage (from backend/):
+    python -m benchmarks.presign_parts [--parts 1000 10000]
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+import app.utils.s3_utils as s3_utils
+
+
+def timed(num_parts: int, batched: bool) -> float:
+    s3_utils.S3_BATCH_PRESIGN = batched
+    started = time.perf_counter()
+    urls = s3_utils.generate_multipart_presigned_urls("uploads/bench.mp4", "bench-upload-id", num_parts)
+    elapsed = time.perf_counter() - started
+    assert len(urls) == num_parts
+    return round(elapsed * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multipart part URL presigning benchmark")
+    parser.add_argument("--parts", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    s3_utils.get_s3_client(accelerate=True)  # client creation is not what is measured here
+    results = []
+    for num_parts in args.parts:
+        loop_ms = timed(num_parts, batched=False)
+        batched_ms = timed(num_parts, batched=True)
+        results.append({
+            "parts": num_parts,
+            "botocore_loop_ms": loop_ms,
+            "batched_signer_ms": batched_ms,
+            "speedup": round(loop_ms / batched_ms, 1) if batched_ms else None,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Build time and memory of the co-like related videos index
+
+Generates `--likes` synthetic likes in memory (Zipf-like video popularity and user
+activity, like the API benchmark catalog) and times each stage of app.jobs.related:
+the per-user cap, the blocked co-occurrence product with top-k selection, and the
+size of the resulting index. Peak memory is measured with tracemalloc (numpy and
+scipy allocations are traced) and as the process max RSS.
+
+With `--database-url`, the full job (read likes, build, write related_videos) is
+also run against that database, e.g. one seeded by benchmarks.api.
+
+Usage (from backend/):
+    python -m benchmarks.related [--likes 1000000 --users 100000 --videos 50000]
+                                 [--database-url sqlite:///./bench-api.db]
+"""
+import argparse
+import json
+import os
+import resource
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def synthetic_likes(n_likes: int, n_users: int, n_videos: int, seed: int):
+    """
+    Distinct (user, video) pairs with skewed popularity on both sides
+    """
+    rng = np.random.default_rng(seed)
+    video_weights = 1 / np.arange(1, n_videos + 1)
+    video_weights = rng.permutation(video_weights / video_weights.sum())
+    user_weights = 1 / np.arange(1, n_users + 1) ** 0.8
+    user_weights /= user_weights.sum()
+
+    pairs = np.empty(0, dtype=np.int64)
+    while len(pairs) < n_likes:
+        draw = int((n_likes - len(pairs)) * 1.2) + 1000
+        users = rng.choice(n_users, size=draw, p=user_weights)
+        videos = rng.choice(n_videos, size=draw, p=video_weights)
+        pairs = np.unique(np.concatenate([pairs, users.astype(np.int64) * n_videos + videos]))
+    pairs = rng.permutation(pairs)[:n_likes]
+    users = (pairs // n_videos).astype(np.int32)
+    videos = (pairs % n_videos).astype(np.int32)
+    times = rng.uniform(0, 86400 * 365, size=n_likes)
+    return users, videos, times
+
+
+def timed(stage: str, results: dict, func, *args, **kwargs):
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    value = func(*args, **kwargs)
+    results[stage] = {
+        "seconds": round(time.perf_counter() - started, 3),
+        "peak_mb": round(tracemalloc.get_traced_memory()[1] / 2**20, 1),
+    }
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Related videos index build benchmark")
+    parser.add_argument("--likes", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--videos", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--min-co-likes", type=int, default=2)
+    parser.add_argument("--max-likes-per-user", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Also run the full job against this database")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from app.jobs.related import LikeMatrix, build_neighbours, cap_per_user, refresh_related
+
+    users, videos, times = synthetic_likes(args.likes, args.users, args.videos, args.seed)
+    likes = LikeMatrix(users=users, videos=videos, times=times,
+                       video_ids=[str(i) for i in range(args.videos)], n_users=args.users)
+
+    stages = {}
+    tracemalloc.start()
+    capped_users, capped_videos = timed("cap_per_user", stages, cap_per_user, likes, args.max_likes_per_user)
+    neighbours = timed(
+        "build_neighbours", stages, build_neighbours,
+        capped_users, capped_videos, args.users, args.videos, args.top_k, args.min_co_likes,
+    )
+
+    result = {
+        "likes": args.likes,
+        "likes_after_cap": int(len(capped_users)),
+        "users": args.users,
+        "videos": args.videos,
+        "top_k": args.top_k,
+        "stages": stages,
+        "neighbours": int(len(neighbours.sources)),
+        "videos_with_neighbours": int(len(np.unique(neighbours.sources))),
+        # related_videos rows: 2 x CHAR(36) + rank + score
+        "index_mb_estimate": round(len(neighbours.sources) * (36 * 2 + 4 + 8) / 2**20, 1),
+    }
+
+    if args.database_url:
+        from app.db import SessionLocal
+        db = SessionLocal()
+        try:
+            timed("full_job", stages, refresh_related, db, args.top_k, args.min_co_likes, args.max_likes_per_user)
+        finally:
+            db.close()
+
+    tracemalloc.stop()
+    result["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
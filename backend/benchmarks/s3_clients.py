@@ -0,0 +1,67 @@
+"""
+Per-call latency of presigning with a fresh boto3 client vs the shared client
+
+Presigning is local (no network), so the difference is the client construction
+cost that every s3_utils call used to pay. Dummy credentials are used if none are set.
+
+Usage (from backend/):
+    python -m benchmarks.s3_clients [--calls 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+import boto3
+
+from app.utils.s3_utils import AWS_REGION, S3_SOURCE_BUCKET, get_s3_client
+
+
+def presign(client) -> str:
+    return client.generate_presigned_url(
+        "upload_part",
+        Params={"Bucket": S3_SOURCE_BUCKET, "Key": "uploads/bench.mp4", "UploadId": "bench", "PartNumber": 1},
+        ExpiresIn=900,
+    )
+
+
+def measure(fn, calls: int) -> dict:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "calls": calls,
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fresh vs shared boto3 S3 client latency")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    fresh = measure(
+        lambda: presign(boto3.client(
+            "s3",
+            region_name=AWS_REGION,
+            config=boto3.session.Config(s3={"use_accelerate_endpoint": True}),
+        )),
+        args.calls,
+    )
+    get_s3_client(accelerate=True)  # warm up once, as the first request of a worker would
+    shared = measure(lambda: presign(get_s3_client(accelerate=True)), args.calls)
+
+    print(json.dumps({"fresh_client": fresh, "shared_client": shared}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
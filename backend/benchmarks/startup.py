@@ -0,0 +1,106 @@
+"""
+How long a new worker takes before it can serve traffic
+
+  - import:  wall time of `import app.main` in a fresh interpreter (median of --runs)
+  - modules: the slowest top-level packages according to `python -X importtime`
+  - ready:   time from spawning uvicorn to the first 200 from GET /health
+             (imports + startup hook: schema check, view counter thread)
+
+Every measurement runs in a new subprocess so nothing is cached in-process.
+The database is migrated once up front so that `ready` measures a normal boot.
+
+Usage (from backend/):
+    python -m benchmarks.startup [--database-url sqlite:///./bench.db] [--runs 5] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.db_modes import wait_until_up
+
+IMPORT_TIMER = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def import_seconds(env: dict) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_TIMER], env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def slowest_modules(env: dict, top: int) -> list[dict]:
+    """
+    Cumulative import time per top-level package, from `-X importtime` (stderr)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = len(name) - len(name.lstrip())
+        entries.append((depth, name.strip(), int(cumulative)))
+
+    # Entries are printed children first; walking backwards visits each parent before
+    # its children, so a package is counted where another package first imported it
+    packages = {}
+    stack = []
+    for depth, name, cumulative_us in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        package = name.split(".")[0]
+        if not stack or stack[-1][1] != package:
+            packages[package] = packages.get(package, 0) + cumulative_us
+        stack.append((depth, package))
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"module": name, "ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def ready_seconds(env: dict, port: int) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        wait_until_up(server, f"http://127.0.0.1:{port}")
+        return time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker import / startup time")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--port", type=int, default=8775)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=args.database_url)
+    subprocess.check_call([sys.executable, "-m", "app.migrations", "upgrade"], env=env)
+
+    imports = [import_seconds(env) for _ in range(args.runs)]
+    ready = [ready_seconds(env, args.port) for _ in range(args.runs)]
+    result = {
+        "import_ms": round(statistics.median(imports) * 1000, 1),
+        "ready_ms": round(statistics.median(ready) * 1000, 1),
+        "runs": args.runs,
+        "slowest_modules": slowest_modules(env, args.top),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
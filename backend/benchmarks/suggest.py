@@ -0,0 +1,113 @@
+"""
+Build time, memory and lookup latency of the title autocomplete index
+
+Builds app.utils.suggest.PrefixIndex from `--titles` synthetic titles (words of the
+API benchmark vocabulary, Zipf-like view counts) and times `--lookups` suggestions
+for random prefixes of 1-10 characters taken from real titles, plus a few that
+match nothing. Lookups go through TitleSuggester.suggest (normalisation and the
+update overlay included) with `--pending` videos waiting in the overlay.
+Memory is measured with tracemalloc and compared with the budget estimate.
+
+Usage (from backend/):
+    python -m benchmarks.suggest [--titles 1000000 --lookups 100000 --pending 500]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+from benchmarks.api.catalog import WORDS
+
+
+def synthetic_entries(n_titles: int, seed: int):
+    rng = random.Random(seed)
+    for rank in range(1, n_titles + 1):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))).capitalize()
+        yield title, int(10_000_000 / rank), str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Title autocomplete index benchmark")
+    parser.add_argument("--titles", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--pending", type=int, default=500, help="Updates waiting in the overlay")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from app.utils.suggest import PrefixIndex, TitleSuggester, entry_size, normalize_title
+
+    rng = random.Random(args.seed)
+    titles = list(synthetic_entries(args.titles, args.seed))
+
+    def build():
+        entries = [(normalize_title(title), views, video_id, title) for title, views, video_id in titles]
+        return PrefixIndex(entries), sum(entry_size(key, video_id, title) for key, _, video_id, title in entries)
+
+    # Timed untraced; tracemalloc slows allocation-heavy code several times over
+    started = time.perf_counter()
+    index, estimate = build()
+    build_seconds = time.perf_counter() - started
+    del index
+    # Titles and ids are shared with `titles`, so only the keys, lists and top lists are counted
+    tracemalloc.start()
+    index, _ = build()
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    suggester = TitleSuggester()
+    suggester.base = index
+    suggester.refresh = lambda db, force=False: None
+    for title, views, video_id in rng.sample(titles, args.pending):
+        # Renamed videos: hide the snapshot entry, serve the new title from the overlay
+        suggester.update(SimpleNamespace(id=video_id, status="ready", title=title[::-1], views=views))
+
+    prefixes = []
+    for _ in range(args.lookups):
+        title = rng.choice(titles)[0]
+        prefixes.append(title[:rng.randint(1, 10)])
+    prefixes[::50] = ["zzq" + str(i) for i in range(len(prefixes[::50]))]
+
+    samples = []
+    empty = 0
+    for prefix in prefixes:
+        started = time.perf_counter()
+        found = suggester.suggest(None, prefix, args.limit)
+        samples.append((time.perf_counter() - started) * 1000)
+        empty += not found
+    samples.sort()
+
+    result = {
+        "titles": len(index),
+        "heavy_prefixes": len(index.heavy),
+        "build_seconds": round(build_seconds, 2),
+        "traced_index_mb": round(index_bytes / 2**20, 1),
+        "budget_estimate_mb": round(estimate / 2**20, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "lookups": len(samples),
+        "pending_updates": args.pending,
+        "empty_results": empty,
+        "latency_ms": {
+            "mean": round(statistics.fmean(samples), 4),
+            "p50": round(percentile(samples, 0.50), 4),
+            "p95": round(percentile(samples, 0.95), 4),
+            "p99": round(percentile(samples, 0.99), 4),
+            "max": round(samples[-1], 4),
+        },
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+# Configured before the app is imported: a throwaway SQLite database and no response
+# cache, so every request reaches the database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='streamvod-tests-')}/test.db"
+os.environ["CACHE_BACKEND"] = "none"
+
+from fastapi.testclient import TestClient
+
+from app.db import SessionLocal
+from app.main import app
+from app.models.video import Video
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    # Depends on the client: app startup migrates the schema
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def register(client: TestClient) -> tuple[str, dict]:
+    """
+    Register and log in a new user, returns (user id, auth headers)
+    """
+    name = uuid.uuid4().hex[:12]
+    email = f"{name}@example.com"
+    response = client.post("/auth/register", json={"username": name, "email": email, "password": "password123"})
+    assert response.status_code in (200, 201), response.text
+    token = client.post("/auth/login", json={"email": email, "password": "password123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    return client.get("/auth/me", headers=headers).json()["id"], headers
+
+
+@pytest.fixture
+def user(client):
+    return register(client)
+
+
+def add_videos(db, uploader_id: str, titles: list[str], status: str = "ready") -> list[str]:
+    """
+    Insert videos directly, one minute apart in list order (the last one is the newest)
+    """
+    start = datetime(2024, 1, 1)
+    videos = [
+        Video(id=str(uuid.uuid4()), title=title, status=status, s3_source_key="uploads/test.mp4",
+              uploader_id=uploader_id, created_at=start + timedelta(minutes=i))
+        for i, title in enumerate(titles)
+    ]
+    db.add_all(videos)
+    db.commit()
+    return [video.id for video in videos]
@@ -0,0 +1,79 @@
+"""
+Shared (Redis) response cache, run against the in-process LocalRedis
+"""
+import pytest
+
+import app.routes.videos as video_routes
+import app.utils.cache as cache
+from app.utils.cache import (
+    CATALOG_GENERATION_KEY, CacheBackend, InstrumentedCache, LocalRedis, RedisCache,
+    catalog_version, detail_cache_key, invalidate_video, list_cache_key,
+)
+from tests.conftest import add_videos
+
+
+@pytest.fixture
+def store():
+    return LocalRedis()
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, store):
+    """
+    Route the app's response cache through a RedisCache, as with CACHE_BACKEND=redis
+    """
+    backend = InstrumentedCache(RedisCache(store))
+    monkeypatch.setattr(cache, "response_cache", backend)
+    monkeypatch.setattr(video_routes, "response_cache", backend)
+    return backend
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_values_and_counters_are_shared_between_workers(store):
+    first, second = RedisCache(store), RedisCache(store)
+    first.set("videos:detail:1", {"title": "cat"})
+    assert second.get("videos:detail:1") == {"title": "cat"}
+
+    assert second.get_counter(CATALOG_GENERATION_KEY) == 0
+    assert first.incr(CATALOG_GENERATION_KEY) == 1
+    assert second.get_counter(CATALOG_GENERATION_KEY) == 1
+
+    second.delete("videos:detail:1")
+    assert first.get("videos:detail:1") is None
+
+
+def test_invalidation_drops_detail_and_moves_list_keys(db, shared_cache):
+    shared_cache.set(detail_cache_key("v1"), {"title": "cat"})
+    list_key = list_cache_key(db, page=1, per_page=10)
+    version = catalog_version(db)
+
+    invalidate_video("v1", catalog=False)
+    assert shared_cache.get(detail_cache_key("v1")) is None
+    assert catalog_version(db) == version
+
+    invalidate_video("v1")
+    assert catalog_version(db) != version
+    assert list_cache_key(db, page=1, per_page=10) != list_key
+
+
+def test_update_invalidates_cached_detail_and_lists(client, db, user, shared_cache, store):
+    user_id, headers = user
+    video_id, = add_videos(db, user_id, ["before rename"])
+
+    assert client.get(f"/videos/{video_id}").json()["title"] == "before rename"
+    assert shared_cache.get(detail_cache_key(video_id))["title"] == "before rename"
+    client.get("/videos", params={"per_page": 100})
+    generation = shared_cache.get_counter(CATALOG_GENERATION_KEY)
+
+    response = client.put(f"/videos/{video_id}", json={"title": "after rename"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert shared_cache.get(detail_cache_key(video_id)) is None
+    assert shared_cache.get_counter(CATALOG_GENERATION_KEY) == generation + 1
+
+    assert client.get(f"/videos/{video_id}").json()["title"] == "after rename"
+    titles = [v["title"] for v in client.get("/videos", params={"per_page": 100}).json()["videos"]]
+    assert "after rename" in titles and "before rename" not in titles
@@ -0,0 +1,35 @@
+"""
+Prometheus exposition of the in-process metrics
+"""
+import pytest
+
+from app.utils.metrics import Counter, Histogram, Metric, Registry
+
+
+def test_metric_interface_is_abstract():
+    with pytest.raises(TypeError):
+        Metric("incomplete", "no render")
+
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "no render")
+
+
+def test_registry_renders_every_metric(client):
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+    latency = registry.register(Histogram("latency_seconds", "Latency"))
+    requests.inc("/videos")
+    latency.observe(0.2)
+
+    lines = registry.render()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{route="/videos"} 1' in lines
+    assert "latency_seconds_count 1" in lines
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.text.endswith("\n")
+    assert "# TYPE http_requests_total counter" in response.text
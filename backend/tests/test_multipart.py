@@ -0,0 +1,133 @@
+"""
+Multipart upload completion: whole uploads only, failures keep the upload resumable
+"""
+import pytest
+
+import app.routes.videos as video_routes
+from app.models.video import Video
+
+MiB = 1024 * 1024
+
+
+class FakeS3:
+    """
+    Stands in for the S3 multipart calls the routes make
+    """
+
+    def __init__(self):
+        self.parts: dict[int, int] = {}
+        self.completed = None
+        self.aborted = False
+        self.fail_complete = False
+
+    def initiate(self, key, content_type=None):
+        return {"upload_id": "upload-1", "key": key}
+
+    def list_parts(self, key, upload_id):
+        return [{"part_number": n, "etag": f'"{n}"', "size": size} for n, size in sorted(self.parts.items())]
+
+    def complete(self, key, upload_id, parts):
+        if self.fail_complete:
+            raise RuntimeError("S3 unavailable")
+        self.completed = parts
+
+    def abort(self, key, upload_id):
+        self.aborted = True
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(video_routes, "initiate_multipart_upload", fake.initiate)
+    monkeypatch.setattr(video_routes, "list_uploaded_parts", fake.list_parts)
+    monkeypatch.setattr(video_routes, "complete_multipart_upload", fake.complete)
+    monkeypatch.setattr(video_routes, "abort_multipart_upload", fake.abort)
+    return fake
+
+
+def initiate(client, headers, file_size=50 * MiB):
+    response = client.post("/videos/multipart/initiate", json={"file_size": file_size}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["plan"]["num_parts"] == 3
+    return body["video_id"]
+
+
+def test_complete_from_s3_requires_every_part(client, db, user, s3):
+    _, headers = user
+    video_id = initiate(client, headers)
+    s3.parts = {1: 20 * MiB, 3: 10 * MiB}
+
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 409
+    assert "1 of 3 parts missing" in response.json()["detail"]
+    assert s3.completed is None and not s3.aborted
+
+    s3.parts[2] = 20 * MiB
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [part["PartNumber"] for part in s3.completed] == [1, 2, 3]
+    assert db.get(Video, video_id).upload_id is None
+
+
+def test_complete_from_s3_checks_planned_size(client, user, s3):
+    _, headers = user
+    video_id = initiate(client, headers)
+    s3.parts = {1: 20 * MiB, 2: 20 * MiB, 3: 5 * MiB}
+
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 409
+    assert s3.completed is None
+
+
+def test_complete_without_plan_needs_part_count(client, user, s3):
+    _, headers = user
+    video_id = client.post("/videos/multipart/initiate", headers=headers).json()["video_id"]
+    s3.parts = {1: 20 * MiB}
+
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 409
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id, "num_parts": 2}, headers=headers)
+    assert response.status_code == 409
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id, "num_parts": 1}, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def test_failed_complete_keeps_the_upload(client, db, user, s3):
+    _, headers = user
+    video_id = initiate(client, headers)
+    s3.parts = {1: 20 * MiB, 2: 20 * MiB, 3: 10 * MiB}
+    s3.fail_complete = True
+
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 500
+    assert not s3.aborted
+    assert db.get(Video, video_id).upload_id == "upload-1"
+
+    s3.fail_complete = False
+    response = client.post("/videos/multipart/complete", json={"video_id": video_id}, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def test_upload_id_must_match_the_upload_in_progress(client, user, s3):
+    _, headers = user
+    video_id = initiate(client, headers)
+
+    response = client.post("/videos/multipart/get-urls", json={
+        "video_id": video_id, "upload_id": "someone-else", "num_parts": 3
+    }, headers=headers)
+    assert response.status_code == 409
+    response = client.post("/videos/multipart/complete", json={
+        "video_id": video_id, "upload_id": "someone-else"
+    }, headers=headers)
+    assert response.status_code == 409
+
+
+def test_cancel_aborts_and_removes_the_video(client, db, user, s3):
+    _, headers = user
+    video_id = initiate(client, headers)
+
+    response = client.delete(f"/videos/multipart/{video_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert s3.aborted
+    assert db.get(Video, video_id) is None
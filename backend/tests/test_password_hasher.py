@@ -0,0 +1,45 @@
+"""
+Admission limit of the bcrypt pool holds while timed-out jobs are still running
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.password_hasher import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.2)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes(hasher):
+    # Start the worker process so the slow job is running, not queued, when it times out
+    hasher.timeout = 30
+    hasher._run(time.sleep, 0)
+    hasher.timeout = 0.2
+
+    with pytest.raises(HTTPException) as error:
+        hasher._run(time.sleep, 1)
+    assert error.value.status_code == 503
+
+    with pytest.raises(HTTPException) as error:
+        hasher._run(time.sleep, 0)
+    assert error.value.status_code == 429
+    assert hasher.stats()["in_flight"] == 1
+
+    deadline = time.monotonic() + 10
+    while hasher.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert hasher.stats()["in_flight"] == 0
+    assert hasher._run(time.sleep, 0) is None
+
+
+def test_inline_hashing_releases_its_slot():
+    hasher = PasswordHasher(workers=0, max_pending=1)
+    for _ in range(3):
+        assert hasher._run(len, "password") == 8
+    assert hasher.stats()["in_flight"] == 0
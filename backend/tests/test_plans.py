@@ -0,0 +1,33 @@
+"""
+Every hot query is served by an index on a migrated SQLite database
+"""
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.db import engine
+from app.migrations import upgrade
+from app.migrations.plans import check_plans, explain, full_scans
+from app.models.video import Video
+
+
+@pytest.fixture(scope="module")
+def conn():
+    upgrade(engine)
+    with engine.connect() as conn:
+        yield conn
+
+
+def test_hot_queries_use_an_index(conn):
+    assert check_plans(conn) == {}
+
+
+def test_full_scans_are_detected(conn):
+    plan = explain(conn, select(Video.id).where(Video.duration_seconds == 1))
+    assert full_scans(conn, plan) == ["videos"]
+
+
+def test_unmigrated_schema_is_reported(tmp_path):
+    empty = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    with empty.connect() as conn:
+        with pytest.raises(RuntimeError, match="run `python -m app.migrations upgrade`"):
+            check_plans(conn)
@@ -0,0 +1,53 @@
+"""
+Listing pages must issue the same number of queries whatever their size (no N+1)
+"""
+import pytest
+from sqlalchemy import event
+
+from app.db import engine
+from tests.conftest import add_videos
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def count_queries(client, url: str, headers: dict) -> int:
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+@pytest.fixture
+def engaged_user(client, db, user):
+    user_id, headers = user
+    video_ids = add_videos(db, user_id, [f"listing video {i}" for i in range(25)])
+    for path in ("/videos/me/liked-videos", "/videos/me/watch-later"):
+        response = client.put(path, json={"video_ids": video_ids}, headers=headers)
+        assert response.status_code == 200, response.text
+    return user_id, headers
+
+
+@pytest.mark.parametrize("path", [
+    "/videos?per_page={n}",
+    "/users/{user_id}/videos?per_page={n}",
+    "/videos/me/liked-videos?per_page={n}",
+    "/videos/me/watch-later?per_page={n}",
+])
+def test_listing_query_count_is_constant(client, engaged_user, path):
+    user_id, headers = engaged_user
+    # Warm up the per-process caches (catalog stamp, token principal)
+    count_queries(client, path.format(n=1, user_id=user_id), headers)
+
+    small = count_queries(client, path.format(n=5, user_id=user_id), headers)
+    large = count_queries(client, path.format(n=20, user_id=user_id), headers)
+    assert small == large
@@ -0,0 +1,69 @@
+"""
+In-memory search (SQLite): totals and orderings cover every match, not a top-N cut
+"""
+import uuid
+
+from sqlalchemy import update
+
+from app.models.video import Video
+from app.utils.search import search_index
+from tests.conftest import add_videos
+
+
+def test_newest_sort_and_totals_cover_every_match(client, db, user):
+    user_id, _ = user
+    word = uuid.uuid4().hex
+    video_ids = add_videos(db, user_id, [f"{word} {i}" for i in range(1500)])
+    search_index.refresh(db, force=True)
+
+    page = client.get("/videos", params={"q": word, "sort": "newest", "per_page": 5}).json()
+    assert [v["id"] for v in page["videos"]] == video_ids[::-1][:5]
+    assert page["total_items"] == 1500
+    assert page["total_pages"] == 300
+
+    relevance = client.get("/videos", params={"q": word, "per_page": 5, "page": 300}).json()
+    assert relevance["total_items"] == 1500
+    assert len(relevance["videos"]) == 5
+    assert not relevance["has_next"]
+
+    # Cursor pages walk every match newest first
+    seen, cursor = [], None
+    while True:
+        params = {"q": word, "sort": "newest", "per_page": 100, "include_total": True}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/videos", params=params).json()
+        assert page["total_items"] == 1500
+        seen += [v["id"] for v in page["videos"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == video_ids[::-1]
+
+
+def test_videos_no_longer_ready_do_not_shorten_the_page(client, db, user):
+    user_id, _ = user
+    word = uuid.uuid4().hex
+    video_ids = add_videos(db, user_id, [f"{word} {i}" for i in range(12)])
+    search_index.refresh(db, force=True)
+
+    # Changed behind the index's back: it still lists them until its next refresh
+    newest = video_ids[::-1]
+    db.execute(update(Video).where(Video.id.in_(newest[2:4])).values(status="failed"))
+    db.commit()
+
+    page = client.get("/videos", params={"q": word, "sort": "newest", "per_page": 5}).json()
+    assert [v["id"] for v in page["videos"]] == newest[:2] + newest[4:7]
+    assert page["has_next"]
+    assert page["total_items"] == 10
+
+    # Equal scores rank by id
+    ranked = sorted(video_ids)
+    stale = set(newest[2:4])
+    db.execute(update(Video).where(Video.id.in_(ranked[:2])).values(status="failed"))
+    db.commit()
+    stale.update(ranked[:2])
+    expected = [video_id for video_id in ranked if video_id not in stale]
+    page = client.get("/videos", params={"q": word, "per_page": 5}).json()
+    assert [v["id"] for v in page["videos"]] == expected[:5]
+    assert page["has_next"]
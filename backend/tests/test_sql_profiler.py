@@ -0,0 +1,28 @@
+"""
+SQL profiler bookkeeping on pooled connections
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+from app.utils.sql_profiler import SQLProfiler, _current_profile
+
+
+def test_failed_statements_leave_nothing_on_the_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/profiler.db", poolclass=QueuePool, pool_size=1)
+    profiler = SQLProfiler(enabled=True)
+    profiler.install(engine)
+    profile = profiler.begin_request({"method": "GET"})
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert not any(key.startswith("sql_profiler") for key in conn.info)
+    assert profile.queries == 1
+    _current_profile.set(None)
+    engine.dispose()
@@ -0,0 +1,61 @@
+"""
+Title autocomplete: lookups match a brute-force ranking, also with changed videos hidden
+"""
+import random
+from types import SimpleNamespace
+
+from app.utils.suggest import SCAN_LIMIT, PrefixIndex, TitleSuggester, normalize_title
+
+WORDS = ["cat", "car", "cart", "dog", "do", "music", "mus", "pho"]
+
+
+def make_entries(n: int, seed: int = 7) -> list[tuple[str, int, str, str]]:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        entries.append((normalize_title(title), rng.randint(0, 10**6), f"v{i}", title))
+    return entries
+
+
+def brute_force(entries, prefix: str, n: int, exclude=()) -> list[str]:
+    matches = [e for e in entries if e[0].startswith(prefix) and e[2] not in exclude]
+    return [e[2] for e in sorted(matches, key=lambda e: -e[1])[:n]]
+
+
+def test_lookup_matches_brute_force():
+    entries = make_entries(5000)
+    index = PrefixIndex(entries)
+    assert index.heavy, "short prefixes should have precomputed top lists"
+    for prefix in ["c", "ca", "car", "cat ", "d", "mus", "music c", "x"]:
+        found = [index.entry(p)[0] for p in index.lookup(prefix, 10)]
+        assert found == brute_force(entries, prefix, 10), prefix
+
+
+def test_lookup_fills_the_page_when_the_precomputed_top_is_hidden():
+    entries = make_entries(5000)
+    index = PrefixIndex(entries)
+    assert len(brute_force(entries, "c", 10**6)) > SCAN_LIMIT
+    # Hide every title of the precomputed top list of "c" and then some
+    hidden = set(brute_force(entries, "c", index.top_k + 25))
+    found = [index.entry(p)[0] for p in index.lookup("c", 20, exclude=hidden)]
+    assert found == brute_force(entries, "c", 20, exclude=hidden)
+    assert len(found) == 20
+
+
+def test_suggest_serves_renamed_videos_from_the_overlay():
+    entries = make_entries(2000)
+    suggester = TitleSuggester()
+    suggester.base = PrefixIndex(entries)
+    suggester.refresh = lambda db, force=False: None
+
+    top = brute_force(entries, "c", 50)
+    for video_id in top:
+        suggester.update(SimpleNamespace(id=video_id, status="ready", title="Zebra", views=1))
+    suggester.update(SimpleNamespace(id="new", status="ready", title="Cat café", views=10**7))
+
+    ids = [video_id for video_id, _, _ in suggester.suggest(None, "CAT", 5)]
+    assert ids[0] == "new"
+    assert ids[1:] == brute_force(entries, "cat", 4, exclude=set(top))
+    renamed = [video_id for video_id, _, _ in suggester.suggest(None, "zeb", 20)]
+    assert len(renamed) == 20 and set(renamed) <= set(top)
@@ -0,0 +1,44 @@
+"""
+Trending pages stay full when videos of the snapshot stop being ready
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, insert, update
+
+from app.models.trending_video import TrendingVideo
+from app.models.video import Video
+from tests.conftest import add_videos
+
+
+def test_pages_skip_videos_no_longer_ready(client, db, user):
+    user_id, _ = user
+    video_ids = add_videos(db, user_id, [f"trending {i}" for i in range(10)])
+    db.execute(delete(TrendingVideo))
+    db.execute(insert(TrendingVideo), [
+        {"rank": rank, "video_id": video_id, "score": 100.0 - rank, "computed_at": datetime(2025, 1, 1)}
+        for rank, video_id in enumerate(video_ids, start=1)
+    ])
+    db.commit()
+    first = client.get("/videos/trending", params={"per_page": 4})
+
+    db.execute(update(Video).where(Video.id.in_(video_ids[1:3])).values(status="failed"))
+    db.commit()
+    ready = video_ids[:1] + video_ids[3:]
+
+    page = client.get("/videos/trending", params={"per_page": 4}, headers={"If-None-Match": first.headers["etag"]})
+    assert page.status_code == 200
+    page = page.json()
+    assert [v["id"] for v in page["videos"]] == ready[:4]
+    assert page["has_next"] and page["next_rank"] == 6
+
+    page = client.get("/videos/trending", params={"per_page": 4, "page": 2}).json()
+    assert [v["id"] for v in page["videos"]] == ready[4:]
+    assert not page["has_next"]
+
+    seen, after_rank = [], 0
+    while after_rank is not None:
+        page = client.get("/videos/trending", params={"per_page": 3, "after_rank": after_rank}).json()
+        assert page["page"] is None
+        seen += [v["id"] for v in page["videos"]]
+        after_rank = page["next_rank"]
+    assert seen == ready
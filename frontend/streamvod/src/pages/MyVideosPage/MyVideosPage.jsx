@@ -9,7 +9,10 @@ import styles from './MyVideosPage.module.css';
 
 const MyVideosPage = () => {
   const [videos, setVideos] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [editingId, setEditingId] = useState(null);
   const [editForm, setEditForm] = useState({ title: '', description: '' });
@@ -21,11 +24,17 @@ const MyVideosPage = () => {
     fetchMyVideos();
   }, []);
 
-  const fetchMyVideos = async () => {
+  // Without a cursor the first page is loaded, otherwise the page is appended
+  const fetchMyVideos = async (cursor = null) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
       const response = await fetch(
-        `${API_BASE_URL}${API_ENDPOINTS.USER_VIDEOS(user.id)}`,
+        `${API_BASE_URL}${API_ENDPOINTS.USER_VIDEOS(user.id)}${query}`,
         {
           method: 'GET',
           headers: getAuthHeaders(),
@@ -37,12 +46,15 @@ const MyVideosPage = () => {
       }
 
       const data = await response.json();
-      setVideos(data.videos || []);
+      setVideos((prev) => (cursor ? [...prev, ...(data.videos || [])] : data.videos || []));
+      setTotal(data.total ?? 0);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       console.error('Error fetching videos:', err);
       setError(err.message);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -126,7 +138,7 @@ const MyVideosPage = () => {
       <div className={styles.header}>
         <h1 className={styles.title}>My Videos</h1>
         <p className={styles.subtitle}>
-          {videos.length} {videos.length === 1 ? 'video' : 'videos'}
+          {total} {total === 1 ? 'video' : 'videos'}
         </p>
       </div>
 
@@ -250,6 +262,18 @@ const MyVideosPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className={styles.loadMore}>
+          <button
+            className={styles.uploadButton}
+            onClick={() => fetchMyVideos(nextCursor)}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
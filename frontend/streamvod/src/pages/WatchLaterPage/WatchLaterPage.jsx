@@ -7,7 +7,10 @@ import styles from './WatchLaterPage.module.css';
 
 const WatchLaterPage = () => {
   const [videos, setVideos] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const navigate = useNavigate();
 
@@ -15,11 +18,17 @@ const WatchLaterPage = () => {
     fetchWatchLaterVideos();
   }, []);
 
-  const fetchWatchLaterVideos = async () => {
+  // Without a cursor the first page is loaded, otherwise the page is appended
+  const fetchWatchLaterVideos = async (cursor = null) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
       const response = await fetch(
-        `${API_BASE_URL}${API_ENDPOINTS.USER_WATCH_LATER}`,
+        `${API_BASE_URL}${API_ENDPOINTS.USER_WATCH_LATER}${query}`,
         {
           method: 'GET',
           headers: getAuthHeaders(),
@@ -31,12 +40,15 @@ const WatchLaterPage = () => {
       }
 
       const data = await response.json();
-      setVideos(data.videos || []);
+      setVideos((prev) => (cursor ? [...prev, ...(data.videos || [])] : data.videos || []));
+      setTotal(data.total ?? 0);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       console.error('Error fetching watch later videos:', err);
       setError(err.message);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -62,7 +74,7 @@ const WatchLaterPage = () => {
     <div className={styles.container}>
       <h1 className={styles.title}>Watch Later</h1>
       <p className={styles.subtitle}>
-        {videos.length} {videos.length === 1 ? 'video' : 'videos'}
+        {total} {total === 1 ? 'video' : 'videos'}
       </p>
 
       {videos.length === 0 ? (
@@ -85,6 +97,18 @@ const WatchLaterPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className={styles.loadMore}>
+          <button
+            className={styles.browseButton}
+            onClick={() => fetchWatchLaterVideos(nextCursor)}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -52,12 +52,14 @@ const PART_SIZE = 20 * 1024 * 1024; // 20MB per part
 
 /**
  * Initiate multipart upload
- * @returns {Promise<{video_id: string, upload_id: string, key: string}>}
+ * @param {number} [fileSize] - File size in bytes; when given the backend returns an upload plan
+ * @returns {Promise<{video_id: string, upload_id: string, key: string, plan: ?{part_size: number, num_parts: number, parallelism: number}}>}
  */
-export const initiateMultipartUpload = async () => {
+export const initiateMultipartUpload = async (fileSize) => {
   const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.MULTIPART_INITIATE}`, {
     method: 'POST',
     headers: getAuthHeaders(),
+    body: fileSize ? JSON.stringify({ file_size: fileSize }) : undefined,
   });
 
   if (!response.ok) {
@@ -158,10 +160,11 @@ export const completeMultipartUpload = async (videoId, uploadId, parts) => {
  */
 export const uploadVideoMultipart = async (file, onProgress = null, maxConcurrent = 5) => {
   // Step 1: Initiate multipart upload
-  const { video_id, upload_id, key } = await initiateMultipartUpload();
+  const { video_id, upload_id, key, plan } = await initiateMultipartUpload(file.size);
   
-  // Step 2: Calculate number of parts
-  const numParts = Math.ceil(file.size / PART_SIZE);
+  // Step 2: Part size and count from the backend plan (fallback: fixed 20MB parts)
+  const partSize = plan ? plan.part_size : PART_SIZE;
+  const numParts = plan ? plan.num_parts : Math.ceil(file.size / PART_SIZE);
   
   // Step 3: Get presigned URLs for all parts
   const { parts: urlParts } = await getMultipartUploadUrls(video_id, upload_id, numParts);
@@ -173,8 +176,8 @@ export const uploadVideoMultipart = async (file, onProgress = null, maxConcurren
   // Create upload tasks for all parts
   const uploadTasks = [];
   for (let i = 0; i < numParts; i++) {
-    const start = i * PART_SIZE;
-    const end = Math.min(start + PART_SIZE, file.size);
+    const start = i * partSize;
+    const end = Math.min(start + partSize, file.size);
     const partData = file.slice(start, end);
     
     const urlPart = urlParts.find(p => p.part_number === i + 1);